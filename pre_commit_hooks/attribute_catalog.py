@@ -0,0 +1,381 @@
+"""The attribute catalog: every attribute defined by the catalog files.
+
+It is kept in a binary snapshot which is memory-mapped and queried in
+place, nothing is deserialized up front:
+
+    header   magic, format version, number of attributes, length of the
+             strings, stamp
+    records  one per attribute, sorted by key: five (offset, length)
+             pairs into the strings for its key (its JSON encoded id),
+             tags, supported operators, expected datatype (all JSON) and
+             the path of the file defining it
+    strings  UTF-8, each distinct string stored once
+
+The stamp hashes the path, mtime and size of every catalog file, a snapshot
+with another stamp is rebuilt (parsing only the files which changed), as
+is one of another length than its header gives (e.g. cut short).
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Any
+from typing import NamedTuple
+
+from pre_commit_hooks import content_index
+from pre_commit_hooks import filelist
+from pre_commit_hooks import timings
+from pre_commit_hooks.util import cache_path
+from pre_commit_hooks.util import read_json_cache
+from pre_commit_hooks.util import write_json_cache
+
+ATTRIBUTES_DIR = './static-files/classification-config-service/attributes'
+
+# bump when the on-disk layout changes so stale caches are ignored
+_CACHE_VERSION = 1
+_SNAPSHOT_VERSION = 2
+
+_MAGIC = b'QATC'
+_HEADER = struct.Struct('<4sIII32s')
+_RECORD = struct.Struct('<10I')
+
+_FIELDS = tuple(
+    ('attributes', '*', field)
+    for field in ('id', 'tags', 'supported_operators', 'expected_datatype')
+)
+
+
+class Attribute(NamedTuple):
+    id: str
+    tags: list[str] | None
+    supported_operators: list[str] | None
+    expected_datatype: str | None
+    path: str
+
+
+def _key(attribute_id: object) -> bytes | None:
+    try:
+        return json.dumps(attribute_id).encode()
+    except (TypeError, ValueError):
+        return None
+
+
+def dump(attributes: dict[Any, Attribute], stamp: bytes) -> bytes:
+    """The snapshot of `attributes`."""
+    strings = bytearray()
+    offsets: dict[bytes, int] = {}
+
+    def string(value: bytes) -> tuple[int, int]:
+        if value not in offsets:
+            offsets[value] = len(strings)
+            strings.extend(value)
+        return offsets[value], len(value)
+
+    keyed = sorted(
+        (key, attribute) for attribute in attributes.values()
+        if (key := _key(attribute.id)) is not None
+    )
+    records = bytearray()
+    for key, attribute in keyed:
+        records.extend(_RECORD.pack(
+            *string(key),
+            *string(json.dumps(attribute.tags).encode()),
+            *string(json.dumps(attribute.supported_operators).encode()),
+            *string(json.dumps(attribute.expected_datatype).encode()),
+            *string(os.fsencode(attribute.path)),
+        ))
+    header = _HEADER.pack(
+        _MAGIC, _SNAPSHOT_VERSION, len(keyed), len(strings), stamp,
+    )
+    return header + records + strings
+
+
+class AttributeCatalog:
+    def __init__(self, buf: bytes | mmap.mmap) -> None:
+        self.buf = buf
+        _, _, self.count, _, self.stamp = _HEADER.unpack_from(buf)
+        self._strings = _HEADER.size + self.count * _RECORD.size
+
+    def _record(self, i: int) -> tuple[int, ...]:
+        return _RECORD.unpack_from(self.buf, _HEADER.size + i * _RECORD.size)
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings + offset
+        return self.buf[start:start + length]
+
+    def _find(self, attribute_id: object) -> tuple[int, ...] | None:
+        key = _key(attribute_id)
+        if key is None:
+            return None
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self._record(mid)
+            found = self._string(*record[:2])
+            if found == key:
+                return record
+            elif found < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def __contains__(self, attribute_id: object) -> bool:
+        return self._find(attribute_id) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get(self, attribute_id: str) -> Attribute | None:
+        record = self._find(attribute_id)
+        if record is None:
+            return None
+        return Attribute(
+            attribute_id,
+            json.loads(self._string(*record[2:4])),
+            json.loads(self._string(*record[4:6])),
+            json.loads(self._string(*record[6:8])),
+            os.fsdecode(self._string(*record[8:10])),
+        )
+
+    def tags(self, attribute_id: str) -> list[str] | None:
+        record = self._find(attribute_id)
+        if record is None:
+            return None
+        return json.loads(self._string(*record[2:4]))
+
+    def defined_in(self, paths: Iterable[str]) -> set[Any]:
+        """The ids of the attributes defined by any of `paths`."""
+        encoded = {os.fsencode(path) for path in paths}
+        return {
+            json.loads(self._string(*record[:2]))
+            for record in map(self._record, range(self.count))
+            if self._string(*record[8:10]) in encoded
+        }
+
+
+def _open_snapshot(filename: str, stamp: bytes) -> AttributeCatalog | None:
+    try:
+        with open(filename, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buf) >= _HEADER.size:
+        magic, version, count, strings, found = _HEADER.unpack_from(buf)
+        if (
+                (magic, version, found) == (_MAGIC, _SNAPSHOT_VERSION, stamp) and
+                len(buf) == _HEADER.size + count * _RECORD.size + strings
+        ):
+            return AttributeCatalog(buf)
+    buf.close()
+    return None
+
+
+def _write_snapshot(filename: str, data: bytes) -> None:
+    import tempfile
+
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, filename)
+        tmp = None
+    except OSError:
+        pass  # the cache is an optimization, never fail the hook over it
+    finally:
+        if tmp is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+
+
+def _parse_file(path: str) -> list[list[Any]]:
+    from pre_commit_hooks import document_cache
+
+    with open(path, 'rb') as f:
+        data = document_cache.load_paths(f.read(), _FIELDS, path)
+    return [
+        [
+            attribute.get('id'),
+            attribute.get('tags'),
+            attribute.get('supported_operators'),
+            attribute.get('expected_datatype'),
+        ]
+        for attribute in data['attributes']
+    ]
+
+
+# per-file entries last seen by this process, so a rebuild only stats
+_files: dict[str, dict[str, Any]] = {}
+
+
+def _stats(location: str) -> dict[str, os.stat_result]:
+    return {
+        yaml_file: os.stat(yaml_file)
+        for yaml_file in filelist.yaml_files(location)
+        if yaml_file.endswith('.yaml')
+    }
+
+
+def _entries(
+        location: str,
+        stats: dict[str, os.stat_result],
+) -> dict[str, dict[str, Any]]:
+    cache_file = cache_path('attribute-catalog', location, '.json')
+    if location in _files:
+        cached = _files[location]
+    else:
+        cached = read_json_cache(cache_file, _CACHE_VERSION)
+
+    files = {}
+    for yaml_file, st in stats.items():
+        entry = cached.get(yaml_file)
+        if (
+                entry is None or
+                entry['mtime_ns'] != st.st_mtime_ns or
+                entry['size'] != st.st_size
+        ):
+            entry = {
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'attributes': _parse_file(yaml_file),
+            }
+        files[yaml_file] = entry
+
+    if files != cached:
+        write_json_cache(cache_file, _CACHE_VERSION, files)
+    _files[location] = files
+    return files
+
+
+def _dump_entries(files: dict[str, dict[str, Any]], stamp: bytes) -> bytes:
+    attributes = {}
+    for path, entry in files.items():
+        for attribute_id, tags, operators, datatype in entry['attributes']:
+            attributes[attribute_id] = Attribute(
+                attribute_id, tags, operators, datatype, path,
+            )
+    return dump(attributes, stamp)
+
+
+def build(location: str) -> AttributeCatalog:
+    location = os.path.abspath(location)
+    stats = _stats(location)
+    stamp = hashlib.sha256(json.dumps([
+        (yaml_file, st.st_mtime_ns, st.st_size)
+        for yaml_file, st in stats.items()
+    ]).encode()).digest()
+    snapshot_file = cache_path('attribute-catalog', location, '.snapshot')
+    catalog = _open_snapshot(snapshot_file, stamp)
+    if catalog is not None:
+        return catalog
+
+    data = _dump_entries(_entries(location, stats), stamp)
+    _write_snapshot(snapshot_file, data)
+    return _open_snapshot(snapshot_file, stamp) or AttributeCatalog(data)
+
+
+_catalogs: dict[str, AttributeCatalog] = {}
+
+
+def load(location: str = ATTRIBUTES_DIR) -> AttributeCatalog:
+    """Return the catalog for `location`, built at most once per process."""
+    key = os.path.abspath(location)
+    if key not in _catalogs:
+        with timings.phase('index'):
+            _catalogs[key] = build(location)
+    return _catalogs[key]
+
+
+def update(paths: Iterable[str], location: str = ATTRIBUTES_DIR) -> None:
+    """Patch the loaded catalog for `paths` which were saved or deleted.
+
+    For processes watching the files: only the catalog files among `paths`
+    are parsed again, the catalog is re-encoded in memory.
+    """
+    import yaml
+
+    location = os.path.abspath(location)
+    prefix = os.path.join(location, '')
+    paths = [
+        path for path in map(os.path.abspath, paths)
+        if path.startswith(prefix) and path.endswith('.yaml')
+    ]
+    if not paths or location not in _catalogs:
+        return  # loaded from disk when needed
+
+    if location not in _files:  # the catalog came from a fresh snapshot
+        _entries(location, _stats(location))
+    files = dict(_files[location])
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            files.pop(path, None)
+            continue
+        try:
+            attributes = _parse_file(path)
+        except (yaml.YAMLError, KeyError, TypeError):
+            attributes = []  # reported when the file itself is checked
+        files[path] = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'attributes': attributes,
+        }
+    _files[location] = dict(sorted(files.items()))
+    _catalogs[location] = AttributeCatalog(
+        _dump_entries(_files[location], bytes(32)),
+    )
+
+
+def invalidate() -> None:
+    """Make the next `load` pick up changed catalog files.
+
+    For long-lived processes; the catalog folder is listed again, only
+    files whose mtime / size changed are parsed again.
+    """
+    filelist.invalidate()
+    _catalogs.clear()
+
+
+def dependents(
+        filenames: Sequence[str],
+        location: str = ATTRIBUTES_DIR,
+        root: str = '.',
+) -> list[str]:
+    """Files below `root` to re-check because catalog files changed.
+
+    These reference an attribute defined in one of the changed catalog
+    files (its tags may have changed) or one no longer defined at all.
+    Files already in `filenames` are left out.
+    """
+    location = os.path.abspath(location)
+    prefix = os.path.join(location, '')
+    changed = {
+        os.path.abspath(filename) for filename in filenames
+        if os.path.abspath(filename).startswith(prefix)
+    }
+    if not changed:
+        return []
+
+    catalog = load(location)
+    affected = catalog.defined_in(changed)
+    index = content_index.shared_index()
+    affected.update(
+        attribute_id for attribute_id in index.referenced(root)
+        if attribute_id not in catalog
+    )
+
+    passed = {os.path.abspath(filename) for filename in filenames}
+    return sorted(
+        os.path.relpath(path)
+        for path in index.referencing(root, affected)
+        if path not in passed
+    )
@@ -0,0 +1,97 @@
+"""Files changed since a git revision, for `--changed-since REF` in CI.
+
+The files which differ between the merge-base of REF and HEAD and the
+working tree are checked on top of the filenames given, so a pipeline
+takes time in proportion to the change rather than to the repository.
+Hooks whose result for a file depends on other files add those as usual
+(e.g. the files referencing attributes of a changed catalog file), deleted
+files are passed along for that.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+from typing import NamedTuple
+
+
+class Changes(NamedTuple):
+    base: str
+    # yaml files relative to the current directory, like pre-commit's
+    modified: list[str]
+    deleted: list[str]
+
+
+def _is_yaml(filename: str) -> bool:
+    return filename.endswith(('.yaml', '.yml'))
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ('git', *args), capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def since(ref: str) -> Changes:
+    base = _git('merge-base', ref, 'HEAD').strip()
+    toplevel = _git('rev-parse', '--show-toplevel').strip()
+    # `<status>\0<path>\0` for each file
+    out = _git('diff', '--name-status', '--no-renames', '-z', base, '--')
+    fields = out.split('\0')[:-1]
+
+    modified: list[str] = []
+    deleted: list[str] = []
+    for status, path in zip(fields[::2], fields[1::2]):
+        if _is_yaml(path):
+            path = os.path.relpath(os.path.join(toplevel, path))
+            (deleted if status == 'D' else modified).append(path)
+    return Changes(base, modified, deleted)
+
+
+def add_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--changed-since', metavar='REF',
+        help=(
+            'Also check the yaml files changed since the merge-base of REF '
+            'and HEAD (e.g. origin/main), for CI.'
+        ),
+    )
+
+
+def resolve(
+        parser: argparse.ArgumentParser,
+        args: argparse.Namespace,
+) -> Changes | None:
+    """The changes `--changed-since` asks for, added to `args.filenames`."""
+    if args.changed_since is None:
+        return None
+    try:
+        changes = since(args.changed_since)
+    except subprocess.CalledProcessError as e:
+        detail = e.stderr.strip()
+        parser.error(f'--changed-since {args.changed_since}: {detail}')
+    except OSError as e:  # git is missing
+        parser.error(f'--changed-since {args.changed_since}: {e}')
+    args.filenames = list(dict.fromkeys((*args.filenames, *changes.modified)))
+    return changes
+
+
+def deleted(changes: Changes | None) -> list[str]:
+    return changes.deleted if changes is not None else []
+
+
+def staged_deleted() -> list[str]:
+    """The yaml files whose deletion is staged, for hooks run by pre-commit.
+
+    pre-commit only passes the files which still exist.
+    """
+    try:
+        toplevel = _git('rev-parse', '--show-toplevel').strip()
+        out = _git('diff', '--cached', '--name-only', '--diff-filter=D', '-z')
+    except (OSError, subprocess.CalledProcessError):  # not in a repository
+        return []
+    return [
+        os.path.relpath(os.path.join(toplevel, path))
+        for path in out.split('\0')[:-1]
+        if _is_yaml(path)
+    ]
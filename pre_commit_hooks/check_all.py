@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import sys
+import time
+import traceback
+from collections.abc import Callable
+from collections.abc import Sequence
+from typing import Any
+
+from pre_commit_hooks import attribute_catalog
+from pre_commit_hooks import changes
+from pre_commit_hooks import check_attribute
+from pre_commit_hooks import check_attribute_tags
+from pre_commit_hooks import daemon
+from pre_commit_hooks import executor
+from pre_commit_hooks import timings
+from pre_commit_hooks import validate_schema
+from pre_commit_hooks import validate_uuid
+
+# name -> check run against the already parsed document, in this order
+CHECKS: dict[str, Callable[[str, Any], int]] = {
+    'schema': validate_schema.check_document,
+    'ids': validate_uuid.check_document,
+    'attributes': check_attribute.check_document,
+    'tags': check_attribute_tags.check_document,
+}
+
+
+def _check_file(filename: str, checks: tuple[str, ...]) -> int:
+    import yaml
+
+    from pre_commit_hooks import document_cache
+    from pre_commit_hooks import yaml_loader
+
+    unique_keys = 'syntax' in checks
+    try:
+        data = document_cache.load(
+            filename,
+            functools.partial(yaml_loader.load, unique_keys=unique_keys),
+            unique_keys=unique_keys,
+            encoding='UTF-8',
+        )
+    except yaml.YAMLError as exc:
+        print(exc)
+        return 1
+
+    document_checks = [name for name in checks if name in CHECKS]
+    if document_checks and not isinstance(data, dict):
+        print(f'❌ {filename} is not a valid YAML object.')
+        return 1
+
+    retval = 0
+    for name in document_checks:
+        with timings.phase(name):
+            retval |= CHECKS[name](filename, data)
+    return retval
+
+
+def _checks(args: argparse.Namespace) -> tuple[str, ...]:
+    return tuple(
+        name for name in ('syntax', *CHECKS)
+        if args.checks is None or name in args.checks
+    )
+
+
+def _run(args: argparse.Namespace, deleted: Sequence[str] = ()) -> int:
+    checks = _checks(args)
+    if 'ids' in checks:
+        validate_uuid.refresh_index(args.filenames)
+    retval = executor.run(
+        functools.partial(_check_file, checks=checks), args.filenames,
+    )
+
+    # files referencing changed catalog attributes only need those checks
+    dependent_checks = tuple(
+        name for name in checks if name in ('attributes', 'tags')
+    )
+    if dependent_checks:
+        retval |= executor.run(
+            functools.partial(_check_file, checks=dependent_checks),
+            attribute_catalog.dependents([*args.filenames, *deleted]),
+        )
+    return retval
+
+
+def _recheck(paths: set[str], checks: tuple[str, ...], root: str) -> int:
+    """Check the saved / deleted `paths` and the files depending on them."""
+    from pre_commit_hooks import content_index
+
+    index = content_index.shared_index()
+    before = {path: index.document(path) for path in paths}
+    index.update(paths)
+    attribute_catalog.update(paths)
+
+    filenames = sorted(os.path.relpath(p) for p in paths if os.path.exists(p))
+    retval = executor.run(
+        functools.partial(_check_file, checks=checks), filenames,
+    )
+
+    dependent_checks = tuple(
+        name for name in checks if name in ('attributes', 'tags')
+    )
+    if dependent_checks:
+        retval |= executor.run(
+            functools.partial(_check_file, checks=dependent_checks),
+            attribute_catalog.dependents(
+                [os.path.relpath(p) for p in paths], root=root,
+            ),
+        )
+
+    # files whose id / code the saved ones used to or now share
+    duplicates: set[str] = set()
+    if 'ids' in checks:
+        for path in paths:
+            for document in (before[path], index.document(path)):
+                if document is not None:
+                    content_type, id_value, code_value = document
+                    duplicates.update(
+                        index.matching(root, content_type, 'id', id_value),
+                    )
+                    duplicates.update(
+                        index.matching(root, content_type, 'code', code_value),
+                    )
+    retval |= executor.run(
+        functools.partial(_check_file, checks=('ids',)),
+        sorted(os.path.relpath(p) for p in duplicates - paths),
+    )
+    return retval
+
+
+def _watch(root: str, checks: tuple[str, ...]) -> int:
+    """Re-check files below `root` as they are saved, until interrupted.
+
+    The compiled schemas, the attribute catalog and the content index stay
+    loaded and are patched for each saved file instead of being rebuilt.
+    """
+    from pre_commit_hooks import content_index
+    from pre_commit_hooks import watch
+
+    attribute_catalog.load()
+    content_index.shared_index().refresh(root)
+    print(f'watching {root} for changes, press Ctrl-C to stop', flush=True)
+    try:
+        for paths in watch.changes(root):
+            start = time.perf_counter()
+            try:
+                retval = _recheck(paths, checks, root)
+            except Exception:  # a broken file must not end the watch
+                traceback.print_exc()
+                retval = 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            status = 'problems found' if retval else 'ok'
+            print(f'--- {status} ({elapsed_ms:.0f}ms)', flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    # a watch never ends, it cannot be handed to the daemon
+    args_list = sys.argv[1:] if argv is None else argv
+    if not any(arg.startswith('--watch') for arg in args_list):
+        retval = daemon.forward('quilr-check-all', argv)
+        if retval is not None:
+            return retval
+
+    parser = argparse.ArgumentParser(
+        description=(
+            'Run the quilr content checks, parsing each file only once.  '
+            'Without any check flags every check is run.'
+        ),
+    )
+    parser.add_argument(
+        '--syntax', dest='checks', action='append_const', const='syntax',
+        help='yaml syntax, including duplicate keys (check-yaml).',
+    )
+    parser.add_argument(
+        '--schema', dest='checks', action='append_const', const='schema',
+        help='content schemas (validate-schema).',
+    )
+    parser.add_argument(
+        '--ids', dest='checks', action='append_const', const='ids',
+        help='id / code format and uniqueness (validate-id).',
+    )
+    parser.add_argument(
+        '--attributes', dest='checks', action='append_const',
+        const='attributes',
+        help='referenced attributes and operators (check-attribute).',
+    )
+    parser.add_argument(
+        '--tags', dest='checks', action='append_const', const='tags',
+        help='attribute tags (check-attribute-tags).',
+    )
+    changes.add_argument(parser)
+    parser.add_argument(
+        '--watch', metavar='ROOT',
+        help=(
+            'Keep running and check the files below ROOT as they are saved, '
+            'along with the files depending on them, instead of checking '
+            'the filenames.'
+        ),
+    )
+    parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.watch is not None:
+        return _watch(args.watch, _checks(args))
+
+    with timings.session('quilr-check-all', args):
+        with timings.phase('git'):
+            changed = changes.resolve(parser, args)
+        return _run(args, changes.deleted(changed))
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
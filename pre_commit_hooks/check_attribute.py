@@ -4,18 +4,13 @@ from collections.abc import Sequence
 from typing import Any
 from typing import NamedTuple
 import sys, os
-import yaml
-from pathlib import Path
 
-def getallattribute(location: str):
-    attributes = []
-    for yaml_file in Path(location).rglob("*.yaml"):
-        with open(yaml_file, 'r') as file:
-            data = yaml.safe_load(file)
-        for attribute in data['attributes']:
-            attributes.append(attribute.get('id'))
-    return attributes
-        
+from pre_commit_hooks import attribute_catalog
+from pre_commit_hooks import changes
+from pre_commit_hooks import daemon
+from pre_commit_hooks import executor
+from pre_commit_hooks import timings
+
 list_of_operators = [
   "is greater than",
   "is less than",
@@ -32,7 +27,45 @@ list_of_operators = [
   "is_not_in"
 ]
 
+def check_document(filename: str, file: Any) -> int:
+    catalog = attribute_catalog.load(attribute_catalog.ATTRIBUTES_DIR)
+    if filename.find("classification-config-service/use-case/") != -1:
+        for attribute in file['condition']:
+            if attribute['filter_condition']['attribute_id'] not in catalog:
+                print(f"❌ Attribute {attribute['filter_condition']['attribute_id']} in {filename} is not defined in attributes")
+                return 1
+            if attribute['filter_condition']['condition'] not in list_of_operators:
+                print(f"❌ Operator {attribute['filter_condition']['condition']} in {filename} is not defined in operators")
+                return 1
+    elif filename.find("quilr-playbook-service/static/execution_controls") != -1:
+        for attribute in file['trigger_conditions']:
+            if attribute['filter_condition']['attribute_id'] not in catalog:
+                print(f"❌ Attribute {attribute['filter_condition']['attribute_id']} in {filename} is not defined in attributes")
+                return 1
+            if attribute['filter_condition']['condition'] not in list_of_operators:
+                print(f"❌ Operator {attribute['filter_condition']['condition']} in {filename} is not defined in operators")
+                return 1   
+    return 0
+
+
+def _check_file(filename: str) -> int:
+    from pre_commit_hooks import document_cache
+    from pre_commit_hooks import yaml_loader
+
+    try:
+        file = document_cache.load(filename, yaml_loader.safe_load)
+    except yaml_loader.LimitExceeded as e:
+        print(f"❌ Failed to parse {filename}: {e}")
+        return 1
+    with timings.phase('attributes'):
+        return check_document(filename, file)
+
+
 def main(argv: Sequence[str] | None = None) -> int:
+    retval = daemon.forward('check-attribute', argv)
+    if retval is not None:
+        return retval
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         '-m', '--multi', '--allow-multiple-documents', action='store_true',
@@ -47,29 +80,20 @@ def main(argv: Sequence[str] | None = None) -> int:
             'Implies --allow-multiple-documents'
         ),
     )
+    changes.add_argument(parser)
     parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
     args = parser.parse_args(argv)
-    retval = 0
-    for filename in args.filenames:
-        with open(filename, mode='r') as f:
-            file = yaml.safe_load(f)
-        if filename.find("classification-config-service/use-case/") != -1:
-            for attribute in file['condition']:
-                if attribute['filter_condition']['attribute_id'] not in getallattribute("./static-files/classification-config-service/attributes"):
-                    print(f"❌ Attribute {attribute['filter_condition']['attribute_id']} in {filename} is not defined in attributes")
-                    return 1
-                if attribute['filter_condition']['condition'] not in list_of_operators:
-                    print(f"❌ Operator {attribute['filter_condition']['condition']} in {filename} is not defined in operators")
-                    return 1
-        elif filename.find("quilr-playbook-service/static/execution_controls") != -1:
-            for attribute in file['trigger_conditions']:
-                if attribute['filter_condition']['attribute_id'] not in getallattribute("./static-files/classification-config-service/attributes"):
-                    print(f"❌ Attribute {attribute['filter_condition']['attribute_id']} in {filename} is not defined in attributes")
-                    return 1
-                if attribute['filter_condition']['condition'] not in list_of_operators:
-                    print(f"❌ Operator {attribute['filter_condition']['condition']} in {filename} is not defined in operators")
-                    return 1   
-    return retval
+    with timings.session('check-attribute', args):
+        with timings.phase('git'):
+            changed = changes.resolve(parser, args)
+        filenames = [
+            *args.filenames,
+            *attribute_catalog.dependents(
+                [*args.filenames, *changes.deleted(changed)],
+            ),
+        ]
+        return executor.run(_check_file, filenames, fail_fast=True)
 
 
 if __name__ == '__main__':
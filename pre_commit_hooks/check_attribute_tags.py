@@ -1,22 +1,45 @@
-import yaml
 import os
 from collections.abc import Sequence
 from collections.abc import Generator
 from typing import Any
 import argparse
-from pathlib import Path
-
-def getallattribute(location: str):
-    attributes = {}
-    for yaml_file in Path(location).rglob("*.yaml"):
-        with open(yaml_file, 'r') as file:
-            data = yaml.safe_load(file)
-        for attribute in data['attributes']:
-            attributes[attribute.get('id')] = attribute.get('tags')
-    return attributes
-        
+
+from pre_commit_hooks import attribute_catalog
+from pre_commit_hooks import changes
+from pre_commit_hooks import daemon
+from pre_commit_hooks import executor
+from pre_commit_hooks import timings
+
+
+def check_document(filename: str, file: Any) -> int:
+    catalog = attribute_catalog.load(attribute_catalog.ATTRIBUTES_DIR)
+    if filename.find("classification-config-service/use-case/") != -1:
+        for attribute in file['condition']:
+            # undefined attributes are reported by check-attribute
+            if file.get('code') in (catalog.tags(attribute['filter_condition']['attribute_id']) or ()):
+                print(f"❌ Use-case {file.get('code')} is missing tags for attribute {attribute['filter_condition']['attribute_id']}")
+                return 1
+    return 0
+
+
+def _check_file(filename: str) -> int:
+    from pre_commit_hooks import document_cache
+    from pre_commit_hooks import yaml_loader
+
+    try:
+        file = document_cache.load(filename, yaml_loader.safe_load)
+    except yaml_loader.LimitExceeded as e:
+        print(f"❌ Failed to parse {filename}: {e}")
+        return 1
+    with timings.phase('tags'):
+        return check_document(filename, file)
+
 
 def main(argv: Sequence[str] | None = None) -> int:
+    retval = daemon.forward('check-attribute-tags', argv)
+    if retval is not None:
+        return retval
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         '-m', '--multi', '--allow-multiple-documents', action='store_true',
@@ -30,16 +53,17 @@ def main(argv: Sequence[str] | None = None) -> int:
             'Implies --allow-multiple-documents'
         ),
     )
+    changes.add_argument(parser)
     parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
     args = parser.parse_args(argv)
-    all_attributes = getallattribute("./static-files/classification-config-service/attributes")
-    retval = 0
-    for filename in args.filenames:
-        with open(filename, mode='r') as f:
-            file = yaml.safe_load(f)
-        if filename.find("classification-config-service/use-case/") != -1:
-            for attribute in file['condition']:
-                if file.get('code') in all_attributes[attribute['filter_condition']['attribute_id']]:
-                    print(f"❌ Use-case {file.get('code')} is missing tags for attribute {attribute['filter_condition']['attribute_id']}")
-                    return 1
-    return retval
\ No newline at end of file
+    with timings.session('check-attribute-tags', args):
+        with timings.phase('git'):
+            changed = changes.resolve(parser, args)
+        filenames = [
+            *args.filenames,
+            *attribute_catalog.dependents(
+                [*args.filenames, *changes.deleted(changed)],
+            ),
+        ]
+        return executor.run(_check_file, filenames, fail_fast=True)
\ No newline at end of file
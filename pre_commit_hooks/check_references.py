@@ -0,0 +1,145 @@
+"""Check that documents only reference documents which exist.
+
+Execution controls reference a use-case, a behavior and actions by id,
+actions and use-cases list the ids of behaviors.  Every reference is kept
+in the content index, so only the references of the changed files and the
+ones to the ids the changed files define (or defined) are checked, against
+the ids of all documents below the root.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Any
+
+from pre_commit_hooks import changes
+from pre_commit_hooks import content_index
+from pre_commit_hooks import daemon
+from pre_commit_hooks import timings
+from pre_commit_hooks.schemas import REGISTRY
+
+
+def targets() -> dict[str, tuple[Any, ...]]:
+    """Reference kind -> the document `type`s it may point at."""
+    ref = REGISTRY.find('Behavior_Finding_Schema')
+    assert ref is not None
+    behavior = REGISTRY.schema(ref)
+    return {
+        'use-case': ('use-case',),
+        'behavior': tuple(behavior['properties']['type']['enum']),
+        'action': ('action',),
+    }
+
+
+def to_check(
+        index: content_index.ContentIndex,
+        root: str,
+        filenames: Sequence[str],
+        kinds: dict[str, tuple[Any, ...]],
+        previous: Iterable[tuple[Any, Any]] = (),
+) -> dict[str, set[content_index.Reference]]:
+    """The references which may have changed or now dangle, by file.
+
+    `previous` are the `(type, id)`s the changed files defined before the
+    change (see `defined_at`): references to an id which moved or
+    disappeared have to be checked again.
+    """
+    prefix = os.path.join(os.path.abspath(root), '')
+    changed = {
+        os.path.abspath(filename) for filename in filenames
+        if os.path.abspath(filename).startswith(prefix)
+    }
+    index.refresh(root)
+    after = index.indexed(changed)
+
+    ret = index.references(path for path in changed if path in after)
+    for content_type, id_value in {*after.values(), *previous}:
+        for kind, types in kinds.items():
+            if content_type in types and id_value is not None:
+                for path in index.referencing(root, (id_value,), kind):
+                    ret.setdefault(path, set()).add((kind, id_value))
+    return ret
+
+
+def defined_at(base: str, filenames: Iterable[str]) -> set[tuple[Any, Any]]:
+    """The `(type, id)`s `filenames` defined in commit `base`.
+
+    Taken from git rather than the content index: any earlier refresh (by
+    this hook, validate-id, ...) already replaced what the index knew of
+    the files, and on a fresh CI runner it knows nothing.
+    """
+    import yaml
+
+    from pre_commit_hooks import document_cache
+    from pre_commit_hooks.check_version import BlobReader
+
+    ret: set[tuple[Any, Any]] = set()
+    with BlobReader() as blobs:
+        for filename in filenames:
+            contents = blobs.read(f'{base}:./{filename}')
+            if contents is None:
+                continue  # added since
+            try:
+                data = document_cache.load_paths(contents, (('type',), ('id',)))
+                if isinstance(data, dict):
+                    ret.add((data.get('type'), data.get('id')))
+            except (yaml.YAMLError, TypeError):  # TypeError: unhashable
+                pass
+    return ret
+
+
+def check(
+        root: str,
+        filenames: Sequence[str],
+        previous: Iterable[tuple[Any, Any]] = (),
+) -> int:
+    index = content_index.shared_index()
+    kinds = targets()
+    with timings.phase('index'):
+        references = to_check(index, root, filenames, kinds, previous)
+        ids = {kind: index.ids(root, types) for kind, types in kinds.items()}
+
+    retval = 0
+    with timings.phase('references'):
+        for path, refs in sorted(references.items()):
+            filename = os.path.relpath(path)
+            for kind, target in sorted(refs, key=repr):
+                if kind in ids and target not in ids[kind]:
+                    print(f"❌ {kind} '{target}' referenced in {filename} does not exist")
+                    retval = 1
+    return retval
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    retval = daemon.forward('check-references', argv)
+    if retval is not None:
+        return retval
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--root', default='.',
+        help='Folder of all the documents references may point at (default: %(default)s).',
+    )
+    changes.add_argument(parser)
+    parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with timings.session('check-references', args):
+        with timings.phase('git'):
+            changed = changes.resolve(parser, args)
+            if changed is not None:
+                deleted = changed.deleted
+                previous = defined_at(
+                    changed.base, (*changed.modified, *deleted),
+                )
+            else:  # pre-commit: the staged files against the last commit
+                deleted = changes.staged_deleted()
+                previous = defined_at('HEAD', (*args.filenames, *deleted))
+        return check(args.root, [*args.filenames, *deleted], previous)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
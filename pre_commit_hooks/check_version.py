@@ -1,53 +1,103 @@
-import sys
+from __future__ import annotations
+
+import argparse
+import functools
 import subprocess
-import yaml
-from packaging import version
+from collections.abc import Sequence
+from typing import Any
+
+from pre_commit_hooks import timings
 
-# Get the file path passed as an argument
-file_path = sys.argv[1]
 
 # Function to get the version from a YAML content
-def extract_version(yaml_content):
-    data = yaml.safe_load(yaml_content)
+def extract_version(yaml_content: bytes) -> Any:
+    from pre_commit_hooks import document_cache
+
+    with timings.phase('parse'):
+        data = document_cache.load_paths(yaml_content, [('version',)])
     return data.get("version")
 
-# Read the old (last committed) file using 'git show'
-def get_old_version(file_path):
-    try:
-        old_content = subprocess.check_output(
-            ["git", "show", f"HEAD:{file_path}"], stderr=subprocess.DEVNULL
-        )
-        return extract_version(old_content)
-    except subprocess.CalledProcessError:
-        # File might be new (not in previous commit)
-        return None
-
-# Read the new (staged) version of the file using 'git show :<file>'
-def get_new_version(file_path):
-    try:
-        new_content = subprocess.check_output(
-            ["git", "show", f":{file_path}"], stderr=subprocess.DEVNULL
+
+class BlobReader:
+    """Reads git objects through a single `git cat-file --batch` process."""
+
+    def __init__(self) -> None:
+        self.proc = subprocess.Popen(
+            ('git', 'cat-file', '--batch'),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
         )
-        return extract_version(new_content)
-    except subprocess.CalledProcessError:
-        print(f"Error reading staged version of {file_path}")
-        sys.exit(1)
 
-def main():
-    old_ver = get_old_version(file_path)
-    new_ver = get_new_version(file_path)
+    def read(self, rev: str) -> bytes | None:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        if '\n' in rev:  # cannot be expressed in the batch protocol
+            return None
+        self.proc.stdin.write(f'{rev}\n'.encode())
+        self.proc.stdin.flush()
+        # `<sha> <type> <size>` or `<rev> missing` / `<rev> ambiguous`,
+        # where `<rev>` may contain spaces
+        header = self.proc.stdout.readline().rstrip(b'\n')
+        if header.endswith((b' missing', b' ambiguous')):
+            return None
+        parts = header.rsplit(maxsplit=2)
+        if len(parts) != 3:
+            return None
+        contents = self.proc.stdout.read(int(parts[2]))
+        self.proc.stdout.read(1)  # trailing newline
+        return contents
+
+    def close(self) -> None:
+        assert self.proc.stdin is not None
+        self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self) -> BlobReader:
+        return self
 
-    # If no old version, allow commit (new file)
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _check_file(blobs: BlobReader, file_path: str) -> int:
+    # Read the old (last committed) and the new (staged) file
+    with timings.phase('git'):
+        old_content = blobs.read(f'HEAD:{file_path}')
+        new_content = blobs.read(f':{file_path}')
+
+    # File might be new (not in previous commit)
+    old_ver = extract_version(old_content) if old_content is not None else None
     if old_ver is None:
         print(f"{file_path} is a new file. Skipping version check.")
-        return
+        return 0
+
+    if new_content is None:
+        print(f"Error reading staged version of {file_path}")
+        return 1
+    new_ver = extract_version(new_content)
 
     # Compare versions using packaging.version
+    from packaging import version
     if version.parse(str(new_ver)) <= version.parse(str(old_ver)):
-        print(f"❌ Version check failed: {new_ver} is not greater than {old_ver}")
-        sys.exit(1)
+        print(f"❌ Version check failed for {file_path}: {new_ver} is not greater than {old_ver}")
+        return 1
+
+    print(f"✅ Version check passed for {file_path}: {new_ver} > {old_ver}")
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    retval = 0
+    with timings.session('check-version', args), BlobReader() as blobs:
+        check = functools.partial(_check_file, blobs)
+        for filename in args.filenames:
+            retval |= timings.call(check, filename)
+    return retval
 
-    print(f"✅ Version check passed: {new_ver} > {old_ver}")
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
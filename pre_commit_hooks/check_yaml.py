@@ -1,14 +1,163 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import functools
+import mmap
+import os
+import re
 from collections.abc import Generator
 from collections.abc import Sequence
 from typing import Any
 from typing import NamedTuple
 
-import ruamel.yaml
+from pre_commit_hooks import changes
+from pre_commit_hooks import daemon
+from pre_commit_hooks import executor
+from pre_commit_hooks import limits
+from pre_commit_hooks import timings
 
-yaml = ruamel.yaml.YAML(typ='safe')
+
+@functools.lru_cache(maxsize=None)
+def _yaml(counted: bool = True) -> Any:
+    """ruamel's safe loader, counting the events against the `limits`.
+
+    The counting one always parses in Python: ruamel.yaml.clib's parser,
+    when installed, composes in C where the events cannot be counted.
+    """
+    # ruamel.yaml is only imported once there is a file to check
+    import ruamel.yaml
+    from ruamel.yaml.error import MarkedYAMLError
+    from ruamel.yaml.parser import Parser
+
+    class LimitedParser(Parser):
+        """Counts the events of each file against the `limits`."""
+
+        def reset_parser(self) -> None:
+            super().reset_parser()  # also called once done with a file
+            self.budget: limits.Budget | None = None
+
+        def get_event(self) -> Any:
+            event = super().get_event()
+            if self.budget is None:  # the limits as the file starts
+                self.budget = limits.Budget(MarkedYAMLError)
+            self.budget.count(event)
+            return event
+
+    yaml = ruamel.yaml.YAML(typ='safe')
+    if counted:
+        yaml.Parser = LimitedParser
+    return yaml
+
+
+def _check_size(filename: str) -> None:
+    from ruamel.yaml.error import FileMark
+    from ruamel.yaml.error import MarkedYAMLError
+
+    limits.check_size(
+        os.stat(filename).st_size, MarkedYAMLError,
+        FileMark(filename, 0, 0, 0),
+    )
+
+
+# an anchor or alias indicator where a node may start, it also matches some
+# scalars (which only costs the faster parser)
+_ANCHOR_OR_ALIAS = re.compile(rb'(?:^|[\s,\[{])[&*][^\s,\[\]{}]', re.M)
+# document markers, the counts start over after each
+_DOCUMENT = re.compile(rb'^(?:---|\.\.\.)(?=\s|$)', re.M)
+# what opens / closes a flow collection, or may hide brackets which do not
+_FLOW = re.compile(rb'[\[\]{}#"\']|!<')
+_QUOTED = {
+    b'"': re.compile(rb'(?:[^"\\]|\\.)*"', re.S),
+    b"'": re.compile(rb"(?:[^']|'')*'"),
+}
+
+
+def _quote_starts(contents: Any, pos: int) -> bool:
+    """Whether the quote at `pos`, within a flow collection, starts a scalar.
+
+    Only where a plain scalar cannot have started: after `[`, `{`, `,`, or
+    a `:` indicator (followed by a space, or after a quoted key).
+    """
+    before = pos - 1
+    while before >= 0 and contents[before:before + 1].isspace():
+        before -= 1
+    prev = contents[before:before + 1] if before >= 0 else b''
+    if prev == b':':
+        return before < pos - 1 or contents[before - 1:before] in (b'"', b"'")
+    return prev in (b'[', b'{', b',')
+
+
+def _max_flow_depth(contents: Any) -> int:
+    """How deeply the flow collections of `contents` nest, at most.
+
+    Brackets in quoted scalars and comments inside flow collections are
+    skipped.  Past anything which may hide a closing bracket (a quote
+    which may be part of a plain scalar, a verbatim tag) closing brackets
+    are no longer counted.  Outside flow collections nothing can bring the
+    depth below zero, brackets in block scalars only add to it.
+    """
+    depth = deepest = 0
+    closing = True
+    pos = 0
+    while True:
+        match = _FLOW.search(contents, pos)
+        if match is None:
+            return deepest
+        token, pos = match[0], match.end()
+        if token in (b'[', b'{'):
+            depth += 1
+            deepest = max(deepest, depth)
+        elif token in (b']', b'}'):
+            if closing and depth:
+                depth -= 1
+        elif not depth:
+            continue  # outside flow collections, see above
+        elif token == b'#':
+            if contents[match.start() - 1:match.start()].isspace():
+                newline = contents.find(b'\n', pos)
+                pos = len(contents) if newline == -1 else newline
+        elif token in _QUOTED and _quote_starts(contents, match.start()):
+            quoted = _QUOTED[token].match(contents, pos)
+            if quoted is None:  # unterminated, the parser reports it
+                return deepest
+            pos = quoted.end()
+        else:
+            closing = False
+
+
+def _needs_counting(filename: str) -> bool:
+    """Whether `filename` could exceed the `limits` once loaded.
+
+    Only then are its events counted, at about five times the cost with
+    ruamel.yaml.clib installed.  Without anchors and aliases nothing is
+    repeated.  Every node of a document takes at least half a byte.
+    Nested block collections start further right at least every other
+    level, see `_max_flow_depth` for flow ones.  The time limit is left to
+    the size.  The file is scanned from a memory map.
+    """
+    current = limits.current()
+    with open(filename, 'rb') as f:
+        try:
+            contents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return False
+    with contents:
+        if current.nodes:
+            starts = [0, *(m.start() for m in _DOCUMENT.finditer(contents))]
+            ends = [*starts[1:], len(contents)]
+            largest = max(end - start for start, end in zip(starts, ends))
+            if 2 * largest + 1 > current.nodes:
+                return True
+        if _ANCHOR_OR_ALIAS.search(contents):
+            return True
+        if current.depth:
+            # the lead of a line deep enough for the levels flow ones leave
+            levels = current.depth - _max_flow_depth(contents) - 2
+            lead = max(0, levels // 2 + 1)
+            if re.search(rb'^[ ?:-]{%d}' % lead, contents, re.M):
+                return True
+    return False
 
 
 def _exhaust(gen: Generator[str]) -> None:
@@ -16,12 +165,34 @@ def _exhaust(gen: Generator[str]) -> None:
         pass
 
 
-def _parse_unsafe(*args: Any, **kwargs: Any) -> None:
-    _exhaust(yaml.parse(*args, **kwargs))
+def _load(stream: Any, counted: bool = True) -> None:
+    _yaml(counted).load(stream)
+
 
+def _parse_unsafe(stream: Any, counted: bool = True) -> None:
+    _exhaust(_yaml(counted).parse(stream))
 
-def _load_all(*args: Any, **kwargs: Any) -> None:
-    _exhaust(yaml.load_all(*args, **kwargs))
+
+def _load_all(stream: Any, counted: bool = True) -> None:
+    _exhaust(_yaml(counted).load_all(stream))
+
+
+def _counted_events(stream: Any) -> Generator[Any]:
+    """The parse events of `stream`, counted against the `limits`.
+
+    The events are counted as they are handed out, so the faster parser
+    is used whatever the file holds.
+    """
+    from ruamel.yaml.error import MarkedYAMLError
+
+    budget = limits.Budget(MarkedYAMLError)
+    events = _yaml(counted=False).parse(stream)
+    try:
+        for event in events:
+            budget.count(event)
+            yield event
+    finally:
+        events.close()
 
 
 class Key(NamedTuple):
@@ -30,14 +201,192 @@ class Key(NamedTuple):
 
 
 LOAD_FNS = {
-    Key(multi=False, unsafe=False): yaml.load,
+    Key(multi=False, unsafe=False): _load,
     Key(multi=False, unsafe=True): _parse_unsafe,
     Key(multi=True, unsafe=False): _load_all,
     Key(multi=True, unsafe=True): _parse_unsafe,
 }
 
 
+class Unusual(Exception):
+    """Found something which only a full load reports faithfully."""
+
+
+_MAPPING_TAGS = (None, '!', 'tag:yaml.org,2002:map')
+_SEQUENCE_TAGS = (None, '!', 'tag:yaml.org,2002:seq')
+
+
+class _MappedFile:
+    """A read-only memory map which the yaml reader consumes in chunks.
+
+    Pages which were read are handed back as it goes, so they do not add
+    up in the resident memory of the process.
+    """
+
+    RELEASE = 1 << 20
+
+    def __init__(self, filename: str) -> None:
+        self.name = filename  # parse errors name the file as usual
+        self._decoder = codecs.getincrementaldecoder('UTF-8')()
+        with open(filename, 'rb') as f:
+            try:
+                self._mm: mmap.mmap | None = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ,
+                )
+            except ValueError:  # empty files cannot be mapped
+                self._mm = None
+        self._released = 0
+
+    def read(self, size: int = -1) -> str:
+        if self._mm is None:
+            return ''
+        data = self._mm.read(size)
+        end = self._mm.tell() // mmap.PAGESIZE * mmap.PAGESIZE
+        if end - self._released >= self.RELEASE and hasattr(mmap, 'MADV_DONTNEED'):
+            self._mm.madvise(
+                mmap.MADV_DONTNEED, self._released, end - self._released,
+            )
+            self._released = end
+        return self._decoder.decode(data, final=not data)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+
+
+class _Mapping:
+    def __init__(self) -> None:
+        self.keys: set[Any] = set()
+        self.at_key = True
+
+
+def stream_check(stream: Any, multi: bool) -> None:
+    """Check that `stream` loads, looking at one event at a time.
+
+    Scalars are constructed and mapping keys are checked for duplicates as
+    they are parsed and then discarded, so memory stays bounded by the
+    nesting depth and the size of the mappings' keys.  Parse errors are
+    raised as the parser reports them.  `Unusual` is raised for anything
+    a full load may reject after the whole document is composed (merge
+    keys, explicit collection tags, duplicate keys, undefined aliases, ...).
+    The events are counted against the `limits`.
+    """
+    from ruamel.yaml.events import AliasEvent
+    from ruamel.yaml.events import CollectionEndEvent
+    from ruamel.yaml.events import DocumentStartEvent
+    from ruamel.yaml.events import MappingStartEvent
+    from ruamel.yaml.events import ScalarEvent
+    from ruamel.yaml.events import SequenceStartEvent
+    from ruamel.yaml.nodes import ScalarNode
+
+    yaml = _yaml(counted=False)
+    # the open collections, `None` for sequences
+    stack: list[_Mapping | None] = []
+    anchors: set[str] = set()
+    documents = 0
+
+    def construct(event: ScalarEvent) -> Any:
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = yaml.resolver.resolve(ScalarNode, event.value, event.implicit)
+        if str(tag) == 'tag:yaml.org,2002:merge':
+            raise Unusual
+        node = ScalarNode(tag, event.value, event.start_mark, event.end_mark)
+        try:
+            return yaml.constructor.construct_object(node, deep=True)
+        except Exception:
+            raise Unusual
+        finally:
+            # nothing is kept around for later nodes
+            yaml.constructor.constructed_objects.clear()
+            yaml.constructor.recursive_objects.clear()
+
+    def node_done(key: Any = None, *, scalar: bool = False) -> None:
+        mapping = stack[-1] if stack else None
+        if mapping is None:
+            return
+        if mapping.at_key:
+            if not scalar:
+                raise Unusual  # collections and aliases as keys
+            try:
+                if key in mapping.keys:
+                    raise Unusual
+                mapping.keys.add(key)
+            except TypeError:  # unhashable
+                raise Unusual
+        mapping.at_key = not mapping.at_key
+
+    events = _counted_events(stream)
+    try:
+        for event in events:
+            if isinstance(event, DocumentStartEvent):
+                documents += 1
+                if (documents > 1 and not multi) or event.version:
+                    raise Unusual
+                anchors.clear()
+            elif isinstance(event, AliasEvent):
+                if event.anchor not in anchors:
+                    raise Unusual
+                node_done()
+            elif isinstance(event, ScalarEvent):
+                if event.anchor is not None:
+                    anchors.add(event.anchor)
+                node_done(construct(event), scalar=True)
+            elif isinstance(event, MappingStartEvent):
+                if event.tag not in _MAPPING_TAGS:
+                    raise Unusual
+                if event.anchor is not None:
+                    anchors.add(event.anchor)
+                stack.append(_Mapping())
+            elif isinstance(event, SequenceStartEvent):
+                if event.tag not in _SEQUENCE_TAGS:
+                    raise Unusual
+                if event.anchor is not None:
+                    anchors.add(event.anchor)
+                stack.append(None)
+            elif isinstance(event, CollectionEndEvent):
+                stack.pop()
+                node_done()
+    finally:
+        events.close()
+
+
+def _check_file(filename: str, key: Key, stream: bool = False) -> int:
+    from ruamel.yaml import YAMLError
+
+    try:
+        if stream:
+            with timings.phase('read'):
+                mapped = _MappedFile(filename)
+            try:
+                with timings.phase('parse'):
+                    if key.unsafe:
+                        _exhaust(_counted_events(mapped))
+                    else:
+                        stream_check(mapped, key.multi)
+                return 0
+            except Unusual:
+                pass  # the full load below reports the problem exactly
+            finally:
+                mapped.close()
+
+        if not key.unsafe:  # only parsed, one event at a time otherwise
+            _check_size(filename)
+        counted = _needs_counting(filename)
+        with timings.open_file(filename, encoding='UTF-8') as f:
+            with timings.phase('parse'):
+                LOAD_FNS[key](f, counted)
+    except YAMLError as exc:
+        print(exc)
+        return 1
+    return 0
+
+
 def main(argv: Sequence[str] | None = None) -> int:
+    retval = daemon.forward('check-yaml', argv)
+    if retval is not None:
+        return retval
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         '-m', '--multi', '--allow-multiple-documents', action='store_true',
@@ -52,20 +401,38 @@ def main(argv: Sequence[str] | None = None) -> int:
             'Implies --allow-multiple-documents'
         ),
     )
+    parser.add_argument(
+        '--stream', action='store_true',
+        help=(
+            'Check the files one parse event at a time from a memory map '
+            'instead of loading them, keeping memory use constant for huge '
+            'files.  Files which cannot be checked that way (e.g. ones '
+            'with errors) are loaded as usual.'
+        ),
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Check every file, even ones which passed unchanged before.',
+    )
+    changes.add_argument(parser)
     parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
     args = parser.parse_args(argv)
 
-    load_fn = LOAD_FNS[Key(multi=args.multi, unsafe=args.unsafe)]
-
-    retval = 0
-    for filename in args.filenames:
-        try:
-            with open(filename, encoding='UTF-8') as f:
-                load_fn(f)
-        except ruamel.yaml.YAMLError as exc:
-            print(exc)
-            retval = 1
-    return retval
+    key = Key(multi=args.multi, unsafe=args.unsafe)
+    if args.no_cache:
+        cache = None
+    else:
+        from pre_commit_hooks import result_cache
+        cache = result_cache.open_cache('check-yaml', repr(key))
+    with timings.session('check-yaml', args):
+        with timings.phase('git'):
+            changes.resolve(parser, args)
+        return executor.run(
+            functools.partial(_check_file, key=key, stream=args.stream),
+            args.filenames,
+            cache=cache,
+        )
 
 
 if __name__ == '__main__':
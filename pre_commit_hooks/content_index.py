@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from typing import Any
+
+from pre_commit_hooks import filelist
+from pre_commit_hooks import timings
+from pre_commit_hooks.util import cache_dir
+
+# bump when the table layout changes, the index is rebuilt from scratch
+_SCHEMA_VERSION = 3
+
+_SCHEMA = '''\
+CREATE TABLE documents (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    type TEXT,
+    id TEXT,
+    code TEXT
+);
+CREATE INDEX documents_type_id ON documents (type, id);
+CREATE INDEX documents_type_code ON documents (type, code);
+CREATE TABLE refs (
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX refs_path ON refs (path);
+CREATE INDEX refs_kind_target ON refs (kind, target);
+'''
+
+
+# the only parts of a document the index (and validate-id) looks at
+FIELDS = (('type',), ('id',), ('code',))
+
+# where use-cases / execution controls reference catalog attributes
+_CONDITIONS = ('condition', 'trigger_conditions')
+# references between documents, see `_references`
+_REFERENCE_FIELDS = (
+    *((key, '*', 'filter_condition', 'attribute_id') for key in _CONDITIONS),
+    ('use_case', 'id'),
+    ('behavior',),
+    ('actions', '*', 'name', 'id'),
+)
+
+Reference = tuple[str, Any]
+
+
+def _get(value: Any, *keys: str) -> Any:
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _scalar(value: Any) -> str | int | None:
+    """`value` if sqlite can store and compare it as a key, else `None`."""
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _references(data: dict[Any, Any]) -> set[Reference]:
+    """The `(kind, target)` references a document makes.
+
+    `attribute`: the catalog attribute of a condition, `use-case` /
+    `behavior` / `action`: the id of such a document.
+    """
+    refs: set[Reference] = set()
+
+    def add(kind: str, target: Any) -> None:
+        target = _scalar(target)
+        if target is not None:
+            refs.add((kind, target))
+
+    for key in _CONDITIONS:
+        items = data.get(key)
+        for item in items if isinstance(items, list) else ():
+            add('attribute', _get(item, 'filter_condition', 'attribute_id'))
+
+    add('use-case', _get(data, 'use_case', 'id'))
+    behavior = data.get('behavior')
+    if isinstance(behavior, dict):  # execution controls
+        add('behavior', behavior.get('id'))
+    elif isinstance(behavior, list):  # actions, use-cases
+        for behavior_id in behavior:
+            add('behavior', behavior_id)
+    actions = data.get('actions')
+    for action in actions if isinstance(actions, list) else ():
+        add('action', _get(action, 'name', 'id'))
+    return refs
+
+
+def _read_fields(path: str) -> tuple[Any, Any, Any, set[Reference]]:
+    """`(type, id, code, references)` of `path`, non-scalars as `None`."""
+    import yaml
+
+    from pre_commit_hooks import document_cache
+
+    try:
+        with open(path, 'rb') as f:
+            contents = f.read()
+        data = document_cache.load_paths(
+            contents, FIELDS + _REFERENCE_FIELDS, path,
+        )
+    except (OSError, UnicodeDecodeError, yaml.YAMLError):
+        # reported when the file itself is checked
+        return None, None, None, set()
+    if not isinstance(data, dict):
+        return None, None, None, set()
+    return (
+        _scalar(data.get('type')), _scalar(data.get('id')),
+        _scalar(data.get('code')), _references(data),
+    )
+
+
+class ContentIndex:
+    """Maps (content type, id) and (content type, code) to file paths.
+
+    It also records the references of each file (to catalog attributes and
+    other documents), so the dependents of a changed attribute / document
+    can be found without parsing.
+
+    Rows are refreshed incrementally from file mtimes / sizes so only files
+    which changed since the last run are parsed.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        import sqlite3
+
+        self.db_path = db_path
+        self.db = sqlite3.connect(db_path, timeout=60)
+        self._fresh: set[str] = set()
+        version, = self.db.execute('PRAGMA user_version').fetchone()
+        if version != _SCHEMA_VERSION:
+            with self.db:
+                self.db.execute('DROP TABLE IF EXISTS documents')
+                self.db.execute('DROP TABLE IF EXISTS attribute_refs')
+                self.db.execute('DROP TABLE IF EXISTS refs')
+                self.db.executescript(_SCHEMA)
+                self.db.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+
+    def refresh(self, root: str) -> None:
+        root = os.path.join(os.path.abspath(root), '')
+        if any(root.startswith(fresh) for fresh in self._fresh):
+            return
+        with timings.phase('index'):
+            self._scan(root)
+        self._fresh.add(root)
+
+    def _scan(self, root: str) -> None:
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.db.execute(
+                'SELECT path, mtime_ns, size FROM documents '
+                'WHERE substr(path, 1, ?) = ?',
+                (len(root), root),
+            )
+        }
+        changed = []
+        refs: list[tuple[str, str, Any]] = []
+        for path in filelist.yaml_files(root):
+            st = os.stat(path)
+            stamp = known.pop(path, None)
+            if stamp != (st.st_mtime_ns, st.st_size):
+                *fields, references = _read_fields(path)
+                changed.append((path, st.st_mtime_ns, st.st_size, *fields))
+                refs.extend((path, *ref) for ref in references)
+        self._store(changed, refs, known)
+
+    def _store(
+            self,
+            changed: list[tuple[Any, ...]],
+            refs: list[tuple[str, str, Any]],
+            deleted: Iterable[str],
+    ) -> None:
+        gone = [(path,) for path in deleted]
+        stale = [(path,) for path, *_ in changed] + gone
+        with self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)',
+                changed,
+            )
+            self.db.executemany('DELETE FROM documents WHERE path = ?', gone)
+            self.db.executemany('DELETE FROM refs WHERE path = ?', stale)
+            self.db.executemany('INSERT INTO refs VALUES (?, ?, ?)', refs)
+
+    def invalidate(self) -> None:
+        # re-stat (and re-parse changed files) on the next lookup
+        self._fresh.clear()
+
+    def update(self, paths: Iterable[str]) -> None:
+        """Re-index `paths` (absolute) which were just saved or deleted.
+
+        Nothing else is stat-ed, for processes watching the files.
+        """
+        changed = []
+        refs: list[tuple[str, str, Any]] = []
+        deleted = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                deleted.append(path)
+                continue
+            *fields, references = _read_fields(path)
+            changed.append((path, st.st_mtime_ns, st.st_size, *fields))
+            refs.extend((path, *ref) for ref in references)
+        self._store(changed, refs, deleted)
+
+    def document(self, path: str) -> tuple[Any, Any, Any] | None:
+        """`(type, id, code)` of `path` (absolute) as last indexed."""
+        return self.db.execute(
+            'SELECT type, id, code FROM documents WHERE path = ?', (path,),
+        ).fetchone()
+
+    def _others(
+            self,
+            column: str,
+            filename: str,
+            content_type: Any,
+            value: Any,
+    ) -> list[str]:
+        root = os.path.dirname(os.path.abspath(filename))
+        self.refresh(root)
+        if _scalar(value) is None or _scalar(content_type) != content_type:
+            return []  # never indexed, no other file can share it
+        root = os.path.join(root, '')
+        return [
+            path
+            for path, in self.db.execute(
+                f'SELECT path FROM documents '
+                f'WHERE type IS ? AND {column} = ? AND path != ? '
+                f'AND substr(path, 1, ?) = ?',
+                (
+                    content_type, value, os.path.abspath(filename),
+                    len(root), root,
+                ),
+            )
+        ]
+
+    def duplicate_ids(
+            self,
+            filename: str,
+            content_type: Any,
+            id_value: Any,
+    ) -> list[str]:
+        """Other files next to (or below) `filename` using the same id."""
+        return self._others('id', filename, content_type, id_value)
+
+    def duplicate_codes(
+            self,
+            filename: str,
+            content_type: Any,
+            code_value: Any,
+    ) -> list[str]:
+        """Other files next to (or below) `filename` using the same code."""
+        return self._others('code', filename, content_type, code_value)
+
+    def matching(
+            self,
+            root: str,
+            content_type: Any,
+            column: str,
+            value: Any,
+    ) -> list[str]:
+        """Files below `root` of `content_type` using `value` as id / code."""
+        self.refresh(root)
+        if _scalar(value) is None:
+            return []
+        root = os.path.join(os.path.abspath(root), '')
+        return [
+            path
+            for path, in self.db.execute(
+                f'SELECT path FROM documents '
+                f'WHERE type IS ? AND {column} = ? AND substr(path, 1, ?) = ?',
+                (content_type, value, len(root), root),
+            )
+        ]
+
+    def documents(self, root: str) -> list[tuple[str, Any, Any, Any]]:
+        """`(path, type, id, code)` of every document below `root`."""
+        self.refresh(root)
+        root = os.path.join(os.path.abspath(root), '')
+        return self.db.execute(
+            'SELECT path, type, id, code FROM documents '
+            'WHERE substr(path, 1, ?) = ? ORDER BY path',
+            (len(root), root),
+        ).fetchall()
+
+    def duplicates(self, root: str, column: str) -> list[list[str]]:
+        """Groups of files below `root` sharing a type and id / code."""
+        self.refresh(root)
+        root = os.path.join(os.path.abspath(root), '')
+        return [
+            paths.split('\0')
+            for paths, in self.db.execute(
+                f'SELECT group_concat(path, char(0)) FROM documents '
+                f'WHERE {column} IS NOT NULL AND substr(path, 1, ?) = ? '
+                f'GROUP BY type, {column} HAVING count(*) > 1',
+                (len(root), root),
+            )
+        ]
+
+    def indexed(self, paths: Iterable[str]) -> dict[str, tuple[Any, Any]]:
+        """`(type, id)` of those of `paths` (absolute) as last indexed."""
+        ret = {}
+        for path in paths:
+            row = self.db.execute(
+                'SELECT type, id FROM documents WHERE path = ?', (path,),
+            ).fetchone()
+            if row is not None:
+                ret[path] = row
+        return ret
+
+    def referenced(self, root: str, kind: str = 'attribute') -> set[Any]:
+        """Every target of a `kind` reference below `root`."""
+        self.refresh(root)
+        root = os.path.join(os.path.abspath(root), '')
+        return {
+            target
+            for target, in self.db.execute(
+                'SELECT DISTINCT target FROM refs '
+                'WHERE kind = ? AND substr(path, 1, ?) = ?',
+                (kind, len(root), root),
+            )
+        }
+
+    def referencing(
+            self,
+            root: str,
+            targets: Iterable[Any],
+            kind: str = 'attribute',
+    ) -> set[str]:
+        """Files below `root` with a `kind` reference to any of `targets`."""
+        self.refresh(root)
+        root = os.path.join(os.path.abspath(root), '')
+        ret: set[str] = set()
+        for target in set(targets):
+            ret.update(
+                path
+                for path, in self.db.execute(
+                    'SELECT path FROM refs '
+                    'WHERE kind = ? AND target = ? AND substr(path, 1, ?) = ?',
+                    (kind, target, len(root), root),
+                )
+            )
+        return ret
+
+    def references(self, paths: Iterable[str]) -> dict[str, set[Reference]]:
+        """The references of each of `paths` (absolute, already indexed)."""
+        ret: dict[str, set[Reference]] = {}
+        for path in paths:
+            ret[path] = {
+                (kind, target)
+                for kind, target in self.db.execute(
+                    'SELECT kind, target FROM refs WHERE path = ?', (path,),
+                )
+            }
+        return ret
+
+    def ids(self, root: str, types: Iterable[Any]) -> set[Any]:
+        """The ids of the documents of any of `types` below `root`."""
+        self.refresh(root)
+        root = os.path.join(os.path.abspath(root), '')
+        types = list(types)
+        return {
+            id_value
+            for id_value, in self.db.execute(
+                f'SELECT id FROM documents '
+                f'WHERE type IN ({", ".join("?" * len(types))}) '
+                f'AND id IS NOT NULL AND substr(path, 1, ?) = ?',
+                (*types, len(root), root),
+            )
+        }
+
+
+def open_index() -> ContentIndex:
+    import sqlite3
+
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        return ContentIndex(os.path.join(cache_dir(), 'content-index.db'))
+    except (OSError, sqlite3.Error):
+        # unwritable cache: still index, just not across runs
+        return ContentIndex(':memory:')
+
+
+_shared: dict[int, ContentIndex] = {}
+
+
+def shared_index() -> ContentIndex:
+    """One index per process (sqlite connections must not cross a fork).
+
+    A forked worker does not refresh again what its parent refreshed before
+    starting it: the parent's rows are already in the same database.
+    """
+    pid = os.getpid()
+    if pid not in _shared:
+        index = open_index()
+        if index.db_path != ':memory:':
+            for parent in _shared.values():
+                if parent.db_path == index.db_path:
+                    index._fresh |= parent._fresh
+        _shared[pid] = index
+    return _shared[pid]
+
+
+def invalidate() -> None:
+    for index in _shared.values():
+        index.invalidate()
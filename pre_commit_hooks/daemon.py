@@ -0,0 +1,179 @@
+"""Opt-in validation daemon keeping schemas and indexes warm.
+
+`quilr-hooks-daemon start` runs a background process for the current
+repository.  While its socket exists, hooks forward their arguments to it
+instead of running in-process; the daemon runs the same `main` with warm
+caches (catalog, content index, compiled schemas) and sends back the output
+and exit code.  Without a daemon, or when it cannot be reached, hooks run
+in-process as usual.
+
+Each request carries a hash of the client's source and its `QUILR_HOOKS_*`
+settings.  Hooks also run in-process when the daemon was started with
+other settings, and when its source is stale (e.g. after an upgrade) the
+daemon exits as well; `start` replaces a stale daemon.
+
+Hooks import this module first, so it stays cheap to import: the server
+lives in `daemon_server`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from pre_commit_hooks import timings
+from pre_commit_hooks.util import cache_path
+from pre_commit_hooks.util import source_hash
+
+HOOKS = {
+    'check-yaml': 'pre_commit_hooks.check_yaml',
+    'check-attribute': 'pre_commit_hooks.check_attribute',
+    'check-attribute-tags': 'pre_commit_hooks.check_attribute_tags',
+    'validate-schema': 'pre_commit_hooks.validate_schema',
+    'validate-id': 'pre_commit_hooks.validate_uuid',
+    'validate-tags': 'pre_commit_hooks.validate_tags',
+    'check-references': 'pre_commit_hooks.check_references',
+    'quilr-check-all': 'pre_commit_hooks.check_all',
+}
+
+# called before every request: caches re-stat their files instead of
+# trusting what they loaded for a previous request
+INVALIDATE = (
+    'pre_commit_hooks.attribute_catalog:invalidate',
+    'pre_commit_hooks.content_index:invalidate',
+    'pre_commit_hooks.tag_index:invalidate',
+    'pre_commit_hooks.filelist:invalidate',
+)
+
+
+def socket_path() -> str:
+    return cache_path('daemon', os.path.realpath(os.getcwd()), '.sock')
+
+
+def environment() -> dict[str, str]:
+    """The hooks' settings, which a daemon must have been started with."""
+    return {
+        name: value for name, value in os.environ.items()
+        if name.startswith('QUILR_HOOKS_') and name != 'QUILR_HOOKS_NO_DAEMON'
+    }
+
+
+def _send(request: dict[str, Any], timeout: float | None) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1)
+        sock.connect(socket_path())
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+
+def forward(hook: str, argv: Sequence[str] | None) -> int | None:
+    """Run `hook` in the daemon, `None` when it has to run in-process."""
+    if (
+            not hasattr(socket, 'AF_UNIX') or
+            os.environ.get('QUILR_HOOKS_NO_DAEMON') or
+            # instrumented from the environment: measure this process
+            os.environ.get(timings.ENV) or
+            os.environ.get(timings.PROFILE_ENV) or
+            not os.path.exists(socket_path())
+    ):
+        return None
+
+    if argv is None:
+        argv = sys.argv[1:]
+    request = {
+        'hook': hook,
+        'argv': list(argv),
+        'cwd': os.getcwd(),
+        'source': source_hash(),
+        'env': environment(),
+    }
+    try:
+        response = _send(request, timeout=None)
+    except (OSError, ValueError):
+        return None
+    if response.get('retval') is None:
+        return None
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return int(response['retval'])
+
+
+def _ping() -> tuple[int, str] | None:
+    """`(pid, source hash)` of the daemon running, if any."""
+    try:
+        response = _send({'command': 'ping'}, timeout=5)
+        return response['pid'], response['source']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _stop() -> None:
+    _send({'command': 'stop'}, timeout=5)
+    for _ in range(50):
+        if not os.path.exists(socket_path()):
+            return
+        time.sleep(.1)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Keep quilr hook state warm for the current repository.',
+    )
+    parser.add_argument('command', choices=('start', 'stop', 'status', 'run'))
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print('the daemon needs unix domain sockets')
+        return 1
+
+    running = _ping()
+    if args.command == 'status':
+        if running is None:
+            print('not running')
+            return 1
+        pid, source = running
+        stale = ', stale' if source != source_hash() else ''
+        print(f'running (pid {pid}{stale})')
+        return 0
+    elif args.command == 'stop':
+        if running is not None:
+            _stop()
+        return 0
+    elif running is not None:
+        pid, source = running
+        if source == source_hash():
+            print(f'already running (pid {pid})')
+            return 1
+        _stop()  # started from another version of the hooks
+
+    if args.command == 'run':
+        from pre_commit_hooks import daemon_server
+        return daemon_server.serve()
+
+    import subprocess
+    subprocess.Popen(
+        (sys.executable, '-m', 'pre_commit_hooks.daemon', 'run'),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    for _ in range(50):
+        running = _ping()
+        if running is not None:
+            print(f'started (pid {running[0]})')
+            return 0
+        time.sleep(.1)
+    print('daemon did not start')
+    return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""The daemon process itself, see `daemon`."""
+from __future__ import annotations
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import socketserver
+import sys
+import traceback
+from collections.abc import Callable
+from typing import Any
+
+from pre_commit_hooks.daemon import environment
+from pre_commit_hooks.daemon import HOOKS
+from pre_commit_hooks.daemon import INVALIDATE
+from pre_commit_hooks.daemon import socket_path
+from pre_commit_hooks.util import source_hash
+
+
+def _resolve(ref: str) -> Callable[..., Any]:
+    module, _, attr = ref.partition(':')
+    return getattr(importlib.import_module(module), attr)
+
+
+def _run_hook(hook: str, argv: list[str]) -> dict[str, Any]:
+    for ref in INVALIDATE:
+        _resolve(ref)()
+
+    # so argparse messages name the hook rather than the daemon
+    sys.argv = [hook, *argv]
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            retval = importlib.import_module(HOOKS[hook]).main(argv)
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                retval = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                retval = 1
+        except Exception:
+            traceback.print_exc()
+            retval = 1
+    return {
+        'retval': retval or 0,
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue(),
+    }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        if request.get('command') == 'stop':
+            response: dict[str, Any] = {'stopping': True}
+            self.server.stopping = True
+        elif request.get('command') == 'ping':
+            response = {'pid': os.getpid(), 'source': self.server.source}
+        elif request.get('source') != self.server.source:
+            # the hooks changed since the daemon started, it is of no use
+            response = {'retval': None}
+            self.server.stopping = True
+        elif (
+                request.get('env') != self.server.env or
+                os.path.realpath(request['cwd']) != os.path.realpath('.') or
+                request['hook'] not in HOOKS
+        ):
+            # not ours to answer, the client runs the hook itself
+            response = {'retval': None}
+        else:
+            response = _run_hook(request['hook'], request['argv'])
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class _Server(socketserver.UnixStreamServer):
+    stopping = False
+    # what the hooks run by the daemon are, see `daemon.forward`
+    source = ''
+    env: dict[str, str] = {}
+
+
+def serve() -> int:
+    env = environment()
+    # hooks run by the daemon (and their workers) must not forward to it
+    os.environ['QUILR_HOOKS_NO_DAEMON'] = '1'
+
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+    old_umask = os.umask(0o077)
+    try:
+        server = _Server(path, _Handler)
+    finally:
+        os.umask(old_umask)
+    server.source = source_hash()
+    server.env = env
+
+    # requests are handled one at a time: hooks share process-wide caches
+    try:
+        with server:
+            while not server.stopping:
+                server.handle_request()
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+    return 0
@@ -0,0 +1,274 @@
+"""Parsed documents shared by the hooks of a run, keyed by content hash.
+
+pre-commit runs each hook in its own process and most of them parse the
+same staged files.  The first one to load a file stores the document in
+`documents.db` in the cache folder, marshalled (pickled when it holds what
+marshal cannot store, e.g. dates), the others load it from there instead
+of parsing.  Keys hash the contents, the loader which parsed them, the
+PyYAML version and the `limits`.  Documents loaded while rejecting
+duplicate keys are marked as such, for loads which must reject them.
+Parse errors are not stored, their messages stay those of each hook's own
+parser.
+
+The cache folder is not trusted: pickles only unpickle to the types a
+document holds besides what marshal stores (dates, times and their
+timezones), anything else is parsed again.
+
+The newest `QUILR_HOOKS_DOCUMENT_CACHE_SIZE` (default 20000) documents are
+kept.  `QUILR_HOOKS_NO_DOCUMENT_CACHE=1` turns the cache off.
+"""
+from __future__ import annotations
+
+import datetime
+import functools
+import hashlib
+import io
+import marshal
+import os
+import pickle
+import sqlite3
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Any
+from typing import IO
+
+from pre_commit_hooks import timings
+from pre_commit_hooks.util import cache_dir
+
+SIZE_ENV = 'QUILR_HOOKS_DOCUMENT_CACHE_SIZE'
+DISABLE_ENV = 'QUILR_HOOKS_NO_DOCUMENT_CACHE'
+DEFAULT_SIZE = 20_000
+
+# bump when the table layout or what is stored changes, the cache is dropped
+_SCHEMA_VERSION = 2
+
+_SCHEMA = '''\
+CREATE TABLE documents (
+    seq INTEGER PRIMARY KEY,
+    key BLOB NOT NULL UNIQUE,
+    unique_keys INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+'''
+
+_MARSHAL = b'm'
+_PICKLE = b'p'
+
+
+def _dumps(data: Any) -> bytes | None:
+    try:
+        return _MARSHAL + marshal.dumps(data)
+    except ValueError:  # e.g. dates
+        pass
+    try:
+        return _PICKLE + pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RecursionError, TypeError):
+        return None
+
+
+# what a pickled document may refer to (sets and the like are opcodes)
+_PICKLED = {
+    ('datetime', 'date'): datetime.date,
+    ('datetime', 'datetime'): datetime.datetime,
+    ('datetime', 'timedelta'): datetime.timedelta,
+    ('datetime', 'timezone'): datetime.timezone,
+}
+
+
+class _Unpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str) -> Any:
+        try:
+            return _PICKLED[module, name]
+        except KeyError:
+            raise pickle.UnpicklingError(f'{module}.{name} is not allowed')
+
+
+def _loads(blob: bytes) -> Any:
+    if blob[:1] == _MARSHAL:
+        return marshal.loads(memoryview(blob)[1:])
+    else:
+        return _Unpickler(io.BytesIO(memoryview(blob)[1:])).load()
+
+
+def _loader_name(parse: Callable[..., Any]) -> str:
+    """The name `parse` is stored under, that of the function it wraps.
+
+    The `unique_keys` of a `functools.partial` is stored beside the
+    document, so a document loaded rejecting duplicate keys serves the
+    loads which do not.
+    """
+    while isinstance(parse, functools.partial):
+        parse = parse.func
+    return f'{parse.__module__}.{parse.__qualname__}'
+
+
+_key_prefix: bytes | None = None
+
+
+def _key(contents: bytes, loader: str) -> bytes:
+    global _key_prefix
+    if _key_prefix is None:
+        import yaml
+
+        versions = (_SCHEMA_VERSION, yaml.__version__)
+        _key_prefix = ''.join(f'{part}\0' for part in versions).encode()
+
+    from pre_commit_hooks import limits
+
+    # documents stored under laxer limits are parsed again
+    parts = (loader, *limits.current())
+    prefix = _key_prefix + ''.join(f'{part}\0' for part in parts).encode()
+    return hashlib.blake2b(prefix + contents, digest_size=20).digest()
+
+
+class DocumentCache:
+    def __init__(self, db_path: str, max_entries: int) -> None:
+        self.db = sqlite3.connect(db_path, timeout=60)
+        self.max_entries = max_entries
+        version, = self.db.execute('PRAGMA user_version').fetchone()
+        if version != _SCHEMA_VERSION:
+            with self.db:
+                self.db.execute('DROP TABLE IF EXISTS documents')
+                self.db.executescript(_SCHEMA)
+                self.db.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+        # hooks and their workers write concurrently, losing the last few
+        # documents on a crash is fine
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = OFF')
+
+    def get(self, key: bytes, unique_keys: bool) -> tuple[bool, Any]:
+        try:
+            row = self.db.execute(
+                'SELECT unique_keys, data FROM documents WHERE key = ?',
+                (key,),
+            ).fetchone()
+        except sqlite3.Error:
+            return False, None
+        if row is None or (unique_keys and not row[0]):
+            return False, None
+        try:
+            return True, _loads(row[1])
+        except Exception:  # written by something else, parse instead
+            return False, None
+
+    def put(self, key: bytes, data: Any, unique_keys: bool) -> None:
+        blob = _dumps(data)
+        if blob is None:
+            return
+        try:
+            with self.db:
+                self.db.execute(
+                    'INSERT INTO documents (key, unique_keys, data) '
+                    'VALUES (?, ?, ?) '
+                    'ON CONFLICT (key) DO UPDATE '
+                    'SET unique_keys = max(unique_keys, excluded.unique_keys)',
+                    (key, unique_keys, blob),
+                )
+                self.db.execute(
+                    'DELETE FROM documents '
+                    'WHERE seq <= (SELECT max(seq) FROM documents) - ?',
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            pass  # the cache is an optimization, never fail the hook over it
+
+
+def open_cache() -> DocumentCache | None:
+    if os.environ.get(DISABLE_ENV):
+        return None
+    max_entries = int(os.environ.get(SIZE_ENV) or DEFAULT_SIZE)
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        return DocumentCache(
+            os.path.join(cache_dir(), 'documents.db'), max_entries,
+        )
+    except (OSError, sqlite3.Error):
+        return None
+
+
+_shared: dict[int, DocumentCache | None] = {}
+
+
+def shared_cache() -> DocumentCache | None:
+    """One cache per process (sqlite connections must not cross a fork)."""
+    pid = os.getpid()
+    if pid not in _shared:
+        _shared[pid] = open_cache()
+    return _shared[pid]
+
+
+def _text(contents: bytes, filename: str, encoding: str | None) -> IO[str]:
+    """`contents` read as if `filename` was opened as text."""
+    buf = io.BytesIO(contents)
+    buf.name = filename  # parse errors name the file as usual
+    return io.TextIOWrapper(buf, encoding=encoding)
+
+
+def load(
+        filename: str,
+        parse: Callable[[IO[str]], Any],
+        *,
+        unique_keys: bool = False,
+        encoding: str | None = None,
+) -> Any:
+    """`parse(f)` of `filename` opened as text, unless stored before.
+
+    `parse` builds what `yaml.safe_load` does, rejecting duplicate keys
+    when `unique_keys`, and is stored under the name of its function.  Its
+    errors propagate as usual, as does a `yaml_loader.LimitExceeded` for a
+    file too large to be read.
+    """
+    from pre_commit_hooks import yaml_loader
+
+    yaml_loader.check_size(os.stat(filename).st_size, filename)
+    cache = shared_cache()
+    if cache is None:
+        with timings.open_file(filename, encoding=encoding) as f:
+            with timings.phase('parse'):
+                return parse(f)
+
+    with timings.phase('read'):
+        with open(filename, 'rb') as f:
+            contents = f.read()
+    key = _key(contents, _loader_name(parse))
+    with timings.phase('documents'):
+        found, data = cache.get(key, unique_keys)
+    if found:
+        return data
+
+    with timings.phase('parse'):
+        data = parse(_text(contents, filename, encoding))
+    with timings.phase('documents'):
+        cache.put(key, data, unique_keys)
+    return data
+
+
+def load_paths(
+        contents: bytes,
+        paths: Iterable[Sequence[str]],
+        filename: str | None = None,
+) -> Any:
+    """`yaml_loader.load_paths`, or the whole document if one is stored.
+
+    For loaders which only look at parts of a document: one stored by
+    the loaders of `yaml_loader` is cheaper than parsing those parts,
+    nothing is stored otherwise.  With a `filename` the contents are read
+    as that file opened as text.
+    """
+    from pre_commit_hooks import yaml_loader
+
+    yaml_loader.check_size(len(contents), filename or '<byte string>')
+    cache = shared_cache()
+    if cache is not None:
+        for loader in (yaml_loader.load, yaml_loader.safe_load):
+            with timings.phase('documents'):
+                found, data = cache.get(
+                    _key(contents, _loader_name(loader)), unique_keys=False,
+                )
+            if found:
+                return data
+
+    if filename is not None:
+        return yaml_loader.load_paths(_text(contents, filename, None), paths)
+    return yaml_loader.load_paths(contents, paths)
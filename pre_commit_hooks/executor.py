@@ -0,0 +1,154 @@
+"""Run a per-file check over many files, in parallel when it pays off.
+
+Checks are plain functions taking a filename, printing their messages and
+returning an exit code.  In a process pool the output of each file is
+captured and replayed in the original file order, so the output and the
+merged exit code are the same as a serial run.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sys
+from collections.abc import Callable
+from collections.abc import Generator
+from collections.abc import Sequence
+from typing import Any
+from typing import NamedTuple
+from typing import TYPE_CHECKING
+
+from pre_commit_hooks import timings
+
+if TYPE_CHECKING:
+    from pre_commit_hooks.result_cache import ResultCache
+
+# below this many files starting worker processes costs more than it saves
+SERIAL_THRESHOLD = 64
+
+Check = Callable[[str], int]
+
+
+class Result(NamedTuple):
+    retval: int
+    output: str
+
+
+def jobs() -> int:
+    env = os.environ.get('QUILR_HOOKS_JOBS')
+    if env:
+        return max(int(env), 1)
+    else:
+        return os.cpu_count() or 1
+
+
+def _call_chunk(
+        fn: Check,
+        filenames: Sequence[str],
+        timed: bool,
+) -> tuple[list[Result], dict[str, Any] | None]:
+    recorder = timings.Recorder() if timed else None
+    ret = []
+    with timings.recording(recorder):
+        for filename in filenames:
+            buf = io.StringIO()
+            with contextlib.redirect_stdout(buf):
+                retval = timings.call(fn, filename)
+            ret.append(Result(retval, buf.getvalue()))
+    return ret, recorder.state() if recorder is not None else None
+
+
+def _serial(fn: Check, filenames: Sequence[str]) -> Generator[Result]:
+    for filename in filenames:
+        # output goes straight to stdout, nothing to replay
+        yield Result(timings.call(fn, filename), '')
+
+
+def _captured(fn: Check, filenames: Sequence[str]) -> Generator[Result]:
+    for filename in filenames:
+        results, _ = _call_chunk(fn, (filename,), timed=False)
+        yield from results
+
+
+def _parallel(
+        fn: Check,
+        filenames: Sequence[str],
+        n_jobs: int,
+) -> Generator[Result]:
+    import concurrent.futures
+
+    chunksize = max(len(filenames) // (n_jobs * 4), 1)
+    chunks = [
+        filenames[i:i + chunksize]
+        for i in range(0, len(filenames), chunksize)
+    ]
+    with concurrent.futures.ProcessPoolExecutor(n_jobs) as pool:
+        futures = [
+            pool.submit(_call_chunk, fn, chunk, timings.enabled())
+            for chunk in chunks
+        ]
+        try:
+            for future in futures:
+                results, recorded = future.result()
+                timings.merge(recorded)
+                yield from results
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def run(
+        fn: Check,
+        filenames: Sequence[str],
+        *,
+        fail_fast: bool = False,
+        cache: ResultCache | None = None,
+) -> int:
+    """Apply `fn` to each filename, merging exit codes like a serial loop.
+
+    With `fail_fast` nothing after the first failing file is reported and
+    `1` is returned, for hooks which stop at the first problem.  Files
+    which passed with the same `cache` key before are not checked again.
+    """
+    keys: dict[str, str | None] = {}
+    cached: dict[str, str] = {}
+    if cache is not None:
+        with timings.phase('cache'):
+            keys = {filename: cache.key(filename) for filename in filenames}
+            cached = cache.get_many(
+                {key for key in keys.values() if key is not None},
+            )
+    todo = [
+        filename for filename in filenames
+        if keys.get(filename) not in cached
+    ]
+
+    n_jobs = min(jobs(), len(todo) // SERIAL_THRESHOLD + 1)
+    if n_jobs > 1 and not timings.profiling():
+        results = _parallel(fn, todo, n_jobs)
+    elif cache is not None:
+        results = _captured(fn, todo)
+    else:
+        results = _serial(fn, todo)
+
+    retval = 0
+    passed = {}
+    try:
+        with contextlib.closing(results):
+            for filename in filenames:
+                key = keys.get(filename)
+                if key in cached:
+                    sys.stdout.write(cached[key])
+                    continue
+                result = next(results)
+                sys.stdout.write(result.output)
+                retval |= result.retval
+                if key is not None and not result.retval:
+                    passed[key] = result.output
+                if fail_fast and result.retval:
+                    return 1
+    finally:
+        if cache is not None:
+            with timings.phase('cache'):
+                cache.update(passed, used=cached)
+    return retval
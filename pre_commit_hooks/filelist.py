@@ -0,0 +1,199 @@
+"""The yaml files below a folder, listed once per process.
+
+In a git work tree a single `git ls-files` lists the tracked files of the
+whole repository, so untracked build output is never descended into and
+nothing is stat-ed; files deleted from the work tree are left out.
+Elsewhere, or without git, the tree is walked with `os.scandir`, leaving
+out what `.gitignore` files ignore.  Hidden folders (`.git`, `.tox`, ...)
+are skipped either way.
+
+Listings are shared by every scan of the process, `invalidate` makes long
+lived processes list again.
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import re
+import subprocess
+from typing import NamedTuple
+
+
+def _is_yaml(filename: str) -> bool:
+    return filename.endswith(('.yaml', '.yml'))
+
+
+class _Rule(NamedTuple):
+    pattern: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def _translate(pattern: str) -> str:
+    """A `.gitignore` pattern as a regex for `/`-separated paths."""
+    ret = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            ret += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            ret += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            ret += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            ret += '[^/]'
+            i += 1
+        elif pattern[i] == '[' and pattern.find(']', i + 2) != -1:
+            end = pattern.find(']', i + 2)
+            chars = pattern[i + 1:end].replace('\\', '\\\\')
+            if chars.startswith('!'):
+                chars = f'^{chars[1:]}'
+            ret += f'[{chars}]'
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            ret += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            ret += re.escape(pattern[i])
+            i += 1
+    return ret
+
+
+def _read_rules(directory: str, rel: str) -> list[_Rule]:
+    """The rules of `directory`'s `.gitignore`, `rel` being its path."""
+    try:
+        with open(os.path.join(directory, '.gitignore')) as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    ret = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # patterns with a slash are relative to the .gitignore, others
+        # match at any depth below it
+        if '/' in line:
+            regex = _translate(line.lstrip('/'))
+        else:
+            regex = f'(?:.*/)?{_translate(line)}'
+        ret.append(_Rule(re.compile(f'{re.escape(rel)}{regex}$'), negate, dir_only))
+    return ret
+
+
+def _ignored(rules: list[_Rule], path: str, is_dir: bool) -> bool:
+    ret = False
+    for rule in rules:  # the last matching rule wins
+        if (is_dir or not rule.dir_only) and rule.pattern.match(path):
+            ret = not rule.negate
+    return ret
+
+
+def _walk(base: str) -> list[str]:
+    ret = []
+
+    def walk(directory: str, rel: str, rules: list[_Rule]) -> None:
+        rules = rules + _read_rules(directory, rel)
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            path = f'{rel}{entry.name}'
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if (
+                        not entry.name.startswith('.') and
+                        not _ignored(rules, path, is_dir=True)
+                ):
+                    walk(entry.path, f'{path}/', rules)
+            elif (
+                    _is_yaml(entry.name) and
+                    not _ignored(rules, path, is_dir=False)
+            ):
+                ret.append(path)
+
+    walk(base, '', [])
+    return sorted(ret)
+
+
+def _git(directory: str) -> tuple[str, list[str]] | None:
+    """The work tree containing `directory` and its tracked yaml files."""
+    try:
+        toplevel = subprocess.run(
+            ('git', 'rev-parse', '--show-toplevel'),
+            cwd=directory, capture_output=True, text=True, check=True,
+        ).stdout.rstrip('\n')
+        # `<tag> <path>\0`, deleted files are listed a second time as `R`
+        out = subprocess.run(
+            (
+                'git', 'ls-files', '-z', '-t', '--cached', '--deleted',
+                '--full-name', '--', ':/*.yaml', ':/*.yml',
+            ),
+            cwd=directory, capture_output=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if not toplevel:
+        return None  # inside .git
+
+    tracked, deleted = set(), set()
+    for entry in os.fsdecode(out).split('\0')[:-1]:
+        tag, _, path = entry.partition(' ')
+        if tag in {'R', 'r'}:
+            deleted.add(path)
+        elif tag in {'H', 'h', 'M', 'm'}:  # lowercase: assume-unchanged
+            tracked.add(path)
+    return os.path.realpath(toplevel), sorted(tracked - deleted)
+
+
+# real path of a listed folder -> its yaml files, `/`-separated and sorted
+_listings: dict[str, list[str]] = {}
+
+
+def yaml_files(root: str) -> list[str]:
+    """The yaml files below `root`, sorted and joined to its absolute path."""
+    root = os.path.abspath(root)
+    real = os.path.realpath(root)
+    for base, listing in _listings.items():
+        if real == base or real.startswith(os.path.join(base, '')):
+            break
+    else:
+        found = _git(real) if os.path.isdir(real) else None
+        if found is None:
+            base, listing = real, _walk(real)
+        else:
+            base, listing = found
+        _listings[base] = listing
+
+    rel = os.path.relpath(real, base)
+    prefix = '' if rel == os.curdir else rel.replace(os.sep, '/') + '/'
+    ret = []
+    for i in range(bisect.bisect_left(listing, prefix), len(listing)):
+        path = listing[i]
+        if not path.startswith(prefix):
+            break
+        *dirs, filename = path[len(prefix):].split('/')
+        if not any(d.startswith('.') for d in dirs):
+            ret.append(os.path.join(root, *dirs, filename))
+    return ret
+
+
+def invalidate() -> None:
+    """Make the next `yaml_files` list the files again."""
+    _listings.clear()
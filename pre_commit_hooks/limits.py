@@ -0,0 +1,196 @@
+"""Per-document limits on what the yaml loaders take on.
+
+A small file can still stand for a huge document: aliases let a few lines
+repeat millions of nodes ("billion laughs"), and nothing bounds the size
+or nesting of a file otherwise.  Every loader counts the parse events of
+each document against these limits as it goes and fails the file as soon
+as one is exceeded, instead of stalling the hook:
+
+    QUILR_HOOKS_YAML_MAX_SIZE         bytes of a file loaded whole
+                                      (default 64 MiB)
+    QUILR_HOOKS_YAML_MAX_DEPTH        nested collections (default 200)
+    QUILR_HOOKS_YAML_MAX_NODES        nodes (default 1000000)
+    QUILR_HOOKS_YAML_MAX_ALIAS_NODES  nodes repeated by aliases, counting
+                                      what their anchor repeats in turn
+                                      (default 100000)
+    QUILR_HOOKS_YAML_MAX_SECONDS      time spent loading (default 30)
+
+The counts start over with each document of a multi-document file, as
+anchors do: a long stream of small documents is fine.  The size is only
+checked for files loaded whole, not for those only parsed one event at a
+time (`check-yaml --stream` / `--unsafe`).
+
+`0` turns a limit off.  Hooks only use a daemon started with the same
+limits.
+
+This module knows nothing of either yaml library: loaders pass the events
+they parse to a `Budget` along with the error type they raise.
+"""
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+from typing import NamedTuple
+
+
+class Limits(NamedTuple):
+    size: int
+    depth: int
+    nodes: int
+    alias_nodes: int
+    seconds: float
+
+
+DEFAULTS = Limits(
+    size=64 << 20,
+    depth=200,
+    nodes=1_000_000,
+    alias_nodes=100_000,
+    seconds=30.,
+)
+
+ENV = {
+    field: f'QUILR_HOOKS_YAML_MAX_{field.upper()}' for field in Limits._fields
+}
+
+
+def current() -> Limits:
+    """The limits set in the environment."""
+    env = {field: os.environ.get(var) for field, var in ENV.items()}
+    return Limits(
+        size=int(env['size'] or DEFAULTS.size),
+        depth=int(env['depth'] or DEFAULTS.depth),
+        nodes=int(env['nodes'] or DEFAULTS.nodes),
+        alias_nodes=int(env['alias_nodes'] or DEFAULTS.alias_nodes),
+        seconds=float(env['seconds'] or DEFAULTS.seconds),
+    )
+
+
+def check_size(
+        size: int,
+        error: Callable[..., Exception],
+        mark: Any,
+        limits: Limits | None = None,
+) -> None:
+    """Raise `error` if a file of `size` bytes is too large to load."""
+    limits = limits or current()
+    if limits.size and size > limits.size:
+        raise error(
+            problem=(
+                f'file is larger than {limits.size} bytes, '
+                f'see {ENV["size"]}'
+            ),
+            problem_mark=mark,
+        )
+
+
+_DOCUMENT = 0
+_START = 1
+_END = 2
+_SCALAR = 3
+_ALIAS = 4
+
+# by name, the events of pyyaml and ruamel are distinct classes
+_KIND_NAMES = {
+    'DocumentStartEvent': _DOCUMENT,
+    'MappingStartEvent': _START,
+    'SequenceStartEvent': _START,
+    'MappingEndEvent': _END,
+    'SequenceEndEvent': _END,
+    'ScalarEvent': _SCALAR,
+    'AliasEvent': _ALIAS,
+}
+_kinds: dict[type, int | None] = {}
+
+
+def _kind(cls: type) -> int | None:
+    _kinds[cls] = _KIND_NAMES.get(cls.__name__)
+    return _kinds[cls]
+
+
+# the clock is looked at once every 256 nodes
+_CLOCK_MASK = 0xff
+
+
+class Budget:
+    """What a document may still use of the limits, as its events are parsed.
+
+    One budget counts every document of a file, starting over with each.
+
+    `error(problem=..., problem_mark=...)` builds the exception raised,
+    the `MarkedYAMLError` of the library parsing.
+    """
+
+    def __init__(
+            self,
+            error: Callable[..., Exception],
+            limits: Limits | None = None,
+    ) -> None:
+        self.error = error
+        self.limits = limits or current()
+        self.nodes = 0
+        self.alias_nodes = 0
+        self.deadline = float('inf')
+        # anchor -> nodes its node stands for, its aliases' included
+        self.sizes: dict[str, int] = {}
+        # (anchor, nodes + alias nodes before it) of the open collections
+        self.open: list[tuple[str | None, int]] = []
+
+    def _exceeded(self, problem: str, field: str, event: Any) -> Exception:
+        return self.error(
+            problem=f'{problem}, see {ENV[field]}',
+            problem_mark=event.start_mark,
+        )
+
+    def count(self, event: Any) -> None:
+        """Account for `event`, raise once a limit is exceeded."""
+        cls = type(event)
+        kind = _kinds[cls] if cls in _kinds else _kind(cls)
+        if kind == _SCALAR:
+            if event.anchor is not None:
+                self.sizes[event.anchor] = 1
+        elif kind == _START:
+            limit = self.limits.depth
+            if limit and len(self.open) >= limit:
+                raise self._exceeded(
+                    f'collections are nested deeper than {limit} levels',
+                    'depth', event,
+                )
+            self.open.append((event.anchor, self.nodes + self.alias_nodes))
+        elif kind == _END:
+            anchor, before = self.open.pop()
+            if anchor is not None:
+                self.sizes[anchor] = self.nodes + self.alias_nodes - before
+            return
+        elif kind == _ALIAS:
+            self.alias_nodes += self.sizes.get(event.anchor, 1)
+            limit = self.limits.alias_nodes
+            if limit and self.alias_nodes > limit:
+                raise self._exceeded(
+                    f'aliases repeat more than {limit} nodes',
+                    'alias_nodes', event,
+                )
+            return
+        elif kind == _DOCUMENT:
+            # each document starts over, the clock included
+            self.nodes = self.alias_nodes = 0
+            self.sizes.clear()
+            if self.limits.seconds:
+                self.deadline = time.monotonic() + self.limits.seconds
+            return
+        else:
+            return
+
+        self.nodes += 1
+        limit = self.limits.nodes
+        if limit and self.nodes > limit:
+            raise self._exceeded(
+                f'more than {limit} nodes', 'nodes', event,
+            )
+        if not self.nodes & _CLOCK_MASK and time.monotonic() > self.deadline:
+            raise self._exceeded(
+                f'loading took longer than {self.limits.seconds:g} seconds',
+                'seconds', event,
+            )
@@ -0,0 +1,117 @@
+"""Outputs of passing per-file checks, keyed by what the result depends on.
+
+A key covers the hook, its options, the source of this package (so any
+change to the rules or schemas starts over), the yaml `limits`, the
+filename as given (it is part of the output) and the file's contents.
+Files whose key is known are not checked again, their recorded output is
+replayed instead.  The cache holds at most `QUILR_HOOKS_RESULT_CACHE_SIZE`
+entries (default 50000), evicting the least recently used ones.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from collections.abc import Iterable
+
+from pre_commit_hooks import limits
+from pre_commit_hooks.util import cache_dir
+from pre_commit_hooks.util import source_hash
+
+SIZE_ENV = 'QUILR_HOOKS_RESULT_CACHE_SIZE'
+DEFAULT_SIZE = 50_000
+
+# bump when the table layout changes, the cache is dropped
+_SCHEMA_VERSION = 1
+
+_SCHEMA = '''\
+CREATE TABLE results (
+    key TEXT PRIMARY KEY,
+    output TEXT NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX results_used ON results (used);
+'''
+
+
+class ResultCache:
+    def __init__(self, db_path: str, rules: str, max_entries: int) -> None:
+        self.db = sqlite3.connect(db_path, timeout=60)
+        self.rules = rules.encode()
+        self.max_entries = max_entries
+        version, = self.db.execute('PRAGMA user_version').fetchone()
+        if version != _SCHEMA_VERSION:
+            with self.db:
+                self.db.execute('DROP TABLE IF EXISTS results')
+                self.db.executescript(_SCHEMA)
+                self.db.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+
+    def key(self, filename: str) -> str | None:
+        try:
+            with open(filename, 'rb') as f:
+                contents = f.read()
+        except OSError:
+            return None  # reported by the check itself
+        h = hashlib.sha256(self.rules)
+        h.update(b'\0' + os.fsencode(filename) + b'\0')
+        h.update(contents)
+        return h.hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        keys = list(keys)
+        ret: dict[str, str] = {}
+        try:
+            # stay below sqlite's limit of bound parameters
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                ret.update(
+                    self.db.execute(
+                        f'SELECT key, output FROM results '
+                        f'WHERE key IN ({", ".join("?" * len(chunk))})',
+                        chunk,
+                    ),
+                )
+        except sqlite3.Error:
+            return {}
+        return ret
+
+    def update(self, new: dict[str, str], used: Iterable[str]) -> None:
+        """Record `new` results and mark `used` ones as recently used."""
+        now = time.time_ns()
+        try:
+            with self.db:
+                self.db.executemany(
+                    'UPDATE results SET used = ? WHERE key = ?',
+                    [(now, key) for key in used],
+                )
+                self.db.executemany(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                    [(key, output, now) for key, output in new.items()],
+                )
+                if new:
+                    self.db.execute(
+                        'DELETE FROM results WHERE key IN ('
+                        '    SELECT key FROM results ORDER BY used DESC '
+                        '    LIMIT -1 OFFSET ?'
+                        ')',
+                        (self.max_entries,),
+                    )
+        except sqlite3.Error:
+            pass  # the cache is an optimization, never fail the hook over it
+
+
+def open_cache(hook: str, options: str = '') -> ResultCache | None:
+    """The result cache of `hook` run with `options`, if it can be opened."""
+    # a file which passed under laxer limits has to be checked again
+    rules = '\0'.join(
+        (hook, options, source_hash(), repr(tuple(limits.current()))),
+    )
+    max_entries = int(os.environ.get(SIZE_ENV) or DEFAULT_SIZE)
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        return ResultCache(
+            os.path.join(cache_dir(), 'results.db'), rules, max_entries,
+        )
+    except (OSError, sqlite3.Error):
+        return None
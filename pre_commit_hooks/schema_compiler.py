@@ -0,0 +1,412 @@
+"""Compile JSON schemas into specialised python validation functions.
+
+Only the subset of the JSON Schema vocabulary used by our content schemas is
+supported (`type`, `properties`, `required`, `items`, `enum` and `format`).
+The generated code is straight-line checks with no per-call schema walking,
+and reports the same error jsonschema's `validate` would (the error chosen by
+`jsonschema.exceptions.best_match`).  Schemas using other keywords are
+validated by jsonschema itself.
+
+Generated code objects are cached on disk keyed by a hash of the schema.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from pre_commit_hooks import timings
+from pre_commit_hooks.util import cache_dir
+
+# bump whenever the generated code changes
+COMPILER_VERSION = 2
+
+_ANNOTATIONS = frozenset((
+    '$schema', '$id', '$comment', 'title', 'description', 'default',
+    'examples', 'deprecated', 'readOnly', 'writeOnly',
+))
+
+_TYPE_CHECKS = {
+    'string': 'isinstance({v}, str)',
+    'object': 'isinstance({v}, dict)',
+    'array': 'isinstance({v}, list)',
+    'boolean': 'isinstance({v}, bool)',
+    'null': '{v} is None',
+    'number': '(isinstance({v}, (int, float)) and not isinstance({v}, bool))',
+    'integer': (
+        '(isinstance({v}, int) and not isinstance({v}, bool) or '
+        'isinstance({v}, float) and {v}.is_integer())'
+    ),
+}
+
+_UUID_RE = re.compile(
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+    r'[0-9a-fA-F]{12}',
+)
+
+Error = tuple[tuple[Any, ...], bool, str]
+
+
+class UnsupportedSchema(ValueError):
+    pass
+
+
+class ValidationError(Exception):
+    def __init__(self, message: str, path: tuple[Any, ...] = ()) -> None:
+        super().__init__(message)
+        self.message = message
+        self.path = path
+
+
+def _is_uuid(instance: str) -> bool:
+    if _UUID_RE.fullmatch(instance):
+        return True
+    # the same (lenient) rules as jsonschema's uuid format checker
+    import uuid
+
+    try:
+        uuid.UUID(instance)
+    except ValueError:
+        return False
+    return all(instance[position] == '-' for position in (8, 13, 18, 23))
+
+
+def _equal(one: Any, two: Any) -> bool:
+    if isinstance(one, str) or isinstance(two, str):
+        return bool(one == two)
+    if isinstance(one, bool) or isinstance(two, bool):
+        return one is two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(map(_equal, one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(
+            _equal(one[k], two[k]) for k in one
+        )
+    return bool(one == two)
+
+
+class _Generator:
+    def __init__(self, check_formats: bool) -> None:
+        self.check_formats = check_formats
+        self.lines: list[str] = []
+        self.constants: dict[str, Any] = {}
+        self.depth = 0
+
+    def const(self, value: Any) -> str:
+        name = f'C{len(self.constants)}'
+        self.constants[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append(f'{"    " * indent}{line}')
+
+    def type_check(self, types: list[str], v: str) -> str:
+        try:
+            checks = [_TYPE_CHECKS[tp].format(v=v) for tp in dict.fromkeys(types)]
+        except KeyError as e:
+            raise UnsupportedSchema(f'unknown type: {e}')
+        return ' or '.join(checks)
+
+    def node(
+            self,
+            schemas: list[tuple[Any, str]],
+            v: str,
+            path: list[str],
+            indent: int,
+    ) -> None:
+        """Emit the checks of `schemas` at `v`, each into its error list.
+
+        The schemas apply to the same value, earlier ones first: a check
+        which an earlier schema already makes is not repeated, and nested
+        properties / items are visited once for all of them.
+        """
+        path_expr = f'({", ".join(path)}{"," if path else ""})'
+        objects = []
+        for schema, out in schemas:
+            if schema is True:
+                continue
+            elif schema is False:
+                self.emit(
+                    indent,
+                    f'{out}.append(({path_expr}, True, '
+                    f"'False schema does not allow ' + repr({v})))",
+                )
+            elif not isinstance(schema, dict):
+                raise UnsupportedSchema(f'not a schema: {schema!r}')
+            else:
+                objects.append((schema, out))
+
+        properties: dict[str, list[tuple[Any, str]]] = {}
+        items: list[tuple[Any, str]] = []
+        for i, (schema, out) in enumerate(objects):
+            earlier = [s for s, _ in objects[:i]]
+
+            if 'type' in schema:
+                types = schema['type']
+                if isinstance(types, str):
+                    types = [types]
+                matches = self.type_check(types, v)
+            else:
+                matches = 'False'
+
+            for keyword, value in schema.items():
+                if keyword in _ANNOTATIONS:
+                    continue
+                elif keyword == 'properties':
+                    for prop, subschema in value.items():
+                        properties.setdefault(prop, []).append((subschema, out))
+                    continue
+                elif keyword == 'items':
+                    if not isinstance(value, (dict, bool)):
+                        raise UnsupportedSchema('only schema valued items')
+                    if value is not True and value != {}:
+                        items.append((value, out))
+                    continue
+                elif keyword == 'required':
+                    value = [
+                        prop for prop in value
+                        if not any(prop in s.get('required', ()) for s in earlier)
+                    ]
+                elif any(
+                        keyword in s and _equal(s[keyword], value)
+                        for s in earlier
+                ):
+                    continue  # the same check, already made
+                self.keyword(keyword, value, v, path_expr, matches, indent, out)
+
+        if properties:
+            self.depth += 1
+            child = f'v{self.depth}'
+            self.emit(indent, f'if isinstance({v}, dict):')
+            for prop, subschemas in properties.items():
+                self.emit(indent + 1, f'if {prop!r} in {v}:')
+                self.emit(indent + 2, f'{child} = {v}[{prop!r}]')
+                self.node(subschemas, child, [*path, repr(prop)], indent + 2)
+                self.emit(indent + 2, 'pass')
+        if items:
+            self.depth += 1
+            child, index = f'v{self.depth}', f'i{self.depth}'
+            self.emit(indent, f'if isinstance({v}, list):')
+            self.emit(indent + 1, f'for {index}, {child} in enumerate({v}):')
+            self.node(items, child, [*path, index], indent + 2)
+            self.emit(indent + 2, 'pass')
+
+    def keyword(
+            self,
+            keyword: str,
+            value: Any,
+            v: str,
+            path_expr: str,
+            matches: str,
+            indent: int,
+            out: str,
+    ) -> None:
+        if keyword == 'type':
+            types = [value] if isinstance(value, str) else value
+            reprs = ', '.join(repr(tp) for tp in types)
+            self.emit(indent, f'if not ({matches}):')
+            self.emit(
+                indent + 1,
+                f'{out}.append(({path_expr}, True, '
+                f'repr({v}) + {f" is not of type {reprs}"!r}))',
+            )
+        elif keyword == 'enum':
+            if not isinstance(value, list):
+                raise UnsupportedSchema('enum must be a list')
+            if all(isinstance(e, str) for e in value):
+                check = f'isinstance({v}, str) and {v} in {self.const(frozenset(value))}'
+            else:
+                check = f'any(_equal(e, {v}) for e in {self.const(value)})'
+            self.emit(indent, f'if not ({check}):')
+            self.emit(
+                indent + 1,
+                f'{out}.append(({path_expr}, not ({matches}), '
+                f'repr({v}) + {f" is not one of {value!r}"!r}))',
+            )
+        elif keyword == 'required':
+            if not value:
+                return
+            self.emit(indent, f'if isinstance({v}, dict):')
+            for prop in value:
+                self.emit(indent + 1, f'if {prop!r} not in {v}:')
+                self.emit(
+                    indent + 2,
+                    f'{out}.append(({path_expr}, not ({matches}), '
+                    f'{f"{prop!r} is a required property"!r}))',
+                )
+        elif keyword == 'format':
+            # like jsonschema, formats are annotations unless asked for
+            if not self.check_formats or value != 'uuid':
+                return
+            self.emit(
+                indent,
+                f'if isinstance({v}, str) and not _is_uuid({v}):',
+            )
+            self.emit(
+                indent + 1,
+                f'{out}.append(({path_expr}, not ({matches}), '
+                f'repr({v}) + {f" is not a {value!r}"!r}))',
+            )
+        else:
+            raise UnsupportedSchema(f'unsupported keyword: {keyword}')
+
+
+def generate(
+        schema: Any,
+        check_formats: bool = False,
+        variant: Any = None,
+) -> tuple[str, dict[str, Any]]:
+    """Return python source defining `validate(v0) -> list[Error]`.
+
+    With a `variant`, the instance is checked against both schemas in one
+    go, the errors of `variant` only count when `schema` has none.
+    """
+    gen = _Generator(check_formats)
+    if variant is None:
+        gen.node([(schema, 'E')], 'v0', [], 1)
+        head, ret = ['    E = []'], '    return E\n'
+    else:
+        gen.node([(schema, 'E'), (variant, 'F')], 'v0', [], 1)
+        head, ret = ['    E = []', '    F = []'], '    return E or F\n'
+    src = '\n'.join(('def validate(v0):', *head, *gen.lines, ret))
+    return src, gen.constants
+
+
+def _schema_key(schema: Any, check_formats: bool, variant: Any) -> str:
+    # key order is significant: it decides which error is reported first
+    payload = json.dumps([COMPILER_VERSION, check_formats, schema, variant])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_file(key: str) -> str:
+    tag = sys.implementation.cache_tag
+    return os.path.join(cache_dir(), 'schemas', f'{key}.{tag}.marshal')
+
+
+def _load_cached(key: str) -> Any:
+    try:
+        with open(_cache_file(key), 'rb') as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _store_cached(key: str, code_and_constants: Any) -> None:
+    import tempfile
+
+    filename = _cache_file(key)
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename))
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump(code_and_constants, f)
+        os.replace(tmp, filename)
+    except (OSError, ValueError):
+        pass  # the cache is an optimization, never fail the hook over it
+
+
+def _check_schema(schema: Any) -> None:
+    import jsonschema
+
+    jsonschema.validators.validator_for(schema).check_schema(schema)
+
+
+def _jsonschema_validate(schema: Any) -> Callable[[Any], list[Error]]:
+    import jsonschema
+
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+
+    def validate(instance: Any) -> list[Error]:
+        error = jsonschema.exceptions.best_match(validator.iter_errors(instance))
+        if error is None:
+            return []
+        return [(tuple(error.path), True, error.message)]
+    return validate
+
+
+def _jsonschema_validate_variant(
+        schema: Any,
+        variant: Any,
+) -> Callable[[Any], list[Error]]:
+    validate_schema = _jsonschema_validate(schema)
+    validate_variant = _jsonschema_validate(variant)
+
+    def validate(instance: Any) -> list[Error]:
+        return validate_schema(instance) or validate_variant(instance)
+    return validate
+
+
+def compile_schema(
+        schema: Any,
+        check_formats: bool = False,
+        variant: Any = None,
+) -> Callable[[Any], list[Error]]:
+    """Return a function listing every `Error` of an instance.
+
+    `variant` is a second schema the instance must also satisfy, only
+    checked once it satisfies `schema` (see `generate`).
+    """
+    key = _schema_key(schema, check_formats, variant)
+    cached = _load_cached(key)
+    if cached is None:
+        try:
+            src, constants = generate(schema, check_formats, variant)
+        except UnsupportedSchema:
+            if variant is None:
+                return _jsonschema_validate(schema)
+            return _jsonschema_validate_variant(schema, variant)
+        _check_schema(schema)
+        if variant is not None:
+            _check_schema(variant)
+        cached = (compile(src, f'<schema {key[:12]}>', 'exec'), constants)
+        _store_cached(key, cached)
+
+    code, constants = cached
+    namespace = {'_is_uuid': _is_uuid, '_equal': _equal, **constants}
+    exec(code, namespace)
+    return namespace['validate']
+
+
+def _relevance(error: Error) -> tuple[Any, ...]:
+    # mirrors `jsonschema.exceptions.relevance`: shallow errors win, then
+    # the greater path, then errors where the instance has the wrong type
+    path, mismatched_type, _ = error
+    return (-len(path), path, mismatched_type)
+
+
+_compiled: dict[
+    tuple[int, int, bool],
+    tuple[Any, Any, Callable[[Any], list[Error]]],
+] = {}
+
+
+def validate(
+        instance: Any,
+        schema: Any,
+        check_formats: bool = False,
+        variant: Any = None,
+) -> None:
+    """Like `jsonschema.validate` but with a compiled validator.
+
+    With a `variant`, like validating against `schema` and then against
+    `variant`, in a single pass over the instance.
+    """
+    memo_key = (id(schema), id(variant), check_formats)
+    if memo_key not in _compiled:
+        # keep references to the schemas so their ids cannot be reused
+        with timings.phase('compile'):
+            compiled = compile_schema(schema, check_formats, variant)
+        _compiled[memo_key] = (schema, variant, compiled)
+    _, _, fn = _compiled[memo_key]
+
+    errors = fn(instance)
+    if errors:
+        path, _, message = max(errors, key=_relevance)
+        raise ValidationError(message, path)
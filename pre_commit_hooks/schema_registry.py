@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import importlib
+import re
+from typing import Any
+from typing import NamedTuple
+
+
+class ContentType(NamedTuple):
+    name: str
+    pattern: str
+    # schemas are referenced as 'module:attribute' and imported on first use
+    schema: str
+    # (type, actiontype) -> additional schema for that kind of document
+    variants: dict[tuple[str, str], str]
+
+
+class SchemaRegistry:
+    def __init__(self) -> None:
+        self.content_types: list[ContentType] = []
+        self._matcher: re.Pattern[str] | None = None
+        self._schemas: dict[str, Any] = {}
+
+    def register(
+            self,
+            name: str,
+            pattern: str,
+            schema: str,
+            variants: dict[tuple[str, str], str] | None = None,
+    ) -> None:
+        self.content_types.append(
+            ContentType(name, pattern, schema, variants or {}),
+        )
+        self._matcher = None
+
+    def _compile(self) -> re.Pattern[str]:
+        # one alternation of every pattern: a single scan over the path
+        # finds the content type instead of one `find` per content type.
+        # A lookahead matches wherever any pattern starts, even within
+        # another pattern's match.
+        return re.compile('(?={})'.format('|'.join(
+            f'(?P<t{i}>{re.escape(content_type.pattern)})'
+            for i, content_type in enumerate(self.content_types)
+        )))
+
+    def resolve(self, filename: str) -> ContentType | None:
+        """The first registered content type with its pattern in `filename`."""
+        if self._matcher is None:
+            self._matcher = self._compile()
+        found = None
+        for match in self._matcher.finditer(filename):
+            assert match.lastgroup is not None
+            i = int(match.lastgroup[1:])
+            if found is None or i < found:
+                found = i
+        return None if found is None else self.content_types[found]
+
+    def schema(self, ref: str) -> Any:
+        if ref not in self._schemas:
+            module, _, attr = ref.partition(':')
+            self._schemas[ref] = getattr(importlib.import_module(module), attr)
+        return self._schemas[ref]
+
+    def variant(self, content_type: ContentType, data: Any) -> Any | None:
+        # `data` is a mapping but not necessarily valid yet
+        key = (data.get('type'), data.get('actiontype'))
+        try:
+            ref = content_type.variants.get(key)
+        except TypeError:  # unhashable, rejected by the schema
+            return None
+        return None if ref is None else self.schema(ref)
+
+    def find(self, attr: str) -> str | None:
+        for content_type in self.content_types:
+            for ref in (content_type.schema, *content_type.variants.values()):
+                if ref.endswith(f':{attr}'):
+                    return ref
+        return None
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from pre_commit_hooks.schema_registry import SchemaRegistry
+
+REGISTRY = SchemaRegistry()
+REGISTRY.register(
+    'action',
+    'classification-config-service/action/',
+    'pre_commit_hooks.schemas.action:base_action_schema',
+    variants={
+        ('action', 'ACTP_01'): 'pre_commit_hooks.schemas.action:engage_agent_schema',
+        ('action', 'ACTP_02'): 'pre_commit_hooks.schemas.action:jit_schema',
+        ('action', 'ACTP_04'): 'pre_commit_hooks.schemas.action:deploy_agent_schema',
+    },
+)
+REGISTRY.register(
+    'use-case',
+    'classification-config-service/use_case/',
+    'pre_commit_hooks.schemas.use_case:use_case_schema',
+)
+REGISTRY.register(
+    'attributes',
+    'classification-config-service/attributes/',
+    'pre_commit_hooks.schemas.attributes:Attributes_Schema',
+)
+REGISTRY.register(
+    'behavior',
+    'classification-config-service/behavior/',
+    'pre_commit_hooks.schemas.behavior:Behavior_Finding_Schema',
+)
+REGISTRY.register(
+    'execution-controls',
+    'quilr-playbook-service/static/execution_controls',
+    'pre_commit_hooks.schemas.execution_controls:execution_module_schema',
+)
+REGISTRY.register(
+    'templates',
+    'quilr-playbook-service/static/templates',
+    'pre_commit_hooks.schemas.templates:template_schema',
+)
@@ -0,0 +1,240 @@
+base_action_schema = {
+  "type": "object",
+  "properties": {
+    "id": { "type": "string", "format": "uuid" },
+    "version": { "type": ["string", "number"]},
+    "code": { "type": "string" },
+    "name": { "type": "string" },
+    "description": { "type": "string" },
+    "type": { "type": "string" },
+    "actiontype": { "type": "string" },
+    "config": {
+      "type": "object",
+    },"tags": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "behavior": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "createdon": { "type": "integer" },
+    "updatedon": { "type": "integer" }
+  },"required": [
+    "id",
+    "version",
+    "code",
+    "name",
+    "type",
+    "actiontype",
+    "config",
+    "tags",
+    "behavior",
+    "createdon",
+    "updatedon"]
+}
+
+
+deploy_agent_schema = {
+  "title": "Action Schema",
+  "type": "object",
+  "properties": {
+    "id": { "type": "string", "format": "uuid" },
+    "version": { "type": ["string", "number"] },
+    "code": { "type": "string" },
+    "name": { "type": "string" },
+    "type": {
+     "type": "string",
+     "enum": ["use-case"]
+    },
+    "actiontype": { "type": "string" },
+    "config": {
+      "type": "object",
+      "properties": {
+        "meta": {
+          "type": "object",
+          "properties": {
+            "execution_type": { "type": "string" },
+            "execution_module": { "type": "string" },
+            "agent_configuration": {
+              "type": "object",
+              "properties": {
+                "agent_instructions": { "type": "string" },
+                "context_instructions": { "type": "string" },
+                "tools_access": {"type": "object"},
+                "output_instructions": { "type": "string" },
+                "communication": { "type": "string" },
+                "guardrails": {
+                  "type": ["string", "array"]
+                }
+              },
+              "required": [
+                "agent_instructions",
+                "context_instructions",
+                "tools_access",
+                "output_instructions",
+                "communication",
+                "guardrails"
+              ]
+            }
+          },
+          "required": ["execution_type", "execution_module", "agent_configuration"]
+        }
+      },
+      "required": ["meta"]
+    },
+    "outcomes": {
+      "type": "array",
+      "items": {}
+    },
+    "tags": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "behavior": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "createdon": { "type": "integer" },
+    "updatedon": { "type": "integer" }
+  },
+  "required": [
+    "id",
+    "version",
+    "code",
+    "name",
+    "type",
+    "actiontype",
+    "config",
+    "outcomes",
+    "tags",
+    "behavior",
+    "createdon",
+    "updatedon"
+  ]
+}
+
+
+engage_agent_schema = {
+  "type": "object",
+  "properties": {
+    "id": { "type": "string", "format": "uuid" },
+    "version": { "type": ["string", "number"]},
+    "code": { "type": "string" },
+    "name": { "type": "string" },
+    "type": { "type": "string" },
+    "actiontype": { "type": "string" },
+    "config": {
+      "type": "object",
+      "properties": {
+        "meta": {
+          "type": "object",
+          "properties": {
+            "channel": { "type": ["string", "null"] },
+            "engagement_type": { "type": "string" },
+            "message_template": { "type": "string" }
+          },
+          "required": ["engagement_type", "message_template"]
+        },
+        "execution_type": { "type": "string" },
+        "execution_module": { "type": "string" }
+      },
+      "required": ["meta", "execution_type", "execution_module"]
+    },
+    "tags": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "behavior": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "outcomes": {
+      "type": "array",
+      "items": {
+        "type": "object",
+        "properties": {
+          "name": { "type": "string" },
+          "description": { "type": "string" }
+        },
+        "required": ["name", "description"]
+      }
+    },
+    "createdon": { "type": "integer" },
+    "updatedon": { "type": "integer" }
+  },
+  "required": [
+    "id",
+    "version",
+    "code",
+    "name",
+    "type",
+    "actiontype",
+    "config",
+    "tags",
+    "behavior",
+    "outcomes",
+    "createdon",
+    "updatedon"
+  ]
+}
+
+
+jit_schema = {
+  "type": "object",
+  "properties": {
+    "id": { "type": "string", "format": "uuid" },
+    "version": { "type": ["string", "number"] },
+    "code": { "type": "string" },
+    "name": { "type": "string" },
+    "type": { "type": "string", "enum": ["action"] },
+    "actiontype": { "type": "string", "enum": ["ACTP_02"] },
+    "config": {
+      "type": "object",
+      "properties": {
+        "meta": {
+          "type": "object",
+          "properties": {
+            "channel": { "type": ["string", "null"] },
+            "engagement_type": { "type": "string", "enum": ["templatized"] },
+            "message_template": { "type": "string" },
+            "execution_type": { "type": "string", "enum": ["tool"] },
+            "execution_module": { "type": "string", "enum": ["send_templated_user_message"] },
+            "browser_action": { "type": "string" }
+          },
+          "required": [
+            "engagement_type",
+            "message_template",
+            "execution_type",
+            "execution_module",
+            "browser_action"
+          ]
+        }
+      },
+      "required": ["meta"]
+    },
+    "tags": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "behavior": {
+      "type": "array",
+      "items": { "type": "string" }
+    },
+    "createdon": { "type": "integer" },
+    "updatedon": { "type": "integer" }
+  },
+  "required": [
+    "id",
+    "version",
+    "code",
+    "name",
+    "type",
+    "actiontype",
+    "config",
+    "tags",
+    "behavior",
+    "createdon",
+    "updatedon"
+  ]
+}
@@ -0,0 +1,83 @@
+Attributes_Schema = {
+  "type": "object",
+  "required": ["id", "version", "category", "code", "tags", "type", "attributes"],
+  "properties": {
+    "id": {
+      "type": "string",
+      "format": "uuid"
+    },
+    "version": {
+      "type": "string"
+    },
+    "category": {
+      "type": "string"
+    },
+    "code": {
+      "type": "string"
+    },
+    "tags": {
+      "type": ["array", "null"],
+      "items": {
+        "type": "string"
+      }
+    },
+    "type": {
+      "type": "string",
+      "enum": ["attributes"]
+    },
+    "attributes": {
+      "type": "array",
+      "items": {
+        "type": "object",
+        "required": ["name", "description", "duplicate_allowed", "graph_property", "expected_datatype", "supported_operators", "id"],
+        "properties": {
+          "name": { "type": "string" },
+          "description": { "type": "string" },
+          "duplicate_allowed": { "type": "boolean" },
+          "tags": {
+            "type": ["array", "null"],
+            "items": { "type": "string" }
+          },
+          "graph_property": {
+            "type": ["string", "null"]
+          },
+          "extension_property": {
+            "type": ["string", "null"]
+          },
+          "expected_datatype": {
+            "type": "string",
+            "enum": ["string", "int", "boolean", "datetime"]
+          },
+          "possible_values": {
+            "type": "array",
+            "items": {
+              "type": "object",
+              "required": ["label", "value", ],
+              "properties": {
+                "label": { "type": ["string", "number", "boolean"] },
+                "value": {
+                  "type": ["string", "boolean", "number"]
+                },
+                "tags": {
+                  "type": ["array", "null"],
+                  "items": { "type": "string" }
+                }
+              }
+            }
+          },
+          "possible_values_query": {
+            "type": ["string", "null"]
+          },
+          "is_searchable": {
+            "type": ["boolean", "null"]
+          },
+          "supported_operators": {
+            "type": "array",
+            "items": { "type": "string" }
+          },
+          "id": { "type": "string" }
+        }
+      }
+    }
+  }
+}
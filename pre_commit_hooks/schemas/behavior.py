@@ -0,0 +1,205 @@
+Behavior_Finding_Schema = {
+  "type": "object",
+  "properties": {
+    "id": {
+      "type": "string",
+      "format": "uuid",
+      "description": "Unique identifier"
+    },
+    "version": {
+      "type": ["string", "number"],
+      "description": "Version number"
+    },
+    "code": {
+      "type": "string",
+      "description": "Code identifier"
+    },
+    "name": {
+      "type": "string",
+      "description": "Name of the rule"
+    },
+    "type": {
+      "type": "string",
+      "enum": ["behavior", "datarisk", "devicerisk", "mfarisk", "passwordhygiene", "saasrisk"],
+      "description": "Type of rule"
+    },
+    "createdon": {
+      "type": "integer",
+      "description": "Creation timestamp"
+    },
+    "updatedon": {
+      "type": "integer",
+      "description": "Last update timestamp"
+    },
+    "posture": {
+      "type": "array",
+      "items": { "type": "string" },
+      "description": "Associated posture IDs"
+    },
+    "browser_enabled": {
+      "type": "boolean",
+      "description": "Is enabled in browser"
+    },
+    "description": {
+      "type": "string",
+      "description": "Description"
+    },
+    "query": {
+      "type": "string",
+      "description": "Query string"
+    },
+    "config": {
+      "type": "object",
+      "properties": {
+        "datasourcetype": {
+          "type": "string",
+          "enum": ["datalake"],
+          "description": "Data source type"
+        },
+        "expression": {
+          "type": "string",
+          "description": "Expression for data processing"
+        },
+        "type": {
+          "type": "string",
+          "description": "Event type"
+        },
+        "subtype": {
+          "type": "string",
+          "enum": ["event"],
+          "description": "Subtype of event"
+        },
+        "status": {
+          "type": "string",
+          "enum": ["open"],
+          "description": "Status"
+        },
+        "code": {
+          "type": "string",
+          "description": "Rule code"
+        },
+        "sla": {
+          "type": "string",
+          "description": "SLA"
+        },
+        "entity": {
+          "type": "string",
+          "description": "Entity"
+        },
+        "entitytype": {
+          "type": "string",
+          "enum": ["user"],
+          "description": "Entity type"
+        },
+        "tags": {
+          "type": "array",
+          "items": { "type": "string" },
+          "description": "Tags"
+        },
+        "sourceofalert": {
+          "type": "string",
+          "description": "Source of alert"
+        },
+        "template": {
+          "type": "string",
+          "description": "Alert template"
+        },
+        "artifacts": {
+          "type": "array",
+          "items": {
+            "type": "object",
+            "properties": {
+              "type": { "type": "string" },
+              "property": { "type": "string" },
+              "value": { "type": "string" },
+              "artifactproperties": {
+                "type": "array",
+                "items": {
+                  "type": "object",
+                  "properties": {
+                    "artifactValue": { "type": "string" },
+                    "displayInUI": { "type": "string" }
+                  },
+                  "required": ["artifactValue", "displayInUI"]
+                }
+              }
+            },
+            "required": ["type", "property", "value"]
+          }
+        },
+        "properties": {
+          "type": "object",
+          "properties": {
+            "userId": { "type": "string" },
+            "userName": { "type": "string" },
+            "userMail": { "type": "string" },
+            "userAccountEnabled": { "type": "string" },
+            "TENANT": { "type": "string" },
+            "SUBSCRIBER": { "type": "string" },
+            "appName": { "type": "string" },
+            "appUrl": { "type": "string" },
+            "appId": { "type": "string" },
+            "appCategory": { "type": "string" },
+            "appDomain": { "type": "string" },
+            "context_id": { "type": "string" },
+            "time": { "type": "string" }
+          },
+          "required": [
+            "userId", "userName", "userMail", "userAccountEnabled",
+            "TENANT", "SUBSCRIBER", "appName", "appUrl", "appId",
+            "appCategory", "appDomain", "context_id", "time"
+          ]
+        }
+      },
+      "required": [
+        "expression", "type", "subtype", "status",
+        "code", "sla", "entity", "entitytype", "tags",
+        "sourceofalert", "template", "artifacts", "properties"
+      ]
+    },
+    "lambda": {
+      "type": "string",
+      "description": "Lambda function code"
+    },
+    "deviceRisk": {
+      "type": "object",
+      "properties": {
+        "deviceType": { "type": "string" },
+        "riskScore": { "type": "number" },
+        "details": { "type": "string" }
+      },
+      "required": ["deviceType", "riskScore"]
+    },
+    "mfaRisk": {
+      "type": "object",
+      "properties": {
+        "mfaEnabled": { "type": "boolean" },
+        "riskLevel": { "type": "string" },
+        "lastMfaVerification": { "type": "string" }
+      },
+      "required": ["mfaEnabled"]
+    },
+    "passwordHygiene": {
+      "type": "object",
+      "properties": {
+        "passwordStrength": { "type": "string" },
+        "lastPasswordChange": { "type": "string" },
+        "passwordReuse": { "type": "boolean" }
+      },
+      "required": ["passwordStrength"]
+    },
+    "saasRisk": {
+      "type": "object",
+      "properties": {
+        "saasApplication": { "type": "string" },
+        "riskScore": { "type": "number" },
+        "complianceStatus": { "type": "string" }
+      },
+      "required": ["saasApplication", "riskScore"]
+    }
+  },
+  "required": [
+    "id", "version", "code", "name", "type", "createdon", "updatedon",
+    "posture", "browser_enabled", "description", "query", "config", "lambda"
+  ]
+}
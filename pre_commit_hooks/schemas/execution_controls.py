@@ -0,0 +1,159 @@
+execution_module_schema = {
+  "type": "object",
+  "properties": {
+    "criticality": {
+      "type": "integer",
+      "description": "Criticality level of the control"
+    },
+    "mode": {
+      "type": "string",
+      "description": "Mode of operation, e.g., monitor"
+    },
+    "control_name": {
+      "type": "string",
+      "description": "Name of the control"
+    },
+    "control_description": {
+      "type": "string",
+      "description": "Description of the control"
+    },
+    "posture": {
+      "type": "object",
+      "properties": {
+        "id": {
+          "type": "string",
+          "description": "Posture ID"
+        }
+      },
+      "required": ["id"]
+    },
+    "behavior": {
+      "type": "object",
+      "properties": {
+        "id": {
+          "type": "string",
+          "description": "Behavior ID"
+        }
+      },
+      "required": ["id"]
+    },
+    "use_case": {
+      "type": "object",
+      "properties": {
+        "id": {
+          "type": "string",
+          "description": "Use case ID"
+        }
+      },
+      "required": ["id"]
+    },
+    "trigger_conditions": {
+      "type": "array",
+      "items": {
+        "type": "object",
+        "properties": {
+          "operator": {
+            "type": ["string", "null"]
+          },
+          "filter_condition": {
+            "type": "object",
+            "properties": {
+              "attribute_type": {
+                "type": "string"
+              },
+              "attribute_id": {
+                "type": "string"
+              },
+              "condition": {
+                "type": "string"
+              },
+              "value": {
+                "type": ["string", "integer", "boolean", "number"]
+              }
+            },
+            "required": ["attribute_type", "attribute_id", "condition", "value"]
+          },
+          "filter_group": {
+            "type": ["null"]
+          },
+          "editable": {
+            "type": "boolean"
+          },
+          "supported_operators": {
+            "type": "array",
+            "items": {
+              "type": "string"
+            }
+          }
+        },
+        "required": ["filter_condition", "filter_group", "operator"]
+      }
+    },
+    "actions": {
+      "type": "array",
+      "items": {
+        "type": "object",
+        "properties": {
+          "type": {
+            "type": "object",
+            "properties": {
+              "id": {
+                "type": "string"
+              }
+            },
+            "required": ["id"]
+          },
+          "name": {
+            "type": "object",
+            "properties": {
+              "id": {
+                "type": "string"
+              }
+            },
+            "required": ["id"]
+          },
+          "description": {
+            "type": "string"
+          },
+          "meta": {
+            "type": "object",
+            "properties": {
+              "channel": { "type": "string" },
+              "engagement_type": { "type": "string" },
+              "message_template": { "type": "string" },
+              "execution_type": { "type": "string" },
+              "execution_module": { "type": "string" },
+              "browser_action": { "type": "string" },
+              "prompt_frequency": { "type": "string" },
+              "default_conversation_params": {
+                "type": "object",
+                "properties": {
+                  "is_urgent": { "type": "boolean" },
+                  "tone": { "type": "string" },
+                  "cc_manager": { "type": "boolean" },
+                  "sla": { "type": "string" },
+                  "sla_duration_unit": { "type": "string" },
+                  "reminder_count": { "type": "integer" },
+                  "custom_message": { "type": "string" }
+                }
+              },
+              "custom_conversation_params": { "type": "object" }
+            }
+          }
+        },
+        "required": ["type", "name", "meta"]
+      }
+    }
+  },
+  "required": [
+    "criticality",
+    "mode",
+    "control_name",
+    "control_description",
+    "posture",
+    "behavior",
+    "use_case",
+    "trigger_conditions",
+    "actions"
+  ]
+}
@@ -0,0 +1,39 @@
+use_case_schema = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "version": {"type": "number"},
+        "code": {"type": "string"},
+        "name": {"type": "string"},
+        "type": {"type": "string", "enum": ["use-case"]},
+        "description": {"type": "string"},
+        "posture": {"type": "array", "items": {"type": "string"}},
+        "behavior": {"type": "array", "items": {"type": "string"}},
+        "condition": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "operator": {"type": ["string", "null"]},
+                    "editable": {"type": "boolean"},
+                    "filter_group": {"type": ["array", "null"], "items": {"type": "object"}},
+                    "filter_condition": {
+                        "type": "object",
+                        "properties": {
+                            "attribute_type": {"type": "string"},
+                            "attribute_id": {"type": "string"},
+                            "condition": {"type": "string"},
+                            "value": {"type": "string"},
+                        },
+                        "required": ["attribute_type", "attribute_id", "condition", "value"]
+                    }
+                },
+                "required": ["filter_condition", "operator", "editable", "filter_group"]
+            }
+        },
+        "disabled": {"type": "boolean"},
+        "createdon": {"type": "integer"},
+        "updatedon": {"type": "integer"}
+    },
+    "required": ["id", "version", "code", "name", "type", "description", "posture", "behavior", "condition", "disabled", "createdon", "updatedon"]
+}
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from pre_commit_hooks import filelist
+from pre_commit_hooks import timings
+from pre_commit_hooks.util import cache_path
+from pre_commit_hooks.util import read_json_cache
+from pre_commit_hooks.util import write_json_cache
+
+USE_CASE_DIR = './static-files/classification-config-service/use_case'
+
+# bump when the on-disk layout changes so stale caches are ignored
+_CACHE_VERSION = 1
+
+
+def read_tags(path: str) -> list[Any] | None:
+    """The `tags` list of a document, `None` when it has none."""
+    from pre_commit_hooks import document_cache
+
+    with open(path, 'rb') as f:
+        data = document_cache.load_paths(f.read(), [('tags',)], path)
+    if not isinstance(data, dict) or not isinstance(data.get('tags'), list):
+        return None
+    return data['tags']
+
+
+def _parse_file(path: str) -> list[Any]:
+    import yaml
+
+    try:
+        tags = read_tags(path)
+    except yaml.YAMLError:
+        return []  # reported when the file itself is checked
+    # only scalars can be looked up
+    return [tag for tag in tags or () if not isinstance(tag, (list, dict))]
+
+
+class TagIndex:
+    """Maps each tag to the use-case files declaring it."""
+
+    def __init__(self, files: dict[str, list[Any]]) -> None:
+        self.files: dict[Any, list[str]] = {}
+        for path, tags in files.items():
+            for tag in tags:
+                self.files.setdefault(tag, []).append(path)
+
+    def __contains__(self, tag: object) -> bool:
+        try:
+            return tag in self.files
+        except TypeError:  # unhashable
+            return False
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+
+# per-file entries last seen by this process, so a rebuild only stats
+_files: dict[str, dict[str, Any]] = {}
+
+
+def build(location: str) -> TagIndex:
+    location = os.path.abspath(location)
+    cache_file = cache_path('tag-index', location, '.json')
+    if location in _files:
+        cached = _files[location]
+    else:
+        cached = read_json_cache(cache_file, _CACHE_VERSION)
+
+    files = {}
+    for path in filelist.yaml_files(location):
+        st = os.stat(path)
+        entry = cached.get(path)
+        if (
+                entry is None or
+                entry['mtime_ns'] != st.st_mtime_ns or
+                entry['size'] != st.st_size
+        ):
+            entry = {
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'tags': _parse_file(path),
+            }
+        files[path] = entry
+
+    if files != cached:
+        write_json_cache(cache_file, _CACHE_VERSION, files)
+    _files[location] = files
+
+    return TagIndex({path: entry['tags'] for path, entry in files.items()})
+
+
+_indexes: dict[str, TagIndex] = {}
+
+
+def load(location: str = USE_CASE_DIR) -> TagIndex:
+    """Return the index for `location`, built at most once per process."""
+    key = os.path.abspath(location)
+    if key not in _indexes:
+        with timings.phase('index'):
+            _indexes[key] = build(location)
+    return _indexes[key]
+
+
+def invalidate() -> None:
+    """Make the next `load` pick up changed use-case files."""
+    _indexes.clear()
@@ -0,0 +1,243 @@
+"""Opt-in timing, memory and profiling instrumentation for hook runs.
+
+Enabled with `--timings` (optionally `--timings-output PATH`) or
+`QUILR_HOOKS_TIMINGS=PATH`, where `-` or `1` mean stderr, the default.
+Each run appends one JSON line to PATH with the hook's total wall time,
+the wall time spent in each phase (phases nest, their times are
+inclusive), peak traced memory and the slowest files with their own phase
+breakdown.  Memory is traced with
+`tracemalloc`, which slows the run down noticeably.
+
+`--profile PATH` / `QUILR_HOOKS_PROFILE=PATH` additionally dump `cProfile`
+stats for `pstats`; files are then checked in-process so the profile
+covers them.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from collections.abc import Callable
+from collections.abc import Generator
+from typing import Any
+from typing import ContextManager
+from typing import IO
+from typing import TYPE_CHECKING
+
+# every hook imports this module: what only instrumented runs need is
+# imported once instrumenting
+if TYPE_CHECKING:
+    import cProfile
+
+ENV = 'QUILR_HOOKS_TIMINGS'
+PROFILE_ENV = 'QUILR_HOOKS_PROFILE'
+
+# bump when the JSON layout changes
+_FORMAT_VERSION = 1
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.phases: dict[str, list[float]] = {}
+        self.files: list[dict[str, Any]] = []
+        self._file_phases: dict[str, float] | None = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            total = self.phases.setdefault(name, [0., 0])
+            total[0] += elapsed
+            total[1] += 1
+            if self._file_phases is not None:
+                self._file_phases[name] = (
+                    self._file_phases.get(name, 0.) + elapsed
+                )
+
+    def call(self, fn: Callable[[str], int], filename: str) -> int:
+        import tracemalloc
+
+        phases: dict[str, float] = {}
+        self._file_phases = phases
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            return fn(filename)
+        finally:
+            self.files.append({
+                'file': filename,
+                'wall_s': time.perf_counter() - start,
+                'peak_bytes': tracemalloc.get_traced_memory()[1],
+                'phases': phases,
+            })
+            self._file_phases = None
+
+    def state(self) -> dict[str, Any]:
+        return {'phases': self.phases, 'files': self.files}
+
+    def merge(self, state: dict[str, Any]) -> None:
+        for name, (wall_s, count) in state['phases'].items():
+            total = self.phases.setdefault(name, [0., 0])
+            total[0] += wall_s
+            total[1] += count
+        self.files.extend(state['files'])
+
+
+_recorder: Recorder | None = None
+_profiler: cProfile.Profile | None = None
+_NULL = contextlib.nullcontext()
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Attribute the enclosed time to `name` (a no-op unless enabled)."""
+    if _recorder is None:
+        return _NULL
+    return _recorder.phase(name)
+
+
+def call(fn: Callable[[str], int], filename: str) -> int:
+    """`fn(filename)`, recorded as the time of that file when enabled."""
+    if _recorder is None:
+        return fn(filename)
+    return _recorder.call(fn, filename)
+
+
+@contextlib.contextmanager
+def open_file(filename: str, **kwargs: Any) -> Generator[IO[str]]:
+    """`open`, separating file i/o from parsing when enabled."""
+    if _recorder is None:
+        with open(filename, **kwargs) as f:
+            yield f
+    else:
+        with _recorder.phase('read'), open(filename, **kwargs) as f:
+            stream = io.StringIO(f.read())
+        stream.name = filename  # parse errors name the file as usual
+        yield stream
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def profiling() -> bool:
+    return _profiler is not None
+
+
+@contextlib.contextmanager
+def recording(recorder: Recorder | None) -> Generator[None]:
+    """Record into `recorder` for a while, e.g. in a worker process."""
+    global _recorder
+    if recorder is None:
+        yield
+        return
+
+    import tracemalloc
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    orig, _recorder = _recorder, recorder
+    try:
+        yield
+    finally:
+        _recorder = orig
+        if not tracing:
+            tracemalloc.stop()
+
+
+def merge(state: dict[str, Any] | None) -> None:
+    """Add what a worker process recorded."""
+    if _recorder is not None and state is not None:
+        _recorder.merge(state)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--timings', action='store_true',
+        help=(
+            f'Report per-phase / per-file timings of this run as a JSON '
+            f'line.  Also enabled by ${ENV}=PATH.'
+        ),
+    )
+    parser.add_argument(
+        '--timings-output', default='-', metavar='PATH',
+        help='File the timings are appended to (default: stderr).',
+    )
+    parser.add_argument(
+        '--timings-top', type=int, default=10, metavar='N',
+        help='Number of slowest files listed in the timings.',
+    )
+    parser.add_argument(
+        '--profile', metavar='PATH',
+        help=(
+            f'Dump cProfile stats of this run to PATH.  '
+            f'Also enabled by ${PROFILE_ENV}.'
+        ),
+    )
+
+
+def _write(output: str, record: dict[str, Any]) -> None:
+    import json
+
+    line = json.dumps(record) + '\n'
+    if output in {'-', '1'}:
+        sys.stderr.write(line)
+    else:
+        with open(output, 'a') as f:
+            f.write(line)
+
+
+@contextlib.contextmanager
+def session(hook: str, args: argparse.Namespace) -> Generator[None]:
+    """Instrument the enclosed hook run as configured by `args` / env."""
+    global _profiler
+    output = args.timings_output if args.timings else os.environ.get(ENV)
+    profile = args.profile or os.environ.get(PROFILE_ENV, '')
+    if not output and not profile:
+        yield
+        return
+
+    import cProfile
+    import tracemalloc
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    with recording(recorder):
+        if profile:
+            _profiler = cProfile.Profile()
+            _profiler.enable()
+        try:
+            yield
+        finally:
+            if _profiler is not None:
+                _profiler.disable()
+                _profiler.dump_stats(profile)
+                _profiler = None
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+
+    if not output:
+        return
+    files = sorted(recorder.files, key=lambda f: f['wall_s'], reverse=True)
+    _write(output, {
+        'version': _FORMAT_VERSION,
+        'hook': hook,
+        'pid': os.getpid(),
+        'wall_s': time.perf_counter() - start,
+        # worker processes trace their own memory
+        'peak_bytes': max(
+            [peak_bytes, *(f['peak_bytes'] for f in recorder.files)],
+        ),
+        'files': len(recorder.files),
+        'phases': {
+            name: {'wall_s': wall_s, 'count': count}
+            for name, (wall_s, count) in sorted(recorder.phases.items())
+        },
+        'slowest': files[:args.timings_top],
+        'profile': profile or None,
+    })
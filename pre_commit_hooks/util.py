@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from typing import Any
+
+
+def cache_dir() -> str:
+    ret = os.environ.get('QUILR_HOOKS_CACHE_DIR')
+    if ret is None:
+        xdg = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        ret = os.path.join(xdg, 'quilr-precommit-hooks')
+    return ret
+
+
+def cache_path(prefix: str, key: str, ext: str) -> str:
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir(), f'{prefix}-{digest}{ext}')
+
+
+_source_hash: str | None = None
+
+
+def source_hash() -> str:
+    """Hash of every module of the package, computed once per process."""
+    global _source_hash
+    if _source_hash is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith('.py'):
+                    path = os.path.join(dirpath, filename)
+                    h.update(os.path.relpath(path, root).encode() + b'\0')
+                    with open(path, 'rb') as f:
+                        h.update(f.read() + b'\0')
+        _source_hash = h.hexdigest()
+    return _source_hash
+
+
+def read_json_cache(filename: str, version: int) -> dict[str, Any]:
+    """Return the cached `files` mapping, empty when missing or stale."""
+    try:
+        with open(filename) as f:
+            contents = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if contents.get('version') != version:
+        return {}
+    return contents['files']
+
+
+def write_json_cache(
+        filename: str,
+        version: int,
+        files: dict[str, Any],
+) -> None:
+    import tempfile
+
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename))
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': version, 'files': files}, f)
+        os.replace(tmp, filename)
+        tmp = None
+    # values json cannot encode (e.g. the dates of yaml) are not cached
+    except (OSError, TypeError, ValueError):
+        pass  # the cache is an optimization, never fail the hook over it
+    finally:
+        if tmp is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
@@ -1,45 +1,68 @@
-import os
-import sys
-import yaml
-
-# Path to the use case folder
-USE_CASE_FOLDER = "/Users/gurjeet-quilr/Desktop/dev-folder/content-management-service/static-files/classification-config-service/use_case"
-
-def load_tags_from_use_case(tag):
-    # Search for the tag in all use case files
-    for root, dirs, files in os.walk(USE_CASE_FOLDER):
-        for file in files:
-            if file.endswith('.yaml') or file.endswith('.yml'):
-                filepath = os.path.join(root, file)
-                with open(filepath, 'r') as f:
-                    data = yaml.safe_load(f)
-                    if data and 'tags' in data:
-                        if tag in data['tags']:
-                            return True
-    return False
-
-def main():
-    filename = sys.argv[1]
-    with open(filename, 'r') as f:
-        data = yaml.safe_load(f)
-
-    if not data or 'tags' not in data or data['tags'] is None:
+from __future__ import annotations
+
+import argparse
+import functools
+from collections.abc import Sequence
+
+from pre_commit_hooks import daemon
+from pre_commit_hooks import tag_index
+from pre_commit_hooks import timings
+
+
+def _check_file(filename: str, index: tag_index.TagIndex) -> int:
+    import yaml
+
+    from pre_commit_hooks import document_cache
+    from pre_commit_hooks import yaml_loader
+
+    try:
+        data = document_cache.load(filename, yaml_loader.safe_load)
+    except yaml.YAMLError as e:
+        print(f"❌ Failed to parse {filename}: {e}")
+        return 1
+
+    if not isinstance(data, dict) or data.get('tags') is None:
         print(f"No tags found in {filename}")
-        sys.exit(0)
+        return 0
 
     # Ensure data['tags'] is a list
     tags = data['tags']
     if not isinstance(tags, list):
         print(f"Invalid 'tags' format in {filename}")
-        sys.exit(1)
+        return 1
 
+    retval = 0
     for tag in tags:
-        if not load_tags_from_use_case(tag):
+        if tag not in index:
             print(f"Tag '{tag}' in {filename} does not exist in use case folder.")
-            sys.exit(1)
+            retval = 1
+    if not retval:
+        print(f"All tags in {filename} are valid.")
+    return retval
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    retval = daemon.forward('validate-tags', argv)
+    if retval is not None:
+        return retval
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--use-case-dir', default=tag_index.USE_CASE_DIR,
+        help='Folder of use cases declaring the known tags (default: %(default)s).',
+    )
+    parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with timings.session('validate-tags', args):
+        index = tag_index.load(args.use_case_dir)
+        check = functools.partial(_check_file, index=index)
+        retval = 0
+        for filename in args.filenames:
+            retval |= timings.call(check, filename)
+        return retval
 
-    print(f"All tags in {filename} are valid.")
-    sys.exit(0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
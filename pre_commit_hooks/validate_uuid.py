@@ -1,44 +1,26 @@
 #!/usr/bin/env python
 import sys
 import os
-import yaml
-import uuid
 import argparse
 import re
 from collections.abc import Generator
 from collections.abc import Sequence
+from typing import Any
+
+from pre_commit_hooks import changes
+from pre_commit_hooks import content_index
+from pre_commit_hooks import daemon
+from pre_commit_hooks import executor
+from pre_commit_hooks import timings
 
 def is_valid_uuid(val):
+    import uuid
     try:
         uuid_obj = uuid.UUID(val)
         return str(uuid_obj) == val
     except ValueError:
         return False
 
-def all_unique_id(path):
-    ids = []
-    for root, dirs, files in os.walk(os.path.dirname(path)):
-        for file in files:
-            if path.find(file) == -1:
-                if file.endswith('.yaml') or file.endswith('.yml'):
-                    with open(os.path.join(root, file), 'r') as f:
-                        data = yaml.safe_load(f)
-                        if isinstance(data, dict):
-                            ids.append(data.get('id'))
-    return ids
-
-def all_unique_code(path):
-    code = []
-    for root, dirs, files in os.walk(os.path.dirname(path)):
-        for file in files:
-            if path.find(file) == -1:
-                if file.endswith('.yaml') or file.endswith('.yml'):
-                    with open(os.path.join(root, file), 'r') as f:
-                        data = yaml.safe_load(f)
-                    if isinstance(data, dict):
-                        code.append(data.get('code'))
-    return code
-
 def check_code_format(code,contenttype):
     if contenttype == "action" and re.match(r'^ACT_\d+$', code):
         return True
@@ -54,7 +36,137 @@ def check_code_format(code,contenttype):
         return False
 
 
+def is_checked(filename: str) -> bool:
+    """Whether `check_document` checks the ids of `filename`."""
+    return filename.find("classification-config-service/use-case/") != -1
+
+
+def check_document(filename: str, data: Any) -> int:
+    index = content_index.shared_index()
+    # check if ID is present and valid
+    id_value = data.get('id')
+    code_value = data.get('code')
+    if is_checked(filename):
+        if not id_value:
+            print(f"❌ {filename} missing 'id' field.")
+            return 1
+        if not is_valid_uuid(id_value):
+            print(f"❌ {filename} has invalid UUID: {id_value}")
+            return 1
+        if index.duplicate_ids(filename, data.get('type'), id_value):
+            print(f"❌ Duplicate UUID found in {filename}: {id_value}")
+            return 1
+        
+        # Check if the code field is present and valid
+        if not code_value:
+            print(f"❌ {filename} missing 'code' field.")
+            return 1
+        if not check_code_format(code_value, data.get('type')):
+            print(f"❌ {filename} has invalid code format: {code_value}")
+            return 1
+        if index.duplicate_codes(filename, data.get('type'), code_value):
+            print(f"❌ Duplicate code found in {filename}: {code_value}")
+            return 1
+
+    print(f"✅ {filename} has valid and unique UUID.")
+    return 0
+
+
+def _check_file(filename: str) -> int:
+    from pre_commit_hooks import document_cache
+
+    with timings.phase('read'):
+        with open(filename, 'rb') as f:
+            contents = f.read()
+    try:
+        with timings.phase('parse'):
+            data = document_cache.load_paths(
+                contents, content_index.FIELDS, filename,
+            )
+    except Exception as e:
+        print(f"❌ Failed to parse {filename}: {e}")
+        return 1
+    with timings.phase('ids'):
+        return check_document(filename, data)
+
+
+def refresh_index(filenames: Sequence[str]) -> None:
+    # refresh the index once up front, forked workers then look the files
+    # up without refreshing it again (see `content_index.shared_index`)
+    index = content_index.shared_index()
+    for filename in filenames:
+        if is_checked(filename):
+            index.refresh(os.path.dirname(filename))
+
+
+# the content types `check_code_format` knows about, audited wherever
+# they are (`check_document` only checks the files `is_checked`)
+AUDITED_TYPES = ('action', 'use-case', 'behavior', 'action_type', 'attributes')
+
+
+def _nested(path: str, other: str) -> bool:
+    # the scope of `check_document`: files next to or below `path`
+    return other.startswith(os.path.join(os.path.dirname(path), ''))
+
+
+def audit(root: str) -> int:
+    """Report every id / code problem of the documents below `root`.
+
+    Every document `check_document` would check is audited, of whatever
+    type, and so is every document of the `AUDITED_TYPES` elsewhere.  As
+    for a single file, a duplicate is reported for the files which have the
+    other copy next to or below them.
+
+    The index is brought up to date in one pass over `root`, duplicates are
+    then found by grouping its rows rather than by comparing files.
+    """
+    index = content_index.shared_index()
+    documents = [
+        row for row in index.documents(root)
+        if is_checked(row[0]) or row[1] in AUDITED_TYPES
+    ]
+    duplicate = {}
+    for column in ('id', 'code'):
+        for paths in index.duplicates(root, column):
+            for path in paths:
+                if any(_nested(path, other) for other in paths if other != path):
+                    duplicate[path, column] = True
+
+    problems = 0
+    for path, content_type, id_value, code_value in documents:
+        filename = os.path.relpath(path)
+        messages = []
+        if not id_value:
+            messages.append(f"❌ {filename} missing 'id' field.")
+        elif not isinstance(id_value, str) or not is_valid_uuid(id_value):
+            messages.append(f"❌ {filename} has invalid UUID: {id_value}")
+        if (path, 'id') in duplicate:
+            messages.append(f"❌ Duplicate UUID found in {filename}: {id_value}")
+        if not code_value:
+            messages.append(f"❌ {filename} missing 'code' field.")
+        elif (
+                not isinstance(code_value, str) or
+                not check_code_format(code_value, content_type)
+        ):
+            messages.append(f"❌ {filename} has invalid code format: {code_value}")
+        if (path, 'code') in duplicate:
+            messages.append(f"❌ Duplicate code found in {filename}: {code_value}")
+        for message in messages:
+            print(message)
+        problems += len(messages)
+
+    if problems:
+        print(f'{problems} problem(s) in {len(documents)} documents.')
+        return 1
+    print(f"✅ {len(documents)} documents have valid and unique UUIDs.")
+    return 0
+
+
 def main(argv: Sequence[str] | None = None):
+    retval = daemon.forward('validate-id', argv)
+    if retval is not None:
+        return retval
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         '-m', '--multi', '--allow-multiple-documents', action='store_true',
@@ -69,43 +181,26 @@ def main(argv: Sequence[str] | None = None):
             'Implies --allow-multiple-documents'
         ),
     )
+    parser.add_argument(
+        '--audit', metavar='ROOT',
+        help=(
+            'Check the ids and codes of every document below ROOT at once '
+            'and report all problems, instead of checking the filenames.'
+        ),
+    )
+    changes.add_argument(parser)
     parser.add_argument('filenames', nargs='*', help='Filenames to check.')
+    timings.add_arguments(parser)
     args = parser.parse_args(argv)
     parent_dir = os.path.abspath(os.path.dirname(sys.argv[0]))
-    
-    for filename in args.filenames:
-        with open(filename, 'r') as f:
-            try:
-                data = yaml.safe_load(f)
-            except Exception as e:
-                print(f"❌ Failed to parse {filename}: {e}")
-                sys.exit(1)
-        # check if ID is present and valid
-        id_value = data.get('id')
-        code_value = data.get('code')
-        if filename.find("classification-config-service/use-case/") != -1:
-            if not id_value:
-                print(f"❌ {filename} missing 'id' field.")
-                sys.exit(1)
-            if not is_valid_uuid(id_value):
-                print(f"❌ {filename} has invalid UUID: {id_value}")
-                sys.exit(1)
-            if id_value in all_unique_id(filename):
-                print(f"❌ Duplicate UUID found in {filename}: {id_value}")
-                sys.exit(1)
-            
-            # Check if the code field is present and valid
-            if not code_value:
-                print(f"❌ {filename} missing 'code' field.")
-                sys.exit(1)
-            if not check_code_format(code_value, data.get('type')):
-                print(f"❌ {filename} has invalid code format: {code_value}")
-                sys.exit(1)
-            if code_value in all_unique_code(filename):
-                print(f"❌ Duplicate code found in {filename}: {code_value}")
-                sys.exit(1)
-
-        print(f"✅ {filename} has valid and unique UUID.")
+    with timings.session('validate-id', args):
+        if args.audit is not None:
+            return audit(args.audit)
+        with timings.phase('git'):
+            changes.resolve(parser, args)
+        refresh_index(args.filenames)
+        return executor.run(_check_file, args.filenames, fail_fast=True)
+
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
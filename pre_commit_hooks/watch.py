@@ -0,0 +1,185 @@
+"""Notice saved yaml files, for `quilr-check-all --watch`.
+
+On Linux the folders are watched with inotify (through ctypes, there is no
+dependency), so a save is seen within milliseconds.  Elsewhere, or when
+inotify is unavailable (e.g. the watch limit is reached), the files are
+stat-ed every second.  Hidden folders (`.git`, `.tox`, ...) are not
+watched.
+"""
+from __future__ import annotations
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Generator
+
+POLL_INTERVAL = 1.
+# editors save in several steps (write a temporary file, rename it, ...)
+SETTLE = .05
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE |
+    _IN_DELETE
+)
+# wd, mask, cookie, length of the name which follows
+_EVENT = struct.Struct('iIII')
+
+
+def _is_yaml(filename: str) -> bool:
+    return filename.endswith(('.yaml', '.yml'))
+
+
+def _walk(root: str) -> Generator[tuple[str, list[str]]]:
+    """Each folder below `root` (but hidden ones) with its yaml files."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        yield dirpath, [
+            os.path.join(dirpath, filename)
+            for filename in filenames
+            if _is_yaml(filename)
+        ]
+
+
+class _Inotify:
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (
+            ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32,
+        )
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self.dirs: dict[int, str] = {}
+
+    def add(self, root: str) -> list[str]:
+        """Watch `root` and the folders below it, return its yaml files."""
+        ret = []
+        for dirpath, yaml_files in _walk(root):
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), _MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), dirpath)
+            self.dirs[wd] = dirpath
+            ret.extend(yaml_files)
+        return ret
+
+    def read(self, timeout: float | None) -> list[tuple[int, str]]:
+        """`(mask, path)` of the events within `timeout` seconds."""
+        readable, _, _ = select.select((self.fd,), (), (), timeout)
+        if not readable:
+            return []
+        buf = os.read(self.fd, 64 * 1024)
+        ret = []
+        pos = 0
+        while pos < len(buf):
+            wd, mask, _, length = _EVENT.unpack_from(buf, pos)
+            pos += _EVENT.size
+            name = os.fsdecode(buf[pos:pos + length].rstrip(b'\0'))
+            pos += length
+            if mask & _IN_Q_OVERFLOW:
+                ret.append((mask, ''))
+            elif mask & _IN_IGNORED:  # the folder is gone
+                self.dirs.pop(wd, None)
+            elif wd in self.dirs:
+                ret.append((mask, os.path.join(self.dirs[wd], name)))
+        return ret
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _inotify_changes(
+        root: str,
+        inotify: _Inotify,
+) -> Generator[set[str]]:
+    known = set(inotify.add(root))
+    while True:
+        events = inotify.read(None)
+        while True:
+            more = inotify.read(SETTLE)
+            if not more:
+                break
+            events.extend(more)
+
+        changed = set()
+        for mask, path in events:
+            if mask & _IN_Q_OVERFLOW:  # events were lost: everything
+                changed.update(known)
+                changed.update(p for _, files in _walk(root) for p in files)
+            elif mask & _IN_ISDIR:
+                prefix = os.path.join(path, '')
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    if not os.path.basename(path).startswith('.'):
+                        changed.update(inotify.add(path))
+                else:  # deleted or moved away with its files
+                    changed.update(p for p in known if p.startswith(prefix))
+            elif not mask & _IN_CREATE:  # new files are seen once written
+                changed.add(path)
+        changed = {path for path in changed if _is_yaml(path)}
+        for path in changed:
+            if os.path.exists(path):
+                known.add(path)
+            else:
+                known.discard(path)
+        if changed:
+            yield changed
+
+
+def _stamps(root: str) -> dict[str, tuple[int, int]]:
+    ret = {}
+    for _, yaml_files in _walk(root):
+        for path in yaml_files:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            ret[path] = (st.st_mtime_ns, st.st_size)
+    return ret
+
+
+def _poll_changes(root: str) -> Generator[set[str]]:
+    before = _stamps(root)
+    while True:
+        time.sleep(POLL_INTERVAL)
+        after = _stamps(root)
+        changed = {
+            path for path in before.keys() | after.keys()
+            if before.get(path) != after.get(path)
+        }
+        before = after
+        if changed:
+            yield changed
+
+
+def changes(root: str) -> Generator[set[str]]:
+    """Absolute paths of the yaml files saved or deleted, batch by batch."""
+    root = os.path.abspath(root)
+    if sys.platform.startswith('linux'):
+        try:
+            inotify = _Inotify()
+        except (OSError, AttributeError):  # AttributeError: not in libc
+            pass
+        else:
+            try:
+                yield from _inotify_changes(root, inotify)
+                return
+            except OSError as e:
+                print(
+                    f'cannot watch with inotify ({e}), polling instead',
+                    file=sys.stderr,
+                )
+            finally:
+                inotify.close()
+    yield from _poll_changes(root)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Any
+from typing import IO
+from typing import Union
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import ConstructorError
+from yaml.constructor import SafeConstructor
+from yaml.error import Mark
+from yaml.error import MarkedYAMLError
+from yaml.events import AliasEvent
+from yaml.events import MappingEndEvent
+from yaml.events import MappingStartEvent
+from yaml.events import NodeEvent
+from yaml.events import SequenceEndEvent
+from yaml.events import SequenceStartEvent
+from yaml.events import StreamEndEvent
+from yaml.nodes import MappingNode
+from yaml.nodes import Node
+from yaml.nodes import SequenceNode
+from yaml.resolver import Resolver
+
+from pre_commit_hooks import limits
+
+try:
+    from yaml._yaml import CParser as _Parser
+except ImportError:  # pragma: no cover (pyyaml built without libyaml)
+    from yaml.parser import Parser
+    from yaml.reader import Reader
+    from yaml.scanner import Scanner
+
+    class _Parser(Reader, Scanner, Parser):  # type: ignore[no-redef]
+        def __init__(self, stream: Any) -> None:
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+
+_STR_TAG = 'tag:yaml.org,2002:str'
+_MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+# key -> sub-paths wanted below it, `None` when the whole value is wanted
+_Paths = dict[str, Union['_Paths', None]]
+
+
+class LimitExceeded(MarkedYAMLError):
+    """A file is too large, deep, ... to be loaded, see `limits`."""
+
+
+def check_size(size: int, name: str) -> None:
+    """Raise `LimitExceeded` if the file `name` is too large to load."""
+    limits.check_size(size, LimitExceeded, Mark(name, 0, 0, 0, None, 0))
+
+
+class _Limited:
+    """Counts the parse events against the `limits` as they are composed."""
+
+    def __init__(self) -> None:
+        self._count = limits.Budget(LimitExceeded).count
+        self._next_event = super().get_event  # type: ignore[misc]
+
+    def get_event(self) -> Any:
+        event = self._next_event()
+        self._count(event)
+        return event
+
+
+class _PureSafeLoader(_Limited, yaml.SafeLoader):
+    def __init__(self, stream: str | bytes | IO[str] | IO[bytes]) -> None:
+        yaml.SafeLoader.__init__(self, stream)
+        _Limited.__init__(self)
+
+
+def safe_load(stream: str | bytes | IO[str] | IO[bytes]) -> Any:
+    """`yaml.safe_load`, within the `limits`."""
+    return yaml.load(stream, Loader=_PureSafeLoader)
+
+
+class SafeLoader(_Limited, Composer, _Parser, SafeConstructor, Resolver):
+    """`yaml.CSafeLoader` within the `limits`.
+
+    libyaml parses, the nodes are composed in Python so that each event
+    is counted.
+    """
+
+    def __init__(self, stream: str | bytes | IO[str] | IO[bytes]) -> None:
+        _Parser.__init__(self, stream)
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+        _Limited.__init__(self)
+
+
+class UniqueKeyLoader(SafeLoader):
+    """A safe loader which, like ruamel, rejects duplicate mapping keys."""
+
+    def construct_mapping(
+            self,
+            node: MappingNode,
+            deep: bool = False,
+    ) -> dict[Any, Any]:
+        seen = set()
+        for key_node, _ in node.value:
+            if key_node.tag == 'tag:yaml.org,2002:merge':
+                continue
+            key = self.construct_object(key_node, deep=True)
+            try:
+                duplicate = key in seen
+            except TypeError:  # unhashable, reported by the base class
+                continue
+            if duplicate:
+                raise ConstructorError(
+                    'while constructing a mapping', node.start_mark,
+                    f'found duplicate key {key!r}', key_node.start_mark,
+                )
+            seen.add(key)
+        return super().construct_mapping(node, deep=deep)
+
+
+def load(
+        stream: str | bytes | IO[str] | IO[bytes],
+        unique_keys: bool = False,
+) -> Any:
+    loader = (UniqueKeyLoader if unique_keys else SafeLoader)(stream)
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
+
+class ProjectionLoader(SafeLoader):
+    """A safe loader which only builds the requested key paths.
+
+    Everything else is skipped on the event stream without composing nodes
+    or constructing objects (skipped events still count against the
+    limits), and parsing stops as soon as every requested top-level key was
+    seen.
+    """
+
+    def get_projected_data(self, paths: _Paths) -> Any:
+        self.get_event()  # stream start
+        if self.check_event(StreamEndEvent):
+            return None
+        self.get_event()  # document start
+        return self.construct_document(self._project(paths, root=True))
+
+    def _compose(self, parent: Node | None, index: Node | None) -> Node:
+        # `index` is the key node of a value, or None (not an int as typed)
+        node = self.compose_node(parent, index)  # type: ignore[arg-type]
+        assert node is not None  # composing an event always yields a node
+        return node
+
+    def _project(self, paths: _Paths | None, root: bool = False) -> Node:
+        if paths is None:
+            return self._compose(None, None)
+
+        if self.check_event(MappingStartEvent):
+            start = self.get_event()
+            tag = start.tag
+            if tag is None or tag == '!':
+                tag = self.resolve(MappingNode, None, start.implicit)
+            node: Node = MappingNode(
+                tag, [], start.start_mark, None, flow_style=start.flow_style,
+            )
+            if start.anchor is not None:
+                self.anchors[start.anchor] = node
+            remaining = set(paths)
+            while not self.check_event(MappingEndEvent):
+                if root and not remaining:
+                    return node
+                key_node = self._compose(node, None)
+                if key_node.tag == _MERGE_TAG:
+                    # wanted keys may come from the merged mapping
+                    value = self._compose(node, key_node)
+                    node.value.append((key_node, value))
+                elif key_node.tag == _STR_TAG and key_node.value in paths:
+                    remaining.discard(key_node.value)
+                    value = self._project(paths[key_node.value])
+                    node.value.append((key_node, value))
+                else:
+                    self._skip()
+            node.end_mark = self.get_event().end_mark
+            return node
+        elif self.check_event(SequenceStartEvent) and '*' in paths:
+            start = self.get_event()
+            tag = start.tag
+            if tag is None or tag == '!':
+                tag = self.resolve(SequenceNode, None, start.implicit)
+            node = SequenceNode(
+                tag, [], start.start_mark, None, flow_style=start.flow_style,
+            )
+            if start.anchor is not None:
+                self.anchors[start.anchor] = node
+            while not self.check_event(SequenceEndEvent):
+                node.value.append(self._project(paths['*']))
+            node.end_mark = self.get_event().end_mark
+            return node
+        else:
+            # scalars, aliases and unexpected shapes are taken as they are
+            return self._compose(None, None)
+
+    @staticmethod
+    def _anchored(event: Any) -> bool:
+        return isinstance(event, NodeEvent) and event.anchor is not None
+
+    def _skip(self) -> None:
+        if self.check_event(AliasEvent):
+            self.get_event()
+            return
+        elif self._anchored(self.peek_event()):
+            # a later alias may refer to it
+            self._compose(None, None)
+            return
+
+        event = self.get_event()
+        if isinstance(event, SequenceStartEvent):
+            while not self.check_event(SequenceEndEvent):
+                self._skip()
+            self.get_event()
+        elif isinstance(event, MappingStartEvent):
+            while not self.check_event(MappingEndEvent):
+                self._skip()
+                self._skip()
+            self.get_event()
+
+
+def _path_tree(paths: Iterable[Sequence[str]]) -> _Paths:
+    tree: _Paths = {}
+    for path in paths:
+        node = tree
+        for key in path[:-1]:
+            child = node.setdefault(key, {})
+            if child is None:  # an enclosing value is wanted whole
+                break
+            node = child
+        else:
+            node[path[-1]] = None
+    return tree
+
+
+def load_paths(
+        stream: str | bytes | IO[str] | IO[bytes],
+        paths: Iterable[Sequence[str]],
+) -> Any:
+    """Load only `paths` of a single document.
+
+    A path is a sequence of mapping keys where `'*'` stands for every item
+    of a sequence, e.g. `('attributes', '*', 'id')`.  The result has the
+    shape of `yaml.safe_load` with everything else left out.  Documents
+    which are not mappings, and mappings merged in with `<<`, are loaded
+    whole.  Since parsing stops early, a duplicated top-level key (rejected
+    by check-yaml) yields its first value rather than its last.
+    """
+    loader = ProjectionLoader(stream)
+    try:
+        return loader.get_projected_data(_path_tree(paths))
+    finally:
+        loader.dispose()
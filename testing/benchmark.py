@@ -0,0 +1,215 @@
+"""Time every hook over generated corpora and compare against baselines.
+
+Each hook runs the way pre-commit runs it: a fresh process per batch of
+filenames, batches split at the platform's command line length.  The first
+run starts from an empty cache directory ("cold"), the following ones reuse
+it ("warm").
+
+    python -m testing.benchmark --size 1k --size 10k --save
+    python -m testing.benchmark --size 1k --size 10k  # exits 1 on regressions
+
+Timings only compare on the same machine, so baselines are recorded where
+the comparison runs; without a baseline for every result it exits 1 too.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from pre_commit_hooks.daemon import HOOKS
+from testing.corpus import Corpus
+from testing.corpus import SIZES
+from testing.corpus import git_commit
+
+BASELINES = os.path.join(os.path.dirname(__file__), 'benchmark-baselines.json')
+
+BENCH_HOOKS = {**HOOKS, 'check-version': 'pre_commit_hooks.check_version'}
+
+# what pre-commit itself allows for one command line
+_MAX_LENGTH = 2 ** 17
+
+_RUN = 'import sys; from {} import main; raise SystemExit(main(sys.argv[1:]))'
+
+
+def corpus_files(root: str) -> list[str]:
+    ret: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        ret.extend(
+            os.path.relpath(os.path.join(dirpath, filename), root)
+            for filename in filenames
+            if filename.endswith(('.yaml', '.yml'))
+        )
+    return sorted(ret)
+
+
+def batches(filenames: Sequence[str]) -> list[list[str]]:
+    ret: list[list[str]] = [[]]
+    length = 0
+    for filename in filenames:
+        if ret[-1] and length + len(filename) + 1 > _MAX_LENGTH:
+            ret.append([])
+            length = 0
+        ret[-1].append(filename)
+        length += len(filename) + 1
+    return ret
+
+
+def run_hook(
+        module: str,
+        filenames: Sequence[str],
+        cwd: str,
+        cache_dir: str,
+) -> tuple[float, int]:
+    env = {
+        **os.environ,
+        'QUILR_HOOKS_CACHE_DIR': cache_dir,
+        'QUILR_HOOKS_NO_DAEMON': '1',
+        'PYTHONPATH': os.pathsep.join(
+            (os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+             os.environ.get('PYTHONPATH', '')),
+        ),
+    }
+    retval = 0
+    start = time.perf_counter()
+    for batch in batches(filenames):
+        retval |= subprocess.call(
+            (sys.executable, '-c', _RUN.format(module), *batch),
+            cwd=cwd, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    return time.perf_counter() - start, retval
+
+
+def ensure_corpus(corpus_dir: str, size: str, seed: int) -> str:
+    root = os.path.join(corpus_dir, f'corpus-{size}-{seed}')
+    if not os.path.exists(os.path.join(root, '.complete')):
+        n = SIZES.get(size) or int(size)
+        print(f'generating {size} corpus in {root}', file=sys.stderr)
+        Corpus(root, n, seed=seed).write()
+        git_commit(root)
+        open(os.path.join(root, '.complete'), 'w').close()
+    return root
+
+
+def bench(
+        root: str,
+        hooks: Sequence[str],
+        repeat: int,
+) -> dict[str, dict[str, Any]]:
+    filenames = corpus_files(root)
+    results = {}
+    for hook in hooks:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold, retval = run_hook(BENCH_HOOKS[hook], filenames, root, cache_dir)
+            warm = [
+                run_hook(BENCH_HOOKS[hook], filenames, root, cache_dir)[0]
+                for _ in range(repeat)
+            ]
+        results[hook] = {
+            'files': len(filenames),
+            'retval': retval,
+            'cold_s': round(cold, 4),
+            'warm_s': round(min(warm), 4),
+            'warm_median_s': round(statistics.median(warm), 4),
+            'files_per_s': round(len(filenames) / min(warm), 1),
+        }
+    return results
+
+
+def compare(
+        results: dict[str, dict[str, Any]],
+        baselines: dict[str, dict[str, Any]],
+        tolerance: float,
+) -> list[str]:
+    regressions = []
+    for key, result in sorted(results.items()):
+        baseline = baselines[key]
+        for metric in ('cold_s', 'warm_s'):
+            if result[metric] > baseline[metric] * (1 + tolerance):
+                regressions.append(
+                    f'{key} {metric}: {result[metric]}s '
+                    f'(baseline {baseline[metric]}s)',
+                )
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--size', action='append',
+        help=f'{", ".join(SIZES)} or a number of files, may be repeated '
+             f'(default: 1k).',
+    )
+    parser.add_argument(
+        '--hook', action='append', choices=sorted(BENCH_HOOKS),
+        help='hook to time, may be repeated (default: all).',
+    )
+    parser.add_argument('--repeat', type=int, default=3, help='warm runs.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--corpus-dir', default=tempfile.gettempdir(),
+        help='where corpora are generated and kept between runs.',
+    )
+    parser.add_argument('--baselines', default=BASELINES)
+    parser.add_argument(
+        '--save', action='store_true',
+        help='record these results as the new baselines.',
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=.2,
+        help='slowdown relative to a baseline reported as a regression.',
+    )
+    args = parser.parse_args(argv)
+
+    hooks = args.hook or sorted(BENCH_HOOKS)
+    results = {}
+    for size in args.size or ['1k']:
+        root = ensure_corpus(args.corpus_dir, size, args.seed)
+        for hook, result in bench(root, hooks, args.repeat).items():
+            results[f'{hook}@{size}'] = result
+            print(
+                f'{hook + "@" + size:<32} cold {result["cold_s"]:>8.3f}s  '
+                f'warm {result["warm_s"]:>8.3f}s  '
+                f'{result["files_per_s"]:>10.1f} files/s  '
+                f'exit {result["retval"]}',
+            )
+
+    try:
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+    except FileNotFoundError:
+        baselines = {}
+
+    if args.save:
+        baselines.update(results)
+        with open(args.baselines, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        return 0
+
+    missing = sorted(results.keys() - baselines.keys())
+    if missing:
+        print(
+            f'no baselines for {", ".join(missing)} in {args.baselines}, '
+            f'record them with --save',
+            file=sys.stderr,
+        )
+        return 1
+
+    regressions = compare(results, baselines, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,275 @@
+"""Generate a synthetic content repository for benchmarks.
+
+Documents are derived from the content schemas so they validate, and are
+cross-linked the way real content is: use-cases and execution controls
+reference attributes of the generated catalog, ids and codes are unique
+and every top-level tag is declared by some use-case.
+
+    python -m testing.corpus --size 10k /tmp/corpus
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import subprocess
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+import yaml
+
+from pre_commit_hooks.check_attribute import list_of_operators
+from pre_commit_hooks.schemas import REGISTRY
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # pragma: no cover (pyyaml built without libyaml)
+    from yaml import SafeDumper  # type: ignore[assignment]
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000}
+
+# kind -> (directory, share of the files)
+KINDS = {
+    'use-case': ('static-files/classification-config-service/use-case', .20),
+    'use_case': ('static-files/classification-config-service/use_case', .15),
+    'action': ('static-files/classification-config-service/action', .20),
+    'attributes': ('static-files/classification-config-service/attributes', .05),
+    'behavior': ('static-files/classification-config-service/behavior', .15),
+    'execution-controls': ('quilr-playbook-service/static/execution_controls', .15),
+    'templates': ('quilr-playbook-service/static/templates', .10),
+}
+
+ACTION_TYPES = ('ACTP_01', 'ACTP_02', 'ACTP_04')
+
+_WORDS = (
+    'user', 'device', 'file', 'share', 'external', 'login', 'policy',
+    'sensitive', 'download', 'upload', 'mailbox', 'admin', 'risk', 'agent',
+    'browser', 'finance', 'engineering', 'token', 'session', 'anomaly',
+)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def fake(schema: dict[str, Any], rng: random.Random) -> Any:
+    """An instance of `schema` with every declared property filled in."""
+    if 'enum' in schema:
+        return rng.choice(schema['enum'])
+
+    tp = schema.get('type', 'object')
+    if isinstance(tp, list):
+        tp = next((t for t in tp if t != 'null'), 'null')
+
+    if tp == 'object':
+        return {
+            key: fake(value, rng)
+            for key, value in schema.get('properties', {}).items()
+        }
+    elif tp == 'array':
+        items = schema.get('items', {'type': 'string'})
+        return [fake(items, rng) for _ in range(rng.randint(1, 3))]
+    elif tp == 'string':
+        if schema.get('format') == 'uuid':
+            return _uuid(rng)
+        return ' '.join(rng.choices(_WORDS, k=rng.randint(1, 6)))
+    elif tp == 'integer':
+        return rng.randint(0, 2 ** 40)
+    elif tp == 'number':
+        return round(rng.uniform(0, 100), 2)
+    elif tp == 'boolean':
+        return rng.random() < .5
+    else:
+        return None
+
+
+def _schema(name: str) -> dict[str, Any]:
+    ref = REGISTRY.find(name)
+    assert ref is not None, name
+    return REGISTRY.schema(ref)
+
+
+class Corpus:
+    def __init__(
+            self,
+            root: str,
+            size: int,
+            *,
+            attributes_per_file: int = 40,
+            seed: int = 0,
+    ) -> None:
+        self.root = root
+        self.rng = random.Random(seed)
+        self.counts = {
+            kind: max(1, round(size * share))
+            for kind, (_, share) in KINDS.items()
+        }
+        self.attributes_per_file = attributes_per_file
+        n_attributes = self.counts['attributes'] * attributes_per_file
+        self.attribute_ids = [
+            f'attr.{self.rng.choice(_WORDS)}.{i}' for i in range(n_attributes)
+        ]
+        self.tags = [f'tag-{i}' for i in range(max(1, size // 50))]
+
+    def _conditions(self) -> list[dict[str, Any]]:
+        return [
+            {
+                'operator': self.rng.choice(('and', 'or', None)),
+                'editable': True,
+                'filter_group': None,
+                'filter_condition': {
+                    'attribute_type': 'user',
+                    'attribute_id': self.rng.choice(self.attribute_ids),
+                    'condition': self.rng.choice(list_of_operators),
+                    'value': self.rng.choice(_WORDS),
+                },
+            }
+            for _ in range(self.rng.randint(1, 5))
+        ]
+
+    def _tags(self) -> list[str]:
+        return self.rng.sample(self.tags, min(len(self.tags), 3))
+
+    def use_case(self, i: int) -> dict[str, Any]:
+        data = fake(_schema('use_case_schema'), self.rng)
+        data.update(
+            id=_uuid(self.rng),
+            version=1,
+            code=f'UC{i}',
+            condition=self._conditions(),
+        )
+        return data
+
+    def action(self, i: int) -> dict[str, Any]:
+        actiontype = ACTION_TYPES[i % len(ACTION_TYPES)]
+        variant = REGISTRY.find(
+            {
+                'ACTP_01': 'engage_agent_schema',
+                'ACTP_02': 'jit_schema',
+                'ACTP_04': 'deploy_agent_schema',
+            }[actiontype],
+        )
+        assert variant is not None
+        data = fake(REGISTRY.schema(variant), self.rng)
+        if 'enum' not in REGISTRY.schema(variant)['properties']['type']:
+            data['type'] = 'action'
+        data.update(
+            code=f'ACT_{i}', actiontype=actiontype, tags=self._tags(),
+        )
+        return data
+
+    def attributes(self, i: int) -> dict[str, Any]:
+        data = fake(_schema('Attributes_Schema'), self.rng)
+        item_schema = _schema('Attributes_Schema')['properties']['attributes']
+        start = i * self.attributes_per_file
+        data.update(
+            code=f'ATTR_user_{i}',
+            tags=self._tags(),
+            attributes=[
+                {
+                    **fake(item_schema['items'], self.rng),
+                    'id': attribute_id,
+                    # codes never match use-case codes, see check-attribute-tags
+                    'tags': [f'T{self.rng.randint(0, 99)}'],
+                    'supported_operators': list_of_operators[:3],
+                }
+                for attribute_id in self.attribute_ids[
+                    start:start + self.attributes_per_file
+                ]
+            ],
+        )
+        return data
+
+    def behavior(self, i: int) -> dict[str, Any]:
+        data = fake(_schema('Behavior_Finding_Schema'), self.rng)
+        if isinstance(data.get('tags'), list):
+            data['tags'] = self._tags()
+        return data
+
+    def execution_controls(self, i: int) -> dict[str, Any]:
+        data = fake(_schema('execution_module_schema'), self.rng)
+        data['trigger_conditions'] = self._conditions()
+        return data
+
+    def templates(self, i: int) -> dict[str, Any]:
+        data = fake(_schema('template_schema'), self.rng)
+        if isinstance(data.get('tags'), list):
+            data['tags'] = self._tags()
+        return data
+
+    def documents(self) -> dict[str, Any]:
+        makers = {
+            'use-case': self.use_case,
+            'use_case': self.use_case,
+            'action': self.action,
+            'attributes': self.attributes,
+            'behavior': self.behavior,
+            'execution-controls': self.execution_controls,
+            'templates': self.templates,
+        }
+        ret = {}
+        for kind, (directory, _) in KINDS.items():
+            for i in range(self.counts[kind]):
+                data = makers[kind](i)
+                # check-version compares these
+                if isinstance(data.get('version'), str):
+                    data['version'] = f'1.{i % 10}'
+                ret[f'{directory}/{kind}-{i}.yaml'] = data
+
+        # every tag used anywhere is declared by some use-case
+        use_cases = sorted(p for p in ret if '/use_case/' in p)
+        for i, tag in enumerate(self.tags):
+            ret[use_cases[i % len(use_cases)]].setdefault('tags', []).append(tag)
+        return ret
+
+    def write(self) -> int:
+        documents = self.documents()
+        for path, data in documents.items():
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                yaml.dump(data, f, Dumper=SafeDumper, sort_keys=False)
+        return len(documents)
+
+
+def git_commit(root: str) -> None:
+    def git(*args: str) -> None:
+        subprocess.check_call(
+            ('git', '-C', root, *args), stdout=subprocess.DEVNULL,
+        )
+
+    git('init', '-q')
+    git('add', '.')
+    git(
+        '-c', 'user.name=corpus', '-c', 'user.email=corpus@example.com',
+        'commit', '-q', '-m', 'corpus',
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default='1k', help=f'{", ".join(SIZES)} or a number of files.')
+    parser.add_argument('--attributes-per-file', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--git', action='store_true',
+        help='commit the corpus to a new git repository (for check-version).',
+    )
+    parser.add_argument('root')
+    args = parser.parse_args(argv)
+
+    size = SIZES.get(args.size) or int(args.size)
+    corpus = Corpus(
+        args.root, size,
+        attributes_per_file=args.attributes_per_file, seed=args.seed,
+    )
+    n = corpus.write()
+    if args.git:
+        git_commit(args.root)
+    print(f'wrote {n} files to {args.root}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""Check how long importing each hook takes against a per-hook budget.
+
+pre-commit starts every hook as a new process, several times per commit
+when it splits the files into batches, so what a hook imports before it
+has a file to check is paid over and over.  Besides the time (the fastest
+of a few `python -X importtime` runs), no hook may import the parsers,
+sqlite or process pools up front.
+
+Budgets are relative to importing the standard library modules the hooks
+build on, timed alongside, so they hold on slower machines too.
+
+    python -m testing.importtime  # exits 1 when a hook is over budget
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from collections.abc import Sequence
+
+from testing.benchmark import BENCH_HOOKS
+
+# what every hook imports anyway, the unit of the budgets
+REFERENCE = ('argparse', 'hashlib', 'json', 'socket', 'subprocess', 'typing')
+
+DEFAULT_BUDGET = 2.
+BUDGETS = {
+    # imports the modules of the checks it runs
+    'quilr-check-all': 2.5,
+}
+
+# only imported once a hook knows it has work to do
+DEFERRED = (
+    'yaml', 'ruamel.yaml', 'jsonschema', 'packaging', 'sqlite3',
+    'concurrent.futures', 'socketserver', 'tracemalloc', 'cProfile',
+)
+
+
+def import_time(*modules: str) -> tuple[float, set[str]]:
+    """Cumulative seconds importing `modules` and every module imported."""
+    code = f'import {", ".join(modules)}'
+    proc = subprocess.run(
+        (sys.executable, '-X', 'importtime', '-c', code),
+        capture_output=True, text=True, check=True,
+    )
+    seconds = 0.
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        imported.add(name.strip())
+        # nested imports are indented below the one importing them
+        if name.strip() in modules and name == f' {name.strip()}':
+            seconds += int(cumulative) / 1e6
+    return seconds, imported
+
+
+def deferred(imported: set[str]) -> list[str]:
+    """The `DEFERRED` modules among `imported`."""
+    return sorted(set(DEFERRED).intersection(imported))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument(
+        '--hook', action='append', choices=sorted(BENCH_HOOKS),
+        help='Only check these hooks (default: all).',
+    )
+    args = parser.parse_args(argv)
+
+    retval = 0
+    for hook in args.hook or sorted(BENCH_HOOKS):
+        module = BENCH_HOOKS[hook]
+        # alternated so that both are timed under the same load
+        runs = []
+        reference = float('inf')
+        for _ in range(args.runs):
+            runs.append(import_time(module))
+            reference = min(reference, import_time(*REFERENCE)[0])
+        seconds = min(s for s, _ in runs)
+        imported = deferred(set.intersection(*(i for _, i in runs)))
+        budget = BUDGETS.get(hook, DEFAULT_BUDGET)
+
+        problems = []
+        if seconds > budget * reference:
+            problems.append(f'over the budget of {budget:g}x')
+        if imported:
+            problems.append(f'imports {", ".join(imported)}')
+        status = '; '.join(problems) or 'ok'
+        print(
+            f'{hook:<24} {seconds * 1000:7.1f}ms '
+            f'{seconds / reference:5.2f}x  {status}',
+        )
+        if problems:
+            retval = 1
+    return retval
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from pre_commit_hooks import attribute_catalog
+from pre_commit_hooks.attribute_catalog import Attribute
+from pre_commit_hooks.util import cache_path
+
+STAMP = bytes(range(32))
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    monkeypatch.setattr(attribute_catalog, '_catalogs', {})
+    monkeypatch.setattr(attribute_catalog, '_files', {})
+
+
+@pytest.fixture
+def location(tmp_path):
+    tmp_path.joinpath('a.yaml').write_text(
+        'attributes:\n'
+        '- {id: email, tags: [pii], supported_operators: [eq], expected_datatype: string}\n'
+        '- {id: age, tags: [], expected_datatype: int}\n',
+    )
+    tmp_path.joinpath('b.yaml').write_text('attributes:\n- {id: name, tags: [pii]}\n')
+    return str(tmp_path)
+
+
+def _snapshot(location):
+    return cache_path('attribute-catalog', os.path.abspath(location), '.snapshot')
+
+
+def test_round_trip():
+    attributes = {
+        'b': Attribute('b', ['x', 'y'], ['eq'], 'string', 'b.yaml'),
+        'a': Attribute('a', None, None, None, 'dir/a.yaml'),
+        'ü': Attribute('ü', ['x'], [], 'int', 'b.yaml'),
+    }
+    catalog = attribute_catalog.AttributeCatalog(
+        attribute_catalog.dump(attributes, STAMP),
+    )
+    assert catalog.stamp == STAMP
+    assert len(catalog) == 3
+    for key, attribute in attributes.items():
+        assert key in catalog
+        assert catalog.get(key) == attribute
+        assert catalog.tags(key) == attribute.tags
+    assert 'c' not in catalog and '1' not in catalog
+    assert catalog.get('c') is None and catalog.tags('c') is None
+    assert catalog.defined_in(['b.yaml']) == {'b', 'ü'}
+    assert catalog.defined_in(['a.yaml']) == set()
+
+
+def test_empty():
+    catalog = attribute_catalog.AttributeCatalog(
+        attribute_catalog.dump({}, STAMP),
+    )
+    assert len(catalog) == 0
+    assert 'a' not in catalog
+
+
+def test_build_writes_a_snapshot(location):
+    catalog = attribute_catalog.build(location)
+    assert sorted(catalog.defined_in([os.path.join(location, 'a.yaml')])) == [
+        'age', 'email',
+    ]
+    assert catalog.get('email') == Attribute(
+        'email', ['pii'], ['eq'], 'string', os.path.join(location, 'a.yaml'),
+    )
+    assert os.path.exists(_snapshot(location))
+    # a fresh process maps the snapshot without parsing anything
+    attribute_catalog._files.clear()
+    assert attribute_catalog.build(location).stamp == catalog.stamp
+    assert attribute_catalog._files == {}
+
+
+def test_stale_snapshot(location, tmp_path):
+    assert attribute_catalog.load(location).tags('name') == ['pii']
+    tmp_path.joinpath('b.yaml').write_text(
+        'attributes:\n- {id: name, tags: [pii, personal]}\n',
+    )
+    # loaded once per process
+    assert attribute_catalog.load(location).tags('name') == ['pii']
+    attribute_catalog.invalidate()
+    assert attribute_catalog.load(location).tags('name') == ['pii', 'personal']
+    tmp_path.joinpath('a.yaml').unlink()
+    attribute_catalog.invalidate()
+    assert 'email' not in attribute_catalog.load(location)
+
+
+@pytest.mark.parametrize(
+    'corrupt',
+    (
+        pytest.param(lambda data: data[:len(data) // 2], id='cut short'),
+        pytest.param(lambda data: data[:10], id='cut in the header'),
+        pytest.param(lambda data: data + b'\0', id='trailing bytes'),
+        pytest.param(lambda data: b'XXXX' + data[4:], id='other magic'),
+        pytest.param(lambda data: b'', id='empty'),
+    ),
+)
+def test_corrupt_snapshot(location, corrupt):
+    attribute_catalog.build(location)
+    snapshot = _snapshot(location)
+    with open(snapshot, 'rb') as f:
+        data = f.read()
+    with open(snapshot, 'wb') as f:
+        f.write(corrupt(data))
+    attribute_catalog._files.clear()
+    catalog = attribute_catalog.build(location)
+    assert sorted(catalog.defined_in([
+        os.path.join(location, 'a.yaml'), os.path.join(location, 'b.yaml'),
+    ])) == ['age', 'email', 'name']
+    # and rewritten
+    with open(snapshot, 'rb') as f:
+        assert f.read() == data
+
+
+def test_update(location, tmp_path):
+    attribute_catalog.load(location)
+    tmp_path.joinpath('c.yaml').write_text('attributes:\n- {id: new}\n')
+    tmp_path.joinpath('b.yaml').unlink()
+    attribute_catalog.update(
+        [str(tmp_path.joinpath('c.yaml')), str(tmp_path.joinpath('b.yaml'))],
+        location,
+    )
+    catalog = attribute_catalog.load(location)
+    assert 'new' in catalog and 'name' not in catalog and 'email' in catalog
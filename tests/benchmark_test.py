@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+from testing import benchmark
+
+
+def _result(cold_s, warm_s):
+    return {'cold_s': cold_s, 'warm_s': warm_s}
+
+
+def test_compare():
+    baselines = {
+        'check-yaml@1k': _result(1., 1.),
+        'validate-id@1k': _result(1., 1.),
+    }
+    results = {
+        'check-yaml@1k': _result(1.1, 1.2),
+        'validate-id@1k': _result(1.1, 1.3),
+    }
+    assert benchmark.compare(results, baselines, .2) == [
+        'validate-id@1k warm_s: 1.3s (baseline 1.0s)',
+    ]
+
+
+def _main(tmp_path, *args):
+    return benchmark.main((
+        '--size', '10', '--hook', 'check-yaml', '--repeat', '1',
+        '--corpus-dir', str(tmp_path), *args,
+    ))
+
+
+def test_missing_baselines_fail(tmp_path, capsys):
+    baselines = tmp_path.joinpath('baselines.json')
+    assert _main(tmp_path, '--baselines', str(baselines)) == 1
+    assert 'no baselines for check-yaml@10' in capsys.readouterr().err
+
+
+def test_saved_baselines(tmp_path):
+    baselines = tmp_path.joinpath('baselines.json')
+    assert _main(tmp_path, '--baselines', str(baselines), '--save') == 0
+    assert set(json.loads(baselines.read_text())) == {'check-yaml@10'}
+    # timings vary, a generous tolerance only checks the comparison runs
+    args = ('--baselines', str(baselines), '--tolerance', '100')
+    assert _main(tmp_path, *args) == 0
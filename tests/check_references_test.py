@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import subprocess
+
+from pre_commit_hooks.check_references import main
+from pre_commit_hooks.validate_uuid import main as validate_id
+from testing.corpus import git_commit
+
+USE_CASES = 'classification-config-service/use-case'
+OLD_ID = '0f7e1b3a-5c2d-4e8f-9a6b-1c2d3e4f5a6b'
+NEW_ID = '7a8b9c0d-1e2f-4a3b-8c4d-5e6f7a8b9c0d'
+
+
+def test_renamed_id_dangles_on_every_run(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    use_case = tmp_path.joinpath(USE_CASES, 'uc 1.yaml')
+    use_case.parent.mkdir(parents=True)
+    use_case.write_text(f'type: use-case\nid: {OLD_ID}\ncode: UC1\n')
+    tmp_path.joinpath('ref.yaml').write_text(f'use_case:\n  id: {OLD_ID}\n')
+    git_commit(str(tmp_path))
+    use_case.write_text(f'type: use-case\nid: {NEW_ID}\ncode: UC1\n')
+    subprocess.check_call(('git', 'add', '.'))
+    filename = f'{USE_CASES}/uc 1.yaml'
+
+    assert main([filename]) == 1
+    # neither this hook nor validate-id refreshing the index hides it
+    assert validate_id([filename]) == 0
+    assert main([filename]) == 1
+    out = capsys.readouterr().out
+    expected = f"❌ use-case '{OLD_ID}' referenced in ref.yaml does not exist"
+    assert out.count(expected) == 2
+
+
+def test_new_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('ref.yaml').write_text(f'use_case:\n  id: {OLD_ID}\n')
+    git_commit(str(tmp_path))
+    tmp_path.joinpath('new uc.yaml').write_text(
+        f'type: use-case\nid: {OLD_ID}\ncode: UC1\n',
+    )
+    subprocess.check_call(('git', 'add', '.'))
+
+    assert main(['new uc.yaml']) == 0
+
+
+def test_deleted_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    use_case = tmp_path.joinpath(USE_CASES, 'uc 1.yaml')
+    use_case.parent.mkdir(parents=True)
+    use_case.write_text(f'type: use-case\nid: {OLD_ID}\ncode: UC1\n')
+    tmp_path.joinpath('ref.yaml').write_text(f'use_case:\n  id: {OLD_ID}\n')
+    tmp_path.joinpath('other.yaml').write_text('a: 1\n')
+    git_commit(str(tmp_path))
+    subprocess.check_call(('git', 'rm', '-q', f'{USE_CASES}/uc 1.yaml'))
+    tmp_path.joinpath('other.yaml').write_text('a: 2\n')
+    subprocess.check_call(('git', 'add', '.'))
+
+    # pre-commit only passes the files which still exist
+    assert main(['other.yaml']) == 1
+    expected = f"❌ use-case '{OLD_ID}' referenced in ref.yaml does not exist"
+    assert expected in capsys.readouterr().out
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import subprocess
+
+from pre_commit_hooks.check_version import main
+from testing.corpus import git_commit
+
+
+def test_check_version(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('a b.yaml').write_text('version: 1.0.0\n')
+    tmp_path.joinpath('same.yaml').write_text('version: 1.0.0\n')
+    git_commit(str(tmp_path))
+    tmp_path.joinpath('a b.yaml').write_text('version: 1.0.1\n')
+    # new, with a space too: `git cat-file` reports `HEAD:c d.yaml missing`
+    tmp_path.joinpath('c d.yaml').write_text('version: 1.0.0\n')
+    subprocess.check_call(('git', 'add', '.'))
+
+    assert main(['a b.yaml', 'c d.yaml']) == 0
+    assert 'c d.yaml is a new file' in capsys.readouterr().out
+    assert main(['same.yaml']) == 1
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pytest
+
+from pre_commit_hooks import check_yaml
+from pre_commit_hooks.check_yaml import main
+
+
+def _laughs():
+    lines = ['a: &a [lol, lol, lol, lol, lol, lol, lol, lol]']
+    for prev, name in zip('abcdefg', 'bcdefgh'):
+        lines.append(f'{name}: &{name} [{", ".join([f"*{prev}"] * 8)}]')
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.fixture
+def write(tmp_path):
+    def write(contents, name='f.yaml'):
+        path = tmp_path.joinpath(name)
+        path.write_text(contents)
+        return str(path)
+    return write
+
+
+@pytest.mark.parametrize('args', ((), ('--stream',), ('--unsafe',)))
+def test_alias_expansion_is_limited(write, args, capsys):
+    assert main([*args, write(_laughs())]) == 1
+    assert 'QUILR_HOOKS_YAML_MAX_ALIAS_NODES' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('args', ((), ('--stream',), ('--unsafe',)))
+@pytest.mark.parametrize(
+    'contents',
+    (
+        '[' * 1000 + ']' * 1000,
+        ''.join(f'{" " * 2 * i}k:\n' for i in range(300)),
+        ''.join(f'{" " * 2 * i}-\n' for i in range(300)),
+    ),
+    ids=('flow', 'block mapping', 'block sequence'),
+)
+def test_depth_is_limited(write, args, contents, capsys):
+    assert main([*args, write(contents)]) == 1
+    assert 'QUILR_HOOKS_YAML_MAX_DEPTH' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(('depth', 'expected'), (('2', 0), ('1', 1)))
+def test_depth_limit_from_the_environment(write, monkeypatch, depth, expected):
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_DEPTH', depth)
+    assert main([write('a: 1\nb: [1, 2]\n')]) == expected
+
+
+def test_cached_results_follow_the_limits(write, monkeypatch):
+    filename = write('a: &a [1, 2]\nb: *a\nc: *a\n')
+    assert main([filename]) == 0
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_ALIAS_NODES', '2')
+    assert main([filename]) == 1
+
+
+@pytest.mark.parametrize(
+    ('args', 'expected'),
+    (
+        (('--multi', '--stream'), 0),
+        (('--unsafe',), 0),
+        (('--unsafe', '--stream'), 0),
+        # loaded whole, the size still counts
+        (('--multi',), 1),
+    ),
+)
+def test_limits_of_each_document(write, monkeypatch, args, expected):
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_SIZE', '1000')
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_NODES', '50')
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_ALIAS_NODES', '10')
+    document = '---\na: &a [1, 2, 3]\nb: [*a, *a]\nc: {d: e}\n'
+    filename = write(document * 100)
+    assert main([*args, filename]) == expected
+    # a document of its own still may not exceed them
+    with open(filename, 'a') as f:
+        f.write(f'---\n[{", ".join(["x"] * 60)}]\n')
+    assert main([*args, filename]) == 1
+
+
+@pytest.mark.parametrize(
+    ('contents', 'expected'),
+    (
+        ('a: 1\nb: [1, {c: d}]\nurl: http://x/*y&z\n', False),
+        ('a: &a 1\n', True),
+        ('a: [*a]\n', True),
+        ('[' * 250 + ']' * 250, True),
+        (''.join(f'{" " * i}- \n' for i in range(150)), True),
+        # many collections, none deep
+        ('a: [1, {b: c}]\n' * 500, False),
+        ('{"a": "]]]", b: \'}}}\', c: [1] # ]]]\n}\n' * 50, False),
+        # closing brackets in scalars do not close anything
+        ('[{"a": "' + ']' * 250 + '"}, ' + '[' * 250 + ']' * 251, True),
+        ('[a"' + ']' * 250 + '", ' + '[' * 250 + ']' * 251, True),
+    ),
+    ids=(
+        'plain', 'anchor', 'alias', 'deep flow', 'deep block',
+        'flow collections', 'quoted brackets', 'quoted closers',
+        'plain closers',
+    ),
+)
+def test_needs_counting(write, contents, expected):
+    assert check_yaml._needs_counting(write(contents)) is expected
+
+
+def test_needs_counting_nodes_of_each_document(write, monkeypatch):
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_NODES', '100')
+    assert check_yaml._needs_counting(write('---\na: 1\n' * 100)) is False
+    assert check_yaml._needs_counting(write('a: 1\n' * 100)) is True
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import pytest
+
+from pre_commit_hooks import content_index
+from pre_commit_hooks import document_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path_factory, monkeypatch):
+    cache = tmp_path_factory.mktemp('cache')
+    monkeypatch.setenv('QUILR_HOOKS_CACHE_DIR', str(cache))
+    monkeypatch.setenv('QUILR_HOOKS_NO_DAEMON', '1')
+    # the caches opened by a previous test live in another cache dir
+    monkeypatch.setattr(content_index, '_shared', {})
+    monkeypatch.setattr(document_cache, '_shared', {})
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from pre_commit_hooks import content_index
+
+
+def _fork(monkeypatch):
+    # what a forked worker sees: the parent's indexes under another pid
+    pid = os.getpid() + 1
+    monkeypatch.setattr(os, 'getpid', lambda: pid)
+
+
+def test_worker_reuses_the_parents_refresh(tmp_path, monkeypatch):
+    tmp_path.joinpath('a.yaml').write_text('type: use-case\nid: 1\n')
+    content_index.shared_index().refresh(str(tmp_path))
+
+    _fork(monkeypatch)
+    worker = content_index.shared_index()
+    scans: list[str] = []
+    monkeypatch.setattr(worker, '_scan', scans.append)
+    worker.refresh(str(tmp_path))
+    assert scans == []
+    assert worker.matching(str(tmp_path), 'use-case', 'id', 1)
+
+
+def test_worker_refreshes_an_index_in_memory(tmp_path, monkeypatch):
+    cache = tmp_path.joinpath('cache')
+    cache.write_text('not a folder')
+    monkeypatch.setenv('QUILR_HOOKS_CACHE_DIR', str(cache))
+    tmp_path.joinpath('a.yaml').write_text('type: use-case\nid: 1\n')
+    content_index.shared_index().refresh(str(tmp_path))
+
+    _fork(monkeypatch)
+    worker = content_index.shared_index()
+    assert worker.matching(str(tmp_path), 'use-case', 'id', 1)
+
+
+@pytest.mark.parametrize('value', ('[a, b]', '{a: b}'))
+@pytest.mark.parametrize('field', ('type', 'id', 'code'))
+def test_values_which_are_not_scalars(tmp_path, field, value):
+    tmp_path.joinpath('a.yaml').write_text(
+        f'type: use-case\nid: 1\ncode: UC1\n{field}: {value}\n',
+    )
+    tmp_path.joinpath('b.yaml').write_bytes(b'\xffnot utf-8: 1\n')
+    tmp_path.joinpath('c.yaml').write_text('type: use-case\nid: 1\n')
+    index = content_index.shared_index()
+
+    expected = {'type': 'use-case', 'id': '1', 'code': 'UC1', field: None}
+    assert [row[1:] for row in index.documents(str(tmp_path))] == [
+        (expected['type'], expected['id'], expected['code']),
+        (None, None, None),
+        ('use-case', '1', None),
+    ]
+    a = str(tmp_path.joinpath('a.yaml'))
+    assert index.duplicate_ids(a, 'use-case', [1]) == []
+    assert index.duplicate_ids(a, ['use-case'], 1) == []
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from pre_commit_hooks import daemon
+from pre_commit_hooks import util
+from pre_commit_hooks.check_yaml import main as check_yaml
+
+
+@pytest.fixture
+def running(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('QUILR_HOOKS_NO_DAEMON')
+    assert daemon.main(['start']) == 0
+    yield
+    daemon.main(['stop'])
+
+
+def _gone():
+    for _ in range(50):
+        if not os.path.exists(daemon.socket_path()):
+            return True
+        time.sleep(.1)
+    return False
+
+
+def test_round_trip(running, tmp_path, capsys):
+    tmp_path.joinpath('f.yaml').write_text('a: [\n')
+    assert daemon.forward('check-yaml', ['f.yaml']) == 1
+    assert 'in "f.yaml", line 2' in capsys.readouterr().out
+    assert check_yaml(['f.yaml']) == 1
+    assert daemon.main(['status']) == 0
+    assert 'running (pid ' in capsys.readouterr().out
+
+
+def test_other_settings(running, tmp_path, monkeypatch):
+    tmp_path.joinpath('f.yaml').write_text('a: [1]\n')
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_DEPTH', '1')
+    assert daemon.forward('check-yaml', ['f.yaml']) is None
+    # run in-process with the client's limits, the daemon stays up
+    assert check_yaml(['f.yaml']) == 1
+    monkeypatch.delenv('QUILR_HOOKS_YAML_MAX_DEPTH')
+    assert daemon.forward('check-yaml', ['f.yaml']) == 0
+
+
+def test_stale_server(running, tmp_path, monkeypatch, capsys):
+    tmp_path.joinpath('f.yaml').write_text('a: 1\n')
+    # as if the hooks were upgraded since the daemon started
+    monkeypatch.setattr(util, '_source_hash', 'upgraded')
+    assert daemon.main(['status']) == 0
+    assert 'stale' in capsys.readouterr().out
+    assert daemon.forward('check-yaml', ['f.yaml']) is None
+    assert _gone()
+
+
+def test_start_replaces_a_stale_server(running, monkeypatch, capsys):
+    before = daemon._ping()
+    assert before is not None
+    monkeypatch.setattr(util, '_source_hash', 'upgraded')
+    assert daemon.main(['start']) == 0
+    assert 'started' in capsys.readouterr().out
+    replaced = daemon._ping()
+    assert replaced is not None and replaced[0] != before[0]
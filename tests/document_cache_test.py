@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import datetime
+import functools
+import pickle
+
+import pytest
+
+from pre_commit_hooks import document_cache
+from pre_commit_hooks import yaml_loader
+
+CONTENTS = b'id: 1\nname: x\n'
+
+called: list[str] = []
+
+
+def _record(value):
+    called.append(value)
+
+
+class _Evil:
+    def __reduce__(self):
+        return _record, ('unpickled',)
+
+
+def _counting(parse):
+    def counting(f):
+        counting.calls += 1  # type: ignore[attr-defined]
+        return parse(f)
+    counting.calls = 0  # type: ignore[attr-defined]
+    return counting
+
+
+@pytest.fixture
+def filename(tmp_path):
+    ret = tmp_path.joinpath('f.yaml')
+    ret.write_bytes(CONTENTS)
+    return str(ret)
+
+
+def test_stored(filename):
+    parse = _counting(yaml_loader.safe_load)
+    assert document_cache.load(filename, parse) == {'id': 1, 'name': 'x'}
+    assert document_cache.load(filename, parse) == {'id': 1, 'name': 'x'}
+    assert parse.calls == 1
+
+
+def test_loaders_are_stored_apart(filename):
+    def first(f):
+        return 'first'
+
+    def second(f):
+        return 'second'
+
+    assert document_cache.load(filename, first) == 'first'
+    assert document_cache.load(filename, second) == 'second'
+    assert document_cache.load(filename, first) == 'first'
+
+
+def test_partial_is_stored_as_its_function(filename):
+    document_cache.load(
+        filename,
+        functools.partial(yaml_loader.load, unique_keys=True),
+        unique_keys=True,
+    )
+    cache = document_cache.shared_cache()
+    assert cache is not None
+    key = document_cache._key(CONTENTS, 'pre_commit_hooks.yaml_loader.load')
+    assert cache.get(key, unique_keys=True) == (True, {'id': 1, 'name': 'x'})
+
+
+def test_changes_are_parsed_again(tmp_path, filename, monkeypatch):
+    parse = _counting(yaml_loader.safe_load)
+    document_cache.load(filename, parse)
+    tmp_path.joinpath('f.yaml').write_bytes(b'id: 2\n')
+    assert document_cache.load(filename, parse) == {'id': 2}
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_DEPTH', '10')
+    assert document_cache.load(filename, parse) == {'id': 2}
+    assert parse.calls == 3
+
+
+def test_load_paths_only_reuses_yaml_loader_documents(filename):
+    paths = (('id',),)
+    cache = document_cache.shared_cache()
+    assert cache is not None
+    document_cache.load(filename, lambda f: {'id': 'other loader'})
+    assert document_cache.load_paths(CONTENTS, paths) == {'id': 1}
+    for loader in (yaml_loader.safe_load, yaml_loader.load):
+        with cache.db:
+            cache.db.execute('DELETE FROM documents')
+        document_cache.load(filename, loader)
+        # the whole stored document
+        assert document_cache.load_paths(CONTENTS, paths) == {
+            'id': 1, 'name': 'x',
+        }
+
+
+def test_dates_round_trip(tmp_path):
+    path = tmp_path.joinpath('f.yaml')
+    path.write_text(
+        'date: 2024-01-02\n'
+        'time: 2024-01-02T03:04:05+01:00\n'
+        'set: !!set {a}\n',
+    )
+    parse = _counting(yaml_loader.safe_load)
+    first = document_cache.load(str(path), parse)
+    assert document_cache.load(str(path), parse) == first
+    assert parse.calls == 1
+    assert first['time'].tzinfo == datetime.timezone(datetime.timedelta(hours=1))
+
+
+@pytest.mark.parametrize(
+    'blob',
+    (
+        document_cache._PICKLE + pickle.dumps(_Evil()),
+        document_cache._PICKLE + pickle.dumps(pickle.Pickler),
+        document_cache._PICKLE + b'garbage',
+        document_cache._MARSHAL + b'garbage',
+        b'',
+    ),
+    ids=('reduce', 'global', 'corrupt pickle', 'corrupt marshal', 'empty'),
+)
+def test_untrusted_data_is_parsed_again(filename, blob):
+    parse = _counting(yaml_loader.safe_load)
+    key = document_cache._key(CONTENTS, document_cache._loader_name(parse))
+    cache = document_cache.shared_cache()
+    assert cache is not None
+    with cache.db:
+        cache.db.execute(
+            'INSERT INTO documents (key, unique_keys, data) VALUES (?, 1, ?)',
+            (key, blob),
+        )
+    assert document_cache.load(filename, parse) == {'id': 1, 'name': 'x'}
+    assert parse.calls == 1
+    assert called == []
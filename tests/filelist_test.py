@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+
+from pre_commit_hooks import filelist
+
+GITIGNORE = '''\
+# a comment
+*.tmp.yaml
+!keep.tmp.yaml
+/anchored.yaml
+build/
+logs
+docs/**/gen.yaml
+**/deep/skip.yaml
+a?c.yaml
+[xy]z.yaml
+sub/*.yaml
+!sub/wanted.yaml
+dir.yaml/
+\\#hash.yaml
+trailing.yaml\x20\x20
+out/**
+\\!bang.yaml
+*.gen.yaml
+!/top.gen.yaml
+'''
+
+NESTED_GITIGNORE = '''\
+local.yaml
+/top.yaml
+!x.tmp.yaml
+inner/*.yaml
+'''
+
+FILES = (
+    'a.yaml',
+    'x.tmp.yaml',
+    'keep.tmp.yaml',
+    'anchored.yaml',
+    'n/anchored.yaml',
+    'build/a.yaml',
+    'n/build/a.yaml',
+    'build.yaml',
+    'logs/a.yaml',
+    'n/logs',
+    'n/logs.yaml',
+    'docs/gen.yaml',
+    'docs/a/b/gen.yaml',
+    'n/docs/gen.yaml',
+    'deep/skip.yaml',
+    'n/deep/skip.yaml',
+    'n/deep/keep.yaml',
+    'abc.yaml',
+    'ac.yaml',
+    'xz.yaml',
+    'zz.yaml',
+    'sub/a.yaml',
+    'sub/wanted.yaml',
+    'sub/n/a.yaml',
+    'dir.yaml',
+    'n/dir.yaml/a.yaml',
+    '#hash.yaml',
+    'trailing.yaml',
+    'nested/local.yaml',
+    'nested/n/local.yaml',
+    'nested/top.yaml',
+    'nested/n/top.yaml',
+    'nested/x.tmp.yaml',
+    'nested/y.tmp.yaml',
+    'nested/inner/a.yaml',
+    'nested/n/inner/a.yaml',
+    'local.yaml',
+    'top.yaml',
+    'out/a.yaml',
+    'out/n/a.yaml',
+    'out.yaml',
+    '!bang.yaml',
+    'bang.yaml',
+    'a.gen.yaml',
+    'top.gen.yaml',
+    'n/top.gen.yaml',
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    tmp_path.joinpath('.gitignore').write_text(GITIGNORE)
+    tmp_path.joinpath('nested').mkdir()
+    tmp_path.joinpath('nested/.gitignore').write_text(NESTED_GITIGNORE)
+    for filename in FILES:
+        path = tmp_path.joinpath(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('a: 1\n')
+    return tmp_path
+
+
+def _git_ignored(root, paths):
+    subprocess.check_call(('git', 'init', '-q', str(root)))
+    out = subprocess.run(
+        ('git', 'check-ignore', '--no-index', '--stdin', '-z'),
+        cwd=root, input='\0'.join(paths) + '\0',
+        capture_output=True, text=True,
+    ).stdout
+    return set(out.split('\0')[:-1])
+
+
+def test_walk_ignores_like_git(tree):
+    yaml_files = [f for f in FILES if filelist._is_yaml(f)]
+    ignored = _git_ignored(tree, yaml_files)
+    # the fixture exercises both outcomes of most rules
+    assert 10 < len(ignored) < len(yaml_files) - 10
+    expected = sorted(set(yaml_files) - ignored)
+    assert filelist._walk(str(tree)) == expected
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pytest
+
+from testing import importtime
+from testing.benchmark import BENCH_HOOKS
+
+
+# the time budgets are checked by `python -m testing.importtime`, timing
+# is too noisy for the test suite
+@pytest.mark.parametrize('hook', sorted(BENCH_HOOKS))
+def test_hook_defers_imports(hook):
+    _, imported = importtime.import_time(BENCH_HOOKS[hook])
+    assert importtime.deferred(imported) == []
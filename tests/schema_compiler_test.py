@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import copy
+import random
+from typing import Any
+
+import jsonschema
+import pytest
+
+from pre_commit_hooks import schema_compiler
+from pre_commit_hooks.schemas import REGISTRY
+from testing.corpus import fake
+
+# (content type, the (type, actiontype) of a variant)
+CASES = [
+    (content_type.name, key)
+    for content_type in REGISTRY.content_types
+    for key in (None, *content_type.variants)
+]
+DOCUMENTS_PER_CASE = 400
+
+# values of every json type, plus strings close to what schemas expect
+_VALUES: tuple[Any, ...] = (
+    None, True, False, 0, -1, 1.5, 2.0, '', 'x', 'UC1',
+    '0f7e1b3a-5c2d-4e8f-9a6b-1c2d3e4f5a6b', 'not-a-uuid', [], ['x'], [1],
+    {}, {'x': 1},
+)
+
+
+def _schemas(name, key):
+    content_type, = (c for c in REGISTRY.content_types if c.name == name)
+    schema = REGISTRY.schema(content_type.schema)
+    variant = None if key is None else REGISTRY.schema(
+        content_type.variants[key],
+    )
+    return schema, variant
+
+
+def _containers(value, ret):
+    if isinstance(value, (dict, list)):
+        ret.append(value)
+        for child in (value.values() if isinstance(value, dict) else value):
+            _containers(child, ret)
+    return ret
+
+
+def _mutate(instance, rng):
+    """Break a valid document at a few random places."""
+    for _ in range(rng.randint(1, 3)):
+        container = rng.choice(_containers(instance, []))
+        keys = list(container) if isinstance(container, dict) else list(
+            range(len(container)),
+        )
+        op = rng.randrange(4)
+        if op == 0 and keys:
+            del container[rng.choice(keys)]
+        elif op == 1 and keys:
+            container[rng.choice(keys)] = copy.deepcopy(rng.choice(_VALUES))
+        elif op == 2 and isinstance(container, dict):
+            container[rng.choice(('extra', 'id', 'type', 'code'))] = (
+                copy.deepcopy(rng.choice(_VALUES))
+            )
+        elif isinstance(container, list):
+            container.append(copy.deepcopy(rng.choice(_VALUES)))
+    return instance
+
+
+def _documents(schema, variant, seed):
+    rng = random.Random(seed)
+    for i in range(DOCUMENTS_PER_CASE):
+        instance = fake(schema, rng)
+        if variant is not None:
+            instance.update(fake(variant, rng))
+        # a few stay valid, the others are broken some way
+        yield instance if i % 8 == 0 else _mutate(instance, rng)
+
+
+def _jsonschema_validator(schema, **kwargs):
+    # what `jsonschema.validate` does, without checking the schema each time
+    cls = jsonschema.validators.validator_for(schema)
+    validator = cls(schema, **kwargs)
+
+    def validate(instance):
+        error = jsonschema.exceptions.best_match(
+            validator.iter_errors(instance),
+        )
+        return None if error is None else (error.message, tuple(error.path))
+    return validate
+
+
+def _compiled_error(instance, schema, **kwargs):
+    try:
+        schema_compiler.validate(instance, schema, **kwargs)
+    except schema_compiler.ValidationError as e:
+        return e.message, tuple(e.path)
+    return None
+
+
+@pytest.mark.parametrize(('name', 'key'), CASES)
+def test_schemas_are_compiled(name, key):
+    schema, variant = _schemas(name, key)
+    schema_compiler.generate(schema, variant=variant)
+
+
+@pytest.mark.parametrize(('name', 'key'), CASES)
+def test_schemas_are_valid(name, key):
+    for schema in _schemas(name, key):
+        if schema is not None:
+            jsonschema.validators.validator_for(schema).check_schema(schema)
+
+
+def test_invalid_schema():
+    with pytest.raises(jsonschema.SchemaError):
+        schema_compiler.validate({}, {'type': ['string', 'string']})
+
+
+@pytest.mark.parametrize(('name', 'key'), CASES)
+def test_same_errors_as_jsonschema(name, key):
+    schema, variant = _schemas(name, key)
+    validate_schema = _jsonschema_validator(schema)
+    validate_variant = (
+        _jsonschema_validator(variant) if variant is not None else None
+    )
+    valid = 0
+    for instance in _documents(schema, variant, f'{name}{key}'):
+        expected = validate_schema(instance)
+        if expected is None and validate_variant is not None:
+            expected = validate_variant(instance)
+        got = _compiled_error(instance, schema, variant=variant)
+        assert got == expected, instance
+        valid += expected is None
+    # both outcomes are exercised
+    assert 0 < valid < DOCUMENTS_PER_CASE
+
+
+@pytest.mark.parametrize(
+    'instance',
+    (
+        {'id': '0f7e1b3a-5c2d-4e8f-9a6b-1c2d3e4f5a6b'},
+        {'id': '0F7E1B3A-5C2D-4E8F-9A6B-1C2D3E4F5A6B'},
+        {'id': '0f7e1b3a5c2d4e8f9a6b1c2d3e4f5a6b'},
+        {'id': 'not-a-uuid'},
+        {'id': 1},
+    ),
+)
+def test_formats_same_errors_as_jsonschema(instance):
+    schema = {
+        'type': 'object',
+        'properties': {'id': {'type': 'string', 'format': 'uuid'}},
+    }
+    cls = jsonschema.validators.validator_for(schema)
+    validate = _jsonschema_validator(
+        schema, format_checker=cls.FORMAT_CHECKER,
+    )
+    got = _compiled_error(instance, schema, check_formats=True)
+    assert got == validate(instance)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from pre_commit_hooks.schema_registry import SchemaRegistry
+from pre_commit_hooks.schemas import REGISTRY
+
+
+@pytest.fixture
+def registry():
+    ret = SchemaRegistry()
+    ret.register('first', 'b/', 'm:first')
+    ret.register('second', 'a/b', 'm:second')
+    ret.register('third', 'a/', 'm:third')
+    return ret
+
+
+@pytest.mark.parametrize(
+    ('filename', 'expected'),
+    (
+        ('x/a/f.yaml', 'third'),
+        # registration order wins, not where in the path a pattern starts
+        ('a/b/f.yaml', 'first'),
+        ('a/x/b/f.yaml', 'first'),
+        ('a/bc/f.yaml', 'second'),
+        ('x/f.yaml', None),
+    ),
+)
+def test_resolve(registry, filename, expected):
+    content_type = registry.resolve(filename)
+    assert getattr(content_type, 'name', None) == expected
+
+
+def test_resolve_content_types():
+    filename = (
+        'quilr-playbook-service/static/templates/'
+        'classification-config-service/action/f.yaml'
+    )
+    content_type = REGISTRY.resolve(filename)
+    assert content_type is not None and content_type.name == 'action'
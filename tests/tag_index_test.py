@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import datetime
+import os
+
+from pre_commit_hooks import tag_index
+
+
+def test_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(tag_index, '_files', {})
+    tmp_path.joinpath('a.yaml').write_text('tags: [x, y]\n')
+    tmp_path.joinpath('b.yaml').write_text('tags: [y, [nested]]\n')
+    tmp_path.joinpath('c.yaml').write_text('name: no tags\n')
+
+    index = tag_index.build(str(tmp_path))
+    assert sorted(index.files) == ['x', 'y']
+    assert len(index.files['y']) == 2
+
+
+def test_values_json_cannot_encode(tmp_path, monkeypatch):
+    monkeypatch.setattr(tag_index, '_files', {})
+    cache = os.environ['QUILR_HOOKS_CACHE_DIR']
+    tmp_path.joinpath('a.yaml').write_text('tags: [x, 2024-01-01]\n')
+
+    index = tag_index.build(str(tmp_path))
+    assert set(index.files) == {'x', datetime.date(2024, 1, 1)}
+    # not cached, and nothing left behind trying
+    assert not [f for f in os.listdir(cache) if f.startswith('tmp')]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import pytest
+
+from pre_commit_hooks.validate_schema import main
+
+
+@pytest.mark.parametrize('cached', (True, False))
+def test_timings(tmp_path, monkeypatch, capsys, cached):
+    if not cached:
+        monkeypatch.setenv('QUILR_HOOKS_NO_DOCUMENT_CACHE', '1')
+    filename = tmp_path.joinpath('f.yaml')
+    filename.write_text('a: 1\n')
+    assert main(['--timings', '--no-cache', str(filename)]) == 0
+    assert '"hook": "validate-schema"' in capsys.readouterr().err
+
+
+def test_file_over_the_size_limit(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_SIZE', '4')
+    filename = tmp_path.joinpath('f.yaml')
+    filename.write_text('a: 1\n')
+    assert main(['--no-cache', str(filename)]) == 1
+    assert 'QUILR_HOOKS_YAML_MAX_SIZE' in capsys.readouterr().out
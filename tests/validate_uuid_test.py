@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+from pre_commit_hooks.validate_uuid import main
+
+USE_CASES = 'classification-config-service/use-case'
+ID_1 = '0f7e1b3a-5c2d-4e8f-9a6b-1c2d3e4f5a6b'
+ID_2 = '7a8b9c0d-1e2f-4a3b-8c4d-5e6f7a8b9c0d'
+ID_3 = 'c3d4e5f6-a7b8-4c9d-8e0f-1a2b3c4d5e6f'
+
+
+@pytest.fixture
+def content(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    files = {
+        f'{USE_CASES}/ok.yaml': f'type: use-case\nid: {ID_1}\ncode: UC1\n',
+        f'{USE_CASES}/bad-uuid.yaml': 'type: use-case\nid: nope\ncode: UC2\n',
+        # a type `check_code_format` does not know
+        f'{USE_CASES}/other.yaml': f'type: rule\nid: {ID_2}\ncode: R1\n',
+        # a duplicate one folder down
+        f'{USE_CASES}/sub/copy.yaml': (
+            f'type: use-case\nid: {ID_1}\ncode: UC3\n'
+        ),
+        'classification-config-service/action/act.yaml': (
+            f'type: action\nid: {ID_3}\ncode: nope\n'
+        ),
+    }
+    for filename, contents in files.items():
+        path = tmp_path.joinpath(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(contents)
+    return sorted(files)
+
+
+def _problems(output):
+    return {line for line in output.splitlines() if line.startswith('❌')}
+
+
+def test_audit_reports_what_single_files_report(content, capsys):
+    single = set()
+    for filename in content:
+        main([filename])
+        single |= _problems(capsys.readouterr().out)
+    assert single
+
+    assert main(['--audit', '.']) == 1
+    assert single <= _problems(capsys.readouterr().out)
+
+
+def test_audit(content, capsys):
+    assert main(['--audit', '.']) == 1
+    assert _problems(capsys.readouterr().out) == {
+        f'❌ {USE_CASES}/bad-uuid.yaml has invalid UUID: nope',
+        f'❌ {USE_CASES}/other.yaml has invalid code format: R1',
+        f'❌ Duplicate UUID found in {USE_CASES}/ok.yaml: {ID_1}',
+        '❌ classification-config-service/action/act.yaml has invalid code '
+        'format: nope',
+    }
+
+
+def test_audit_clean(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('a.yaml').write_text(
+        f'type: use-case\nid: {ID_1}\ncode: UC1\n',
+    )
+    assert main(['--audit', '.']) == 0
+    assert '1 documents have valid and unique UUIDs' in capsys.readouterr().out
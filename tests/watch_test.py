@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+
+import pytest
+
+from pre_commit_hooks import attribute_catalog
+from pre_commit_hooks import check_all
+from pre_commit_hooks import watch
+
+
+@pytest.fixture
+def root(tmp_path):
+    tmp_path.joinpath('a.yaml').write_text('a: 1\n')
+    tmp_path.joinpath('dir').mkdir()
+    tmp_path.joinpath('dir/b.yml').write_text('b: 1\n')
+    tmp_path.joinpath('.hidden').mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def inotify():
+    if not sys.platform.startswith('linux'):
+        pytest.skip('inotify is linux only')
+    try:
+        ret = watch._Inotify()
+    except (OSError, AttributeError):
+        pytest.skip('inotify is not available')
+    yield ret
+    ret.close()
+
+
+def test_inotify(root, inotify):
+    # watched before the first change, the generator starts at `next`
+    inotify.add(str(root))
+    a, b = str(root / 'a.yaml'), str(root / 'dir/b.yml')
+
+    root.joinpath('a.yaml').write_text('a: 2\n')
+    changes = watch._inotify_changes(str(root), inotify)
+    assert next(changes) == {a}
+
+    # neither other files nor hidden folders
+    root.joinpath('notes.txt').write_text('x\n')
+    root.joinpath('.hidden/h.yaml').write_text('h: 1\n')
+    root.joinpath('dir/b.yml').write_text('b: 2\n')
+    assert next(changes) == {b}
+
+    # the files of a new folder, written before it was watched
+    root.joinpath('new/sub').mkdir(parents=True)
+    root.joinpath('new/sub/c.yaml').write_text('c: 1\n')
+    c = str(root / 'new/sub/c.yaml')
+    assert next(changes) == {c}
+    root.joinpath('new/sub/c.yaml').write_text('c: 2\n')
+    assert next(changes) == {c}
+
+    root.joinpath('a.yaml').rename(root / 'renamed.yaml')
+    assert next(changes) == {a, str(root / 'renamed.yaml')}
+
+    root.joinpath('renamed.yaml').unlink()
+    assert next(changes) == {str(root / 'renamed.yaml')}
+
+    shutil.rmtree(root / 'new')
+    assert next(changes) == {c}
+
+    root.joinpath('dir').rename(root / 'moved')
+    assert next(changes) == {b, str(root / 'moved/b.yml')}
+
+
+def test_poll(root, monkeypatch):
+    # each interval makes the next change
+    steps = [
+        lambda: root.joinpath('a.yaml').write_text('a: 22\n'),
+        lambda: root.joinpath('notes.txt').write_text('x\n'),
+        lambda: root.joinpath('.hidden/h.yaml').write_text('h: 1\n'),
+        lambda: root.joinpath('dir/c.yaml').write_text('c: 1\n'),
+        lambda: root.joinpath('dir/b.yml').unlink(),
+    ]
+    monkeypatch.setattr(watch.time, 'sleep', lambda _: steps.pop(0)())
+
+    changes = watch._poll_changes(str(root))
+    assert next(changes) == {str(root / 'a.yaml')}
+    assert next(changes) == {str(root / 'dir/c.yaml')}
+    assert next(changes) == {str(root / 'dir/b.yml')}
+
+
+def test_polls_without_inotify(root, monkeypatch, capsys):
+    def add(self, path):
+        raise OSError(28, 'No space left on device', path)
+    monkeypatch.setattr(watch._Inotify, 'add', add)
+    steps = [lambda: root.joinpath('a.yaml').write_text('a: 22\n')]
+    monkeypatch.setattr(watch.time, 'sleep', lambda _: steps.pop(0)())
+
+    assert next(watch.changes(str(root))) == {str(root / 'a.yaml')}
+    if sys.platform.startswith('linux'):
+        assert 'polling instead' in capsys.readouterr().err
+
+
+def _changes(*batches):
+    def changes(root):
+        yield from batches
+        raise KeyboardInterrupt
+    return changes
+
+
+def _statuses(out):
+    return [
+        line.split(' (')[0] for line in out.splitlines()
+        if line.startswith('---')
+    ]
+
+
+def test_watch_loop(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(attribute_catalog, '_catalogs', {})
+    tmp_path.joinpath('ok.yaml').write_text('a: 1\n')
+    tmp_path.joinpath('bad.yaml').write_text('a: [\n')
+    ok, bad = str(tmp_path / 'ok.yaml'), str(tmp_path / 'bad.yaml')
+    monkeypatch.setattr(watch, 'changes', _changes({ok}, {bad}, {ok}))
+
+    assert check_all.main(['--watch', '.', '--syntax']) == 0
+    out = capsys.readouterr().out
+    assert out.startswith('watching . for changes')
+    assert _statuses(out) == ['--- ok', '--- problems found', '--- ok']
+    assert 'while parsing' in out
+
+
+def test_watch_goes_on_after_an_error(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(attribute_catalog, '_catalogs', {})
+    tmp_path.joinpath('ok.yaml').write_text('a: 1\n')
+    ok = os.path.abspath('ok.yaml')
+    monkeypatch.setattr(watch, 'changes', _changes({'broken'}, {ok}))
+    recheck = check_all._recheck
+
+    def _recheck(paths, checks, root):
+        if paths == {'broken'}:
+            raise RuntimeError('boom')
+        return recheck(paths, checks, root)
+    monkeypatch.setattr(check_all, '_recheck', _recheck)
+
+    assert check_all.main(['--watch', '.', '--syntax']) == 0
+    captured = capsys.readouterr()
+    assert 'RuntimeError: boom' in captured.err
+    assert _statuses(captured.out) == ['--- problems found', '--- ok']
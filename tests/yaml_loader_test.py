@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+import yaml
+
+from pre_commit_hooks import yaml_loader
+
+ID = (('id',),)
+NESTED = (('id',), ('items', '*', 'name'), ('config',))
+
+
+def _select(value, paths):
+    """The `paths` of `value`, as `load_paths` is meant to load them."""
+    tree = yaml_loader._path_tree(paths)
+
+    def select(value, tree):
+        if tree is None:
+            return value
+        if isinstance(value, dict):
+            return {
+                key: select(child, tree[key])
+                for key, child in value.items() if key in tree
+            }
+        if isinstance(value, list) and '*' in tree:
+            return [select(child, tree['*']) for child in value]
+        return value
+    return select(value, tree)
+
+
+@pytest.mark.parametrize(
+    ('contents', 'paths'),
+    (
+        pytest.param(
+            'id: 1\n'
+            'skip: {a: [1, 2]}\n'
+            'items:\n'
+            '- {name: a, other: 1}\n'
+            '- name: b\n'
+            '- not a mapping\n'
+            'config: {a: [1, {b: c}]}\n',
+            NESTED,
+            id='nested',
+        ),
+        pytest.param(
+            'skip: {a: &a [1, 2], b: &b x}\n'
+            'id: *a\n'
+            'config: *b\n',
+            NESTED,
+            id='anchors in skipped values',
+        ),
+        pytest.param(
+            'id: &a 1\n'
+            'skip: [*a, &b {c: d}]\n'
+            'config: [*b, *a]\n',
+            NESTED,
+            id='aliases in skipped values',
+        ),
+        pytest.param(
+            'items:\n'
+            '- &a {name: a, other: 1}\n'
+            '- *a\n',
+            NESTED,
+            id='anchors in wanted values',
+        ),
+        pytest.param('- 1\n- {id: 2}\n', ID, id='sequence'),
+        pytest.param('hello\n', ID, id='scalar'),
+        pytest.param('', ID, id='empty'),
+        pytest.param('# a comment only\n', ID, id='comment'),
+        pytest.param('!!map {id: 1, b: 2}\n', ID, id='tagged'),
+    ),
+)
+def test_same_as_safe_load(contents, paths):
+    expected = _select(yaml.safe_load(contents), paths)
+    assert yaml_loader.load_paths(contents, paths) == expected
+    assert yaml_loader.load_paths(contents.encode(), paths) == expected
+
+
+@pytest.mark.parametrize(
+    'contents',
+    (
+        'base: &b {id: 1, other: 2}\n'
+        'item: {<<: *b, name: x}\n',
+        # keys of the mapping win over the merged ones
+        'base: &b {id: 1, other: 2}\n'
+        'item: {<<: *b, id: 3}\n',
+        'base: &b {id: 1}\n'
+        'more: &m {name: y}\n'
+        'item: {<<: [*b, *m], other: 4}\n',
+    ),
+)
+def test_merge_keys(contents):
+    paths = (('item', 'id'), ('item', 'name'))
+    got = yaml_loader.load_paths(contents, paths)
+    # merged mappings are loaded whole
+    assert _select(got, paths) == _select(yaml.safe_load(contents), paths)
+
+
+def test_stops_once_every_top_level_key_was_seen():
+    contents = 'id: 1\nskip: 2\nid: 3\nbroken: [\n'
+    assert yaml_loader.load_paths(contents, ID) == {'id': 1}
+
+
+def test_skipped_values_count_against_the_limits(monkeypatch):
+    monkeypatch.setenv('QUILR_HOOKS_YAML_MAX_ALIAS_NODES', '10')
+    contents = 'skip: &a [1, 2, 3, 4]\nskip2: [*a, *a, *a]\nid: 1\n'
+    with pytest.raises(yaml_loader.LimitExceeded):
+        yaml_loader.load_paths(contents, ID)